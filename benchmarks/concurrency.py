@@ -0,0 +1,79 @@
+"""
+Compares contact lookup throughput of the sync Client and the AsyncClient.
+
+Both clients reuse the same LocalAuth session, so log in once with either
+client before running the benchmark. The sync client resolves the JIDs one
+after another; the async client keeps up to ``--concurrency`` lookups in
+flight over the same page.
+
+Usage:
+    python -m benchmarks.concurrency --jid 15551234567@c.us --jid ... [--rounds 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from wawebpy.client import Client
+from wawebpy.aio.client import AsyncClient
+from wawebpy.structures.auth.localauth import LocalAuth
+from wawebpy.aio.structures.auth.localauth import AsyncLocalAuth
+
+
+def bench_sync(jids: List[str], rounds: int, session_id: str) -> List[float]:
+    client = Client()
+    client.initialize({"auth": LocalAuth(client, sessionId=session_id)})
+    try:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for jid in jids:
+                client.get_contact(jid)
+            timings.append(time.perf_counter() - start)
+        return timings
+    finally:
+        client.stop()
+
+
+async def bench_async(jids: List[str], rounds: int, session_id: str, concurrency: int) -> List[float]:
+    client = AsyncClient()
+    await client.initialize({"auth": AsyncLocalAuth(client, sessionId=session_id)})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(jid: str):
+        async with semaphore:
+            return await client.get_contact(jid)
+
+    try:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await asyncio.gather(*(lookup(jid) for jid in jids))
+            timings.append(time.perf_counter() - start)
+        return timings
+    finally:
+        await client.stop()
+
+
+def report(name: str, timings: List[float], lookups: int) -> None:
+    median = statistics.median(timings)
+    print(f"{name:>6}: median {median * 1000:8.1f} ms/round, {lookups / median:8.1f} lookups/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jid", action="append", required=True, help="JID to look up (repeatable)")
+    parser.add_argument("--repeat", type=int, default=20, help="how many times each JID is looked up per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--session", default="default", help="LocalAuth session id")
+    args = parser.parse_args()
+
+    jids = args.jid * args.repeat
+    report("sync", bench_sync(jids, args.rounds, args.session), len(jids))
+    report("async", asyncio.run(bench_async(jids, args.rounds, args.session, args.concurrency)), len(jids))
+
+
+if __name__ == "__main__":
+    main()
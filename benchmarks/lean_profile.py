@@ -0,0 +1,89 @@
+"""
+Compares the memory footprint of sessions with the default and the lean launch profile.
+
+Runs the given sessions in a SessionPool, once per profile, waits for
+WhatsApp Web to settle and sums the memory of every browser process.
+Proportional set size (PSS) is reported where the kernel provides it, so
+memory shared between Chromium processes is only counted once; otherwise
+RSS is used. Linux only.
+
+Sessions are kept under ``--dir``; a session that isn't logged in yet prints
+its QR code to the terminal, so run the benchmark once to log them in.
+
+Usage:
+    python -m benchmarks.lean_profile --session alice --session bob [--settle 20]
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
+from wawebpy.sessionpool import SessionPool
+from wawebpy.structures.launchprofile import LEAN_PROFILE, LaunchProfile
+
+
+def descendants(pid: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing parenthesis.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def memory_kb(pid: int) -> int:
+    for path, key in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(key):
+                        return int(line.split()[1])
+        except OSError:
+            continue
+    return 0
+
+
+def measure(name: str, profile: Optional[LaunchProfile], sessions: List[str], dir_path: str, settle: float) -> int:
+    options = {"launch_profile": profile} if profile else {}
+
+    def setup(client):
+        client.on("qr", lambda qr: print(qr.to_terminal()))
+
+    with SessionPool(dir_path=dir_path, client_options=options) as pool:
+        for future in [pool.add_session(session_id, setup=setup) for session_id in sessions]:
+            future.result()
+        time.sleep(settle)
+        processes = descendants(os.getpid())
+        total = sum(memory_kb(pid) for pid in processes)
+
+    print(f"{name:>8}: {total / 1024:8.1f} MiB over {len(processes)} processes "
+          f"({total / 1024 / len(sessions):.1f} MiB per session)")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--session", action="append", required=True, help="session id (repeatable)")
+    parser.add_argument("--dir", default=".wawebpy_auth", help="directory holding the session snapshots")
+    parser.add_argument("--settle", type=float, default=20, help="seconds to let WhatsApp Web settle before measuring")
+    args = parser.parse_args()
+
+    default = measure("default", None, args.session, args.dir, args.settle)
+    lean = measure("lean", LEAN_PROFILE, args.session, args.dir, args.settle)
+    print(f"   saved: {(default - lean) / 1024:8.1f} MiB ({(default - lean) / default:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from playwright._impl._errors import Error as PWError
+from wawebpy.exceptions import QrNotFound, SessionLoadError
+from wawebpy.structures.auth import baseauth
+from wawebpy.structures.auth.baseauth import BaseAuth
+import pytest
+
+
+class FakeClient:
+    def _record_phase(self, phase):
+        pass
+
+
+class FakePage:
+    url = "https://web.whatsapp.com/"
+
+    def __init__(self):
+        self.reloads = 0
+
+    def goto(self, url):
+        pass
+
+    def reload(self):
+        self.reloads += 1
+
+    def is_closed(self):
+        return False
+
+
+class FakeContext:
+    def __init__(self):
+        self.page = FakePage()
+
+    def new_page(self):
+        return self.page
+
+
+class NavigatingWatcher:
+    """A login watcher whose every wait is interrupted by a navigation."""
+
+    qr_count = 0
+
+    def __init__(self, client, client_options):
+        self.waits = 0
+
+    def attach(self, page):
+        pass
+
+    def wait(self, timeout, stop_on_qr=False):
+        self.waits += 1
+        if self.waits > 100:
+            raise AssertionError("The wait was never given up.")
+        raise PWError("Execution context was destroyed")
+
+
+class Auth(BaseAuth):
+    def authenticate(self, client_options, playwright):
+        pass
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    monkeypatch.setattr(baseauth, "LoginWatcher", NavigatingWatcher)
+    monkeypatch.setattr(baseauth, "apply_routes", lambda page, options: None)
+    return Auth(FakeClient())
+
+
+def test_qr_login_gives_up_on_a_page_that_keeps_navigating(auth):
+    with pytest.raises(QrNotFound, match="kept navigating"):
+        auth._auth_with_qr(FakeContext(), {}, max_retries=3)
+
+
+def test_session_load_gives_up_on_a_page_that_keeps_navigating(auth):
+    context = FakeContext()
+    with pytest.raises(SessionLoadError):
+        auth._load_session({}, context, max_retries=3)
+    assert context.page.reloads == 0
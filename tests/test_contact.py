@@ -0,0 +1,65 @@
+from wawebpy.aio.client import AsyncClient
+from wawebpy.aio.structures.contact import AsyncContact
+from wawebpy.aio.structures.group import AsyncGroupParticipant
+from wawebpy.client import Client
+from wawebpy.exceptions import WidFetchError
+from wawebpy.structures import contact as contact_module
+from wawebpy.structures.contact import Contact
+from wawebpy.structures.group import GroupParticipant
+import inspect
+import pytest
+
+LID = {"server": "lid", "user": "42", "_serialized": "42@lid"}
+WID = {"server": "c.us", "user": "123", "_serialized": "123@c.us"}
+
+
+def attributes(**overrides):
+    attrs = {
+        "id": LID, "name": "Alice", "isGroup": False, "unreadCount": 0,
+        "pushName": "alice", "notifyName": "Alice", "shortName": "Al", "mentionName": "alice",
+        "hash": "h", "isMe": False, "isBusiness": False, "isBot": False, "isContact": True,
+        "canRequestPhoneNumber": False, "wid": WID,
+    }
+    attrs.update(overrides)
+    return attrs
+
+
+def test_contacts_require_their_wid():
+    attrs = attributes()
+    del attrs["wid"]
+    with pytest.raises(KeyError):
+        Contact(None, **attrs)
+
+    contact = Contact._from_attributes(None, attributes())
+    assert contact.id == WID and contact.wid == WID
+    assert contact.phone_number == "123"
+
+
+def test_sync_contacts_resolve_a_missing_wid_in_the_page(monkeypatch):
+    calls = []
+    monkeypatch.setattr(contact_module, "call_bundle", lambda page, name, *args: calls.append((name, *args)) or WID)
+
+    contact = Contact._from_attributes(None, attributes(wid=None))
+    assert calls == [("getPhoneNumber", "42@lid")]
+    assert contact.wid == WID
+
+
+def test_async_contacts_without_a_wid_fail_without_touching_the_page():
+    with pytest.raises(WidFetchError):
+        AsyncContact._from_attributes(None, attributes(wid=None))
+
+    contact = AsyncContact._from_attributes(None, attributes())
+    assert repr(contact) == "AsyncContact(Al, 123)"
+
+
+@pytest.mark.parametrize("sync_type, async_type", [
+    (Client, AsyncClient),
+    (Contact, AsyncContact),
+    (GroupParticipant, AsyncGroupParticipant),
+])
+def test_async_types_share_no_sync_methods(sync_type, async_type):
+    assert not issubclass(async_type, sync_type)
+    for name, member in inspect.getmembers(async_type, inspect.isfunction):
+        shared = getattr(sync_type, name, None) is member
+        if not name.startswith("_") and hasattr(sync_type, name) and not shared:
+            assert inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member), name
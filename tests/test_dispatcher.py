@@ -0,0 +1,115 @@
+from wawebpy.structures.dispatcher import Dispatcher
+from wawebpy.structures.eventemitter import EventEmitter
+from threading import Event, Thread
+import pytest
+
+
+@pytest.fixture
+def blocked():
+    """A dispatcher with one worker, busy with a first event until ``release`` is set."""
+    started, release = Event(), Event()
+    seen = []
+
+    def listener(value):
+        if value == 0:
+            started.set()
+            release.wait(5)
+        seen.append(value)
+
+    def make(**kwargs):
+        dispatcher = Dispatcher(max_workers=1, queue_size=2, **kwargs)
+        dispatcher.submit("message", [listener], 0)
+        assert started.wait(5)
+        return dispatcher
+
+    yield make, release, seen
+    release.set()
+
+
+def test_drop_oldest_is_the_default(blocked):
+    make, release, seen = blocked
+    dispatcher = make()
+    assert [dispatcher.submit("message", [seen.append], value) for value in (1, 2, 3)] == [True, True, True]
+
+    release.set()
+    dispatcher.shutdown()
+    assert seen == [0, 2, 3]
+    assert dispatcher.metrics()["message"]["dropped"] == 1
+
+
+def test_drop_newest_rejects_the_incoming_event(blocked):
+    make, release, seen = blocked
+    dispatcher = make(overflow="drop_newest")
+    assert [dispatcher.submit("message", [seen.append], value) for value in (1, 2, 3)] == [True, True, False]
+
+    release.set()
+    dispatcher.shutdown()
+    assert seen == [0, 1, 2]
+    assert dispatcher.metrics()["message"]["dropped"] == 1
+
+
+def test_block_waits_for_room(blocked):
+    make, release, seen = blocked
+    dispatcher = make(overflow="block")
+    dispatcher.submit("message", [seen.append], 1)
+    dispatcher.submit("message", [seen.append], 2)
+
+    emitter = Thread(target=dispatcher.submit, args=("message", [seen.append], 3))
+    emitter.start()
+    emitter.join(0.1)
+    assert emitter.is_alive()
+
+    release.set()
+    emitter.join(5)
+    dispatcher.shutdown()
+    assert seen == [0, 1, 2, 3]
+    assert dispatcher.metrics()["message"]["dropped"] == 0
+
+
+def test_failing_listener_is_counted_and_isolated():
+    dispatcher = Dispatcher(max_workers=1)
+    seen = []
+
+    def fail(value):
+        raise ValueError(value)
+
+    dispatcher.submit("message", [fail, seen.append], 1)
+    dispatcher.shutdown()
+
+    metrics = dispatcher.metrics()["message"]
+    assert seen == [1]
+    assert metrics["dispatched"] == 1
+    assert metrics["failed"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_events_without_listeners_are_not_queued():
+    dispatcher = Dispatcher()
+    assert dispatcher.submit("message", []) is True
+    dispatcher.shutdown()
+    assert dispatcher.metrics() == {}
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        Dispatcher(overflow="spill")
+
+
+def test_once_fires_once_when_emitted_twice_quickly():
+    dispatcher = Dispatcher(max_workers=4)
+    emitter = EventEmitter(dispatcher)
+    release = Event()
+    seen = []
+
+    def listener(value):
+        release.wait(1)
+        seen.append(value)
+
+    emitter.once("ready", listener)
+    emitter.emit("ready", 1)
+    emitter.emit("ready", 2)
+    release.set()
+    dispatcher.shutdown()
+
+    assert len(seen) == 1
+    assert "ready" not in emitter.events
@@ -0,0 +1,112 @@
+from wawebpy.structures import entitycache
+from wawebpy.structures.entitycache import EntityCache
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(entitycache.time, "monotonic", clock)
+    return clock
+
+
+def test_get_returns_what_was_put():
+    cache = EntityCache()
+    cache.put("contact", "1@c.us", "alice")
+
+    assert cache.get("contact", "1@c.us") == "alice"
+    assert cache.get("group", "1@c.us") is None
+    assert cache.stats()["hits"] == {"contact": 1}
+    assert cache.stats()["misses"] == {"group": 1}
+
+
+def test_entries_expire_after_their_kind_ttl(clock):
+    cache = EntityCache(ttls={"contact": 10.0, "group": None})
+    cache.put("contact", "1@c.us", "alice")
+    cache.put("group", "2@g.us", "family")
+
+    clock.now += 9.9
+    assert cache.get("contact", "1@c.us") == "alice"
+    clock.now += 0.1
+    assert cache.get("contact", "1@c.us") is None
+    clock.now += 1e6
+    assert cache.get("group", "2@g.us") == "family"
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["size"] == 1
+
+
+def test_peek_ignores_expired_entries_and_counters(clock):
+    cache = EntityCache(ttls={"contact": 1.0})
+    cache.put("contact", "1@c.us", "alice")
+
+    assert cache.peek("contact", "1@c.us") == "alice"
+    clock.now += 1.0
+    assert cache.peek("contact", "1@c.us") is None
+    assert cache.stats()["hits"] == {}
+    assert cache.stats()["misses"] == {}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EntityCache(max_size=2)
+    cache.put("contact", "1@c.us", "alice")
+    cache.put("contact", "2@c.us", "bob")
+    cache.get("contact", "1@c.us")
+    cache.put("contact", "3@c.us", "carol")
+
+    assert cache.peek("contact", "2@c.us") is None
+    assert cache.peek("contact", "1@c.us") == "alice"
+    assert cache.peek("contact", "3@c.us") == "carol"
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_peek_does_not_refresh_the_lru_order():
+    cache = EntityCache(max_size=2)
+    cache.put("contact", "1@c.us", "alice")
+    cache.put("contact", "2@c.us", "bob")
+    cache.peek("contact", "1@c.us")
+    cache.put("contact", "3@c.us", "carol")
+
+    assert cache.peek("contact", "1@c.us") is None
+
+
+def test_invalidate_drops_the_given_kinds():
+    cache = EntityCache()
+    cache.put("group", "2@g.us", "family")
+    cache.put("group_metadata", "2@g.us", {"participants": []})
+
+    cache.invalidate("2@g.us", ["group_metadata"])
+    assert cache.peek("group_metadata", "2@g.us") is None
+    assert cache.peek("group", "2@g.us") == "family"
+
+    cache.invalidate("2@g.us")
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_invalidate_kind_and_clear():
+    cache = EntityCache()
+    cache.put("contact", "1@c.us", "alice")
+    cache.put("contact", "2@c.us", "bob")
+    cache.put("group", "3@g.us", "family")
+
+    cache.invalidate_kind("contact")
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError):
+        EntityCache(max_size=0)
@@ -0,0 +1,115 @@
+from concurrent.futures import Future
+from wawebpy.exceptions import MessageSendError, SessionPoolError
+from wawebpy.fleet import Fleet, _Worker
+from wawebpy.structures.outbox import SendHandle
+import pickle
+import pytest
+
+
+class FakeClient:
+    def __init__(self):
+        self.handles = []
+
+    def _handle(self, chat_id, body):
+        handle = SendHandle(chat_id, body)
+        self.handles.append(handle)
+        return handle
+
+    def send_message(self, chat_id, body):
+        return self._handle(chat_id, body)
+
+    def send_messages(self, messages):
+        return [self._handle(chat_id, body) for chat_id, body in messages]
+
+    def send_media(self, chat_id, media, caption="", filename=None, mimetype=None, as_document=False):
+        return self._handle(chat_id, caption)
+
+
+class FakePool:
+    """Runs calls right away on the calling thread, like the pool thread would."""
+
+    def __init__(self):
+        self.client = FakeClient()
+
+    def submit(self, session_id, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(self.client, *args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def worker():
+    worker = _Worker.__new__(_Worker)
+    worker._pool = FakePool()
+    return worker
+
+
+def test_routed_send_resolves_with_the_message_id_at_the_ack(worker):
+    future = worker._op_send("alice", "send_message", ("1@c.us", "hi"), {})
+    assert not future.done()
+
+    worker._pool.client.handles[0].set_result("true_1@c.us_ABC")
+    assert future.result(timeout=0) == "true_1@c.us_ABC"
+
+
+def test_routed_media_send_fails_with_the_send_error(worker):
+    future = worker._op_send("alice", "send_media", ("1@c.us", b"data"), {"caption": "look"})
+    assert worker._pool.client.handles[0].body == "look"
+
+    worker._pool.client.handles[0].set_exception(MessageSendError("No server ack within 30s"))
+    with pytest.raises(MessageSendError, match="No server ack"):
+        future.result(timeout=0)
+
+
+def test_only_send_methods_are_routed_as_sends(worker):
+    with pytest.raises(SessionPoolError):
+        worker._op_send("alice", "get_contact", ("1@c.us",), {})
+
+
+def test_routed_batch_reports_every_outcome_once_all_are_settled(worker):
+    future = worker._op_send_batch("alice", [("1@c.us", "a"), ("2@c.us", "b")])
+    first, second = worker._pool.client.handles
+
+    first.set_result("id-a")
+    assert not future.done()
+    second.set_exception(MessageSendError("rejected"))
+
+    outcomes = pickle.loads(pickle.dumps(future.result(timeout=0)))
+    assert outcomes[0] == (True, "id-a")
+    assert not outcomes[1][0] and isinstance(outcomes[1][1], MessageSendError)
+
+
+def test_fleet_splits_a_batch_into_one_future_per_message(monkeypatch):
+    fleet = Fleet(workers=2)
+    requests = []
+
+    def request(worker, op, *args):
+        requests.append((op, *args))
+        batch = Future()
+        requests.append(batch)
+        return batch
+
+    monkeypatch.setattr(fleet, "_owner", lambda session_id: None)
+    monkeypatch.setattr(fleet, "_request", request)
+    futures = fleet.send_messages("alice", [["1@c.us", "a"], ["2@c.us", "b"]])
+    assert requests[0] == ("send_batch", "alice", [("1@c.us", "a"), ("2@c.us", "b")])
+
+    requests[1].set_result([(True, "id-a"), (False, MessageSendError("rejected"))])
+    assert futures[0].result(timeout=0) == "id-a"
+    with pytest.raises(MessageSendError, match="rejected"):
+        futures[1].result(timeout=0)
+
+
+def test_fleet_sends_media_data_as_bytes(monkeypatch):
+    fleet = Fleet(workers=1)
+    requests = []
+    monkeypatch.setattr(fleet, "_owner", lambda session_id: None)
+    monkeypatch.setattr(fleet, "_request", lambda worker, *args: requests.append(args))
+
+    fleet.send_media("alice", "1@c.us", memoryview(b"data"), caption="look")
+    op, session_id, method, args, kwargs = requests[0]
+    assert (op, method, args) == ("send", "send_media", ("1@c.us", b"data"))
+    assert type(args[1]) is bytes and kwargs["caption"] == "look"
@@ -0,0 +1,90 @@
+from wawebpy.structures.media import copy_to_sink, sniff_mimetype, stage_upload
+import io
+import mmap
+import os
+import pytest
+
+
+@pytest.mark.parametrize("head, mimetype", [
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", "image/png"),
+    (b"GIF89a\x01\x00", "image/gif"),
+    (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", "audio/wav"),
+    (b"OggS\x00\x02", "audio/ogg"),
+    (b"ID3\x03\x00", "audio/mpeg"),
+    (b"%PDF-1.7\n", "application/pdf"),
+    (b"\x00\x00\x00\x18ftypmp42", "video/mp4"),
+    (b"\x00\x00\x00\x14ftypqt  ", "video/quicktime"),
+    (b"\x00\x00\x00\x18ftypheic", "image/heic"),
+])
+def test_sniff_mimetype_from_signatures(head, mimetype):
+    assert sniff_mimetype(head, "misleading.txt") == mimetype
+
+
+def test_sniff_mimetype_falls_back_to_the_extension():
+    assert sniff_mimetype(b"PK\x03\x04rest", "report.docx") == (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+    assert sniff_mimetype(b"PK\x03\x04rest") == "application/zip"
+    assert sniff_mimetype(b"plain text", "notes.txt") == "text/plain"
+    assert sniff_mimetype(b"\x00\x01\x02") == "application/octet-stream"
+
+
+def test_stage_upload_uses_paths_as_they_are(tmp_path):
+    path = tmp_path / "photo.bin"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+
+    upload = stage_upload(path)
+    assert (upload.path, upload.filename, upload.mimetype) == (str(path), "photo.bin", "image/png")
+    upload.cleanup()
+    assert path.exists()
+
+
+def test_stage_upload_respects_a_given_filename_and_mimetype(tmp_path):
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    upload = stage_upload(str(path), filename="renamed.png", mimetype="image/x-custom")
+    assert (upload.filename, upload.mimetype) == ("renamed.png", "image/x-custom")
+
+
+@pytest.mark.parametrize("make", [bytes, bytearray, lambda data: memoryview(b"\x00\x00" + data)[2:]])
+def test_stage_upload_spools_buffers_in_chunks(make):
+    source = make(b"%PDF-1.4\n" + os.urandom(1000))
+
+    upload = stage_upload(source, chunk_size=64)
+    try:
+        assert upload.temporary
+        assert upload.mimetype == "application/pdf"
+        assert upload.filename == "file.pdf"
+        with open(upload.path, "rb") as f:
+            assert f.read() == bytes(memoryview(source))
+    finally:
+        upload.cleanup()
+    assert not os.path.exists(upload.path)
+
+
+def test_stage_upload_spools_mmaps(tmp_path):
+    path = tmp_path / "clip"
+    path.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"\x01" * 4096)
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        upload = stage_upload(mapped, filename="clip.mp4")
+    try:
+        assert upload.mimetype == "video/mp4"
+        assert upload.filename == "clip.mp4"
+        assert upload.path.endswith(".mp4")
+        with open(upload.path, "rb") as f:
+            assert f.read() == path.read_bytes()
+    finally:
+        upload.cleanup()
+
+
+def test_copy_to_sink(tmp_path):
+    path = tmp_path / "media"
+    path.write_bytes(os.urandom(10_000))
+    sink = io.BytesIO()
+
+    assert copy_to_sink(str(path), sink, chunk_size=1024) == 10_000
+    assert sink.getvalue() == path.read_bytes()
@@ -0,0 +1,144 @@
+from wawebpy.structures import mediacache
+from wawebpy.structures.mediacache import MediaCache, filehash_key, media_key
+import base64
+import hashlib
+import io
+import os
+import pytest
+import threading
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(mediacache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def media(tmp_path):
+    """Writes ``size`` bytes of distinct content and returns its path."""
+    def make(name: str, size: int) -> str:
+        path = tmp_path / name
+        path.write_bytes(name.encode().ljust(size, b"\x00"))
+        return str(path)
+    return make
+
+
+def test_media_key_is_the_same_for_paths_and_buffers(tmp_path):
+    data = b"media" * 1000
+    path = tmp_path / "file"
+    path.write_bytes(data)
+
+    expected = hashlib.sha256(data).hexdigest()
+    assert media_key(str(path), chunk_size=7) == expected
+    assert media_key(data) == expected
+    assert media_key(memoryview(bytearray(data))) == expected
+
+
+def test_filehash_key_matches_media_key():
+    data = b"decrypted media"
+    assert filehash_key(base64.b64encode(hashlib.sha256(data).digest()).decode()) == media_key(data)
+
+
+def test_put_get_and_copy(tmp_path, media):
+    cache = MediaCache(str(tmp_path / "cache"))
+    cache.put_file("ab12", media("one", 100))
+
+    assert cache.get("ab12") == cache.path_of("ab12")
+    assert cache.get("cd34") is None
+    assert cache.size == 100
+
+    sink = io.BytesIO()
+    assert cache.copy_to("ab12", sink) == 100
+    target = tmp_path / "copy"
+    assert cache.copy_to("ab12", str(target)) == 100
+    assert target.read_bytes() == sink.getvalue()
+    assert cache.copy_to("cd34", io.BytesIO()) is None
+
+
+def test_threads_caching_the_same_media_each_publish_a_whole_file(tmp_path, media):
+    cache = MediaCache(str(tmp_path / "cache"))
+    path = media("big", 1 << 20)
+    key = media_key(path)
+    start = threading.Barrier(8)
+    errors = []
+
+    def put():
+        start.wait()
+        try:
+            cache.put_file(key, path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert media_key(cache.get(key)) == key
+    assert os.listdir(os.path.dirname(cache.path_of(key))) == [os.path.basename(cache.path_of(key))]
+
+
+def test_least_recently_used_files_are_evicted(tmp_path, media, clock):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=250)
+    cache.put_file("aa", media("one", 100))
+    clock.now += 1
+    cache.put_file("bb", media("two", 100))
+    clock.now += 1
+    cache.get("aa")
+    clock.now += 1
+    cache.put_file("cc", media("three", 100))
+
+    assert cache.get("bb") is None
+    assert cache.get("aa") is not None
+    assert cache.get("cc") is not None
+    assert cache.size == 200
+
+
+def test_files_removed_behind_the_index_are_misses(tmp_path, media):
+    cache = MediaCache(str(tmp_path / "cache"))
+    cache.put_file("aa", media("one", 10))
+    (tmp_path / "cache" / "aa" / "aa").unlink()
+
+    assert cache.get("aa") is None
+    assert cache.size == 0
+
+
+def test_upload_handles_expire_after_the_ttl(tmp_path, clock):
+    cache = MediaCache(str(tmp_path / "cache"), upload_ttl=60)
+    cache.remember_upload("aa", {"directPath": "/v/1"})
+
+    assert cache.upload_handle("aa") == {"directPath": "/v/1"}
+    clock.now += 59
+    assert cache.upload_handle("aa") is not None
+    clock.now += 1
+    assert cache.upload_handle("aa") is None
+
+
+def test_upload_handles_are_kept_per_document_flag(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"))
+    cache.remember_upload("aa", {"type": "image"})
+    cache.remember_upload("aa", {"type": "document"}, as_document=True)
+
+    assert cache.upload_handle("aa") == {"type": "image"}
+    assert cache.upload_handle("aa", as_document=True) == {"type": "document"}
+
+    cache.forget_upload("aa")
+    assert cache.upload_handle("aa") is None
+    assert cache.upload_handle("aa", as_document=True) is not None
+
+
+def test_caches_on_the_same_directory_share_the_index(tmp_path, media):
+    MediaCache(str(tmp_path / "cache")).put_file("aa", media("one", 10))
+    assert MediaCache(str(tmp_path / "cache")).get("aa") is not None
@@ -0,0 +1,92 @@
+from wawebpy.exceptions import MessageSendError
+from wawebpy.structures import outbox as outbox_module
+from wawebpy.structures.mediacache import MediaCache, media_key
+from wawebpy.structures.outbox import Outbox
+import pytest
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeClient:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, *args):
+        self.events.append(args)
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def set_input_files(self, selector, path):
+        self.calls.append(("set_input_files", selector))
+
+
+@pytest.fixture
+def page(monkeypatch):
+    page = FakePage()
+    monkeypatch.setattr(outbox_module, "call_bundle", lambda _, name, *args: page.calls.append((name, *args)))
+    return page
+
+
+@pytest.fixture
+def outbox(page, tmp_path):
+    outbox = Outbox(FakeClient(), cache=MediaCache(str(tmp_path / "cache")), ack_timeout=30)
+    outbox._page = page
+    return outbox
+
+
+def sent_jobs(page):
+    return [call[1] for call in page.calls if call[0] == "sendMessages"]
+
+
+def test_acks_resolve_the_handle_at_the_server_ack(outbox, page):
+    handle = outbox.send([("1@c.us", "hi")])[0]
+    assert page.calls[-1][2:] == (1.0, 5, 30000, 2)
+
+    outbox._on_acks({}, [{"ref": handle.ref, "id": "msg", "ack": 0}])
+    assert not handle.done()
+    outbox._on_acks({}, [{"ref": handle.ref, "id": "msg", "ack": 1}])
+
+    assert handle.result(timeout=0) == "msg"
+    assert outbox._client.events == [("message_ack", "msg", 0), ("message_ack", "msg", 1)]
+    assert outbox.pending == 0
+
+
+def test_fresh_uploads_are_remembered(outbox, page):
+    handle = outbox.send_media("1@c.us", PNG, filename="a.png")
+    assert sent_jobs(page)[0][0]["media"]["mimetype"] == "image/png"
+
+    outbox._on_acks({}, [{"ref": handle.ref, "id": "msg", "ack": 0, "upload": {"directPath": "/v/1"}}])
+    assert outbox._cache.upload_handle(media_key(PNG)) == {"directPath": "/v/1"}
+
+
+def test_rejected_reused_upload_is_sent_again_once(outbox, page):
+    outbox._cache.remember_upload(media_key(PNG), {"directPath": "/stale"})
+    handle = outbox.send_media("1@c.us", PNG)
+    assert sent_jobs(page)[0][0]["media"] == {"handle": {"directPath": "/stale"}}
+
+    outbox._on_acks({}, [{"ref": handle.ref, "error": "media not found"}])
+    assert not handle.done()
+    assert outbox._cache.upload_handle(media_key(PNG)) is None
+    retry = sent_jobs(page)[1][0]
+    assert retry["ref"] == handle.ref
+    assert retry["media"]["mimetype"] == "image/png"
+
+    outbox._on_acks({}, [{"ref": handle.ref, "id": "msg", "error": "still failing"}])
+    with pytest.raises(MessageSendError, match="still failing"):
+        handle.result(timeout=0)
+    assert len(sent_jobs(page)) == 2
+
+
+def test_reload_fails_pending_messages(outbox):
+    created, queued = outbox.send([("1@c.us", "a"), ("2@c.us", "b")])
+    outbox._on_acks({}, [{"ref": created.ref, "id": "msg", "ack": 0}])
+
+    outbox._on_load(None)
+    with pytest.raises(MessageSendError, match="may still be delivered"):
+        created.result(timeout=0)
+    with pytest.raises(MessageSendError, match="was sent"):
+        queued.result(timeout=0)
+    assert outbox.pending == 0
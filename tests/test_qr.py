@@ -0,0 +1,77 @@
+from wawebpy.structures.qr import QrCode
+from wawebpy.util import get_qr_in_page
+import importlib.util
+import pickle
+import pytest
+
+DATA = "2@abcdefghijklmnopqrstuvwxyz0123456789,ABCDEFGHIJKLMNOPQRSTUVWXYZ=,0123456789abcdef=,1"
+
+
+def test_encoding_is_lazy_and_memoized():
+    code = QrCode(DATA)
+    assert code._qr is None
+    assert code.qr is code.qr
+
+
+def test_pickling_keeps_only_the_data():
+    code = QrCode(DATA)
+    code.matrix
+    restored = pickle.loads(pickle.dumps(code))
+
+    assert restored == code
+    assert restored._qr is None
+    assert len(pickle.dumps(code)) < len(DATA) + 100
+
+
+def test_equality_hash_and_str():
+    assert QrCode(DATA) == QrCode(DATA)
+    assert QrCode(DATA) != QrCode(DATA + "x")
+    assert len({QrCode(DATA), QrCode(DATA)}) == 1
+    assert str(QrCode(DATA)) == DATA
+    assert repr(QrCode("x")) == "QrCode('x')"
+
+
+def test_matrix_is_square_without_border():
+    matrix = QrCode(DATA).matrix
+    assert len(matrix) == len(matrix[0])
+    # Finder patterns sit in the corners when there is no quiet zone.
+    assert matrix[0][0] and matrix[0][-1] and matrix[-1][0]
+
+
+def test_to_svg():
+    svg = QrCode(DATA).to_svg(box_size=4, border=1)
+    assert svg.lstrip().startswith("<")
+    assert "svg" in svg
+
+
+def test_sizing_does_not_touch_the_memoized_code():
+    code = QrCode(DATA)
+    code.to_svg(box_size=7, border=3)
+    assert (code.qr.box_size, code.qr.border) == (1, 0)
+
+
+def test_to_terminal_has_one_line_per_two_rows():
+    code = QrCode(DATA)
+    lines = code.to_terminal(border=2).splitlines()
+    assert len(lines) == (len(code.matrix) + 4 + 1) // 2
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("PIL") is None and importlib.util.find_spec("png") is None,
+    reason="PNG rendering needs pillow or pypng",
+)
+def test_to_png():
+    assert QrCode(DATA).to_png().startswith(b"\x89PNG\r\n\x1a\n")
+
+
+def test_get_qr_in_page_is_deprecated():
+    class Element:
+        def get_attribute(self, name):
+            return DATA
+
+    class Page:
+        def wait_for_selector(self, selector, timeout):
+            return Element()
+
+    with pytest.deprecated_call():
+        assert get_qr_in_page(Page(), "div[data-ref]") == QrCode(DATA)
@@ -0,0 +1,101 @@
+from wawebpy.exceptions import SessionLoadError
+from wawebpy.structures.auth.snapshot import (
+    SNAPSHOT_VERSION, compact_state, dump_snapshot, load_snapshot, read_snapshot, state_digest, write_snapshot,
+)
+import gzip
+import json
+import pytest
+
+ORIGIN = "https://web.whatsapp.com"
+
+
+def storage_state():
+    return {
+        "cookies": [
+            {"name": "wa", "domain": ".whatsapp.com"},
+            {"name": "web", "domain": "web.whatsapp.com"},
+            {"name": "ads", "domain": "example.com"},
+        ],
+        "origins": [
+            {
+                "origin": ORIGIN,
+                "localStorage": [{"name": "WAToken", "value": "x"}],
+                "indexedDB": [
+                    {"name": "wawc", "stores": []},
+                    {"name": "signal-storage", "stores": []},
+                    {"name": "model-storage", "stores": [{"name": "message", "records": [1, 2, 3]}]},
+                ],
+            },
+            {"origin": "https://example.com", "localStorage": []},
+        ],
+    }
+
+
+def test_compact_state_keeps_the_origin_and_its_login_databases():
+    state = compact_state(storage_state(), ORIGIN)
+
+    assert [cookie["name"] for cookie in state["cookies"]] == ["wa", "web"]
+    assert [entry["origin"] for entry in state["origins"]] == [ORIGIN]
+    assert [db["name"] for db in state["origins"][0]["indexedDB"]] == ["wawc", "signal-storage"]
+    assert state["origins"][0]["localStorage"] == [{"name": "WAToken", "value": "x"}]
+
+
+def test_compact_state_keeps_every_database_when_asked():
+    state = compact_state(storage_state(), ORIGIN, databases=None)
+    assert len(state["origins"][0]["indexedDB"]) == 3
+
+
+def test_compact_state_does_not_modify_its_input():
+    state = storage_state()
+    compact_state(state, ORIGIN)
+    assert state == storage_state()
+
+
+def test_snapshot_round_trip():
+    snapshot = load_snapshot(dump_snapshot(storage_state(), ORIGIN))
+
+    assert snapshot["version"] == SNAPSHOT_VERSION
+    assert snapshot["origin"] == ORIGIN
+    assert snapshot["state"] == compact_state(storage_state(), ORIGIN)
+
+
+def test_load_snapshot_rejects_corrupt_data():
+    with pytest.raises(SessionLoadError, match="test data"):
+        load_snapshot(b"not gzip", "test data")
+
+
+def test_load_snapshot_rejects_other_versions():
+    data = gzip.compress(json.dumps({"version": SNAPSHOT_VERSION + 1, "state": {}}).encode("utf-8"))
+    with pytest.raises(SessionLoadError, match="version"):
+        load_snapshot(data)
+
+
+def test_state_digest_ignores_key_order_and_changes_with_content():
+    state = compact_state(storage_state(), ORIGIN)
+    reordered = json.loads(json.dumps(state, sort_keys=True))
+    reordered["cookies"][0] = dict(reversed(list(reordered["cookies"][0].items())))
+
+    assert state_digest(state) == state_digest(reordered)
+    reordered["cookies"][0]["name"] = "changed"
+    assert state_digest(state) != state_digest(reordered)
+
+
+def test_unrelated_databases_do_not_change_the_digest():
+    changed = storage_state()
+    changed["origins"][0]["indexedDB"][2]["stores"][0]["records"].append(4)
+
+    assert state_digest(compact_state(changed, ORIGIN)) == state_digest(compact_state(storage_state(), ORIGIN))
+
+
+def test_write_and_read_snapshot(tmp_path):
+    path = tmp_path / "sessions" / "alice.snapshot.gz"
+    size = write_snapshot(storage_state(), str(path), ORIGIN)
+
+    assert size == path.stat().st_size
+    assert not (tmp_path / "sessions" / "alice.snapshot.gz.tmp").exists()
+    assert read_snapshot(str(path))["state"] == compact_state(storage_state(), ORIGIN)
+
+
+def test_read_snapshot_of_a_missing_file(tmp_path):
+    with pytest.raises(SessionLoadError):
+        read_snapshot(str(tmp_path / "missing.gz"))
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from wawebpy.structures.auth.snapshot import load_snapshot
+from wawebpy.structures.auth.store import FileSessionStore, SQLiteSessionStore
+from wawebpy.structures.auth.storeauth import StoreAuth
+import pickle
+import pytest
+
+ORIGIN = "https://web.whatsapp.com"
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileSessionStore(str(tmp_path / "sessions"))
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def test_save_load_and_replace(store):
+    assert store.load("alice") is None
+    store.save("alice", b"one")
+    store.save("alice", b"two")
+    assert store.load("alice") == b"two"
+
+
+def test_delete(store):
+    store.save("alice", b"one")
+    store.delete("alice")
+    store.delete("alice")
+    assert store.load("alice") is None
+    assert store.list() == []
+
+
+def test_list_returns_the_session_ids(store):
+    for session_id in ("bob", "alice"):
+        store.save(session_id, session_id.encode())
+    assert store.list() == ["alice", "bob"]
+
+
+@pytest.mark.parametrize("session_ids", [("a/b", "ab"), ("a\\b", "ab"), ("../x", "x"), ("100%", "100%25")])
+def test_distinct_ids_never_share_a_snapshot(store, session_ids):
+    for session_id in session_ids:
+        store.save(session_id, session_id.encode())
+
+    assert sorted(store.list()) == sorted(session_ids)
+    for session_id in session_ids:
+        assert store.load(session_id) == session_id.encode()
+
+
+def test_file_store_keeps_snapshots_inside_its_directory(tmp_path):
+    store = FileSessionStore(str(tmp_path / "sessions"))
+    store.save("../escape", b"data")
+    assert [path.parent for path in tmp_path.rglob("*.snapshot.gz")] == [tmp_path / "sessions"]
+
+
+def test_file_store_of_a_missing_directory_is_empty(tmp_path):
+    assert FileSessionStore(str(tmp_path / "missing")).list() == []
+
+
+def test_stores_can_be_pickled(store):
+    store.save("alice", b"one")
+    assert pickle.loads(pickle.dumps(store)).load("alice") == b"one"
+
+
+class FakeContext:
+    def __init__(self):
+        self.messages = []
+
+    def storage_state(self, indexed_db: bool):
+        return {
+            "cookies": [],
+            "origins": [{
+                "origin": ORIGIN,
+                "localStorage": [],
+                "indexedDB": [
+                    {"name": "wawc", "stores": []},
+                    {"name": "model-storage", "stores": [{"name": "message", "records": list(self.messages)}]},
+                ],
+            }],
+        }
+
+
+@pytest.fixture
+def auth(tmp_path):
+    auth = StoreAuth(None, SQLiteSessionStore(str(tmp_path / "sessions.db")), sessionId="alice")
+    auth._context = FakeContext()
+    auth._origin = ORIGIN
+    return auth
+
+
+def test_checkpoint_skips_unchanged_sessions(auth):
+    assert auth.checkpoint(force=True) is True
+    auth._context.messages.append("hello")
+    assert auth.checkpoint(force=True) is False
+
+    state = load_snapshot(auth.store.load("alice"))["state"]
+    assert [db["name"] for db in state["origins"][0]["indexedDB"]] == ["wawc"]
+
+
+def test_checkpoint_is_debounced(auth):
+    auth.checkpoint_interval = 3600
+    assert auth.checkpoint(force=True) is True
+    assert auth.checkpoint() is False
+
+
+def test_checkpoint_in_writes_on_the_executor(auth):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        written = auth.checkpoint_in(executor, force=True)
+        assert written.result() is True
+        assert auth.checkpoint_in(executor, force=True).result() is False
+    assert auth.store.list() == ["alice"]
@@ -0,0 +1,39 @@
+from wawebpy.exceptions import ClientInitError
+from wawebpy.structures.collectionwatcher import CollectionWatcher
+from wawebpy.structures.entitycache import EntityCache
+from wawebpy.structures.messagewatcher import MessageWatcher
+import pytest
+
+
+class FakePage:
+    def __init__(self, missing):
+        self.missing = missing
+        self.init_scripts = []
+
+    def expose_binding(self, name, callback):
+        pass
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def evaluate(self, script):
+        return self.missing
+
+
+@pytest.mark.parametrize("make", [
+    lambda: MessageWatcher(client=None),
+    lambda: CollectionWatcher(EntityCache()),
+])
+def test_watchers_attach_once_their_modules_resolve(make):
+    page = FakePage([])
+    make().attach(page)
+    assert "whenModules(" in page.init_scripts[0]
+
+
+@pytest.mark.parametrize("make", [
+    lambda: MessageWatcher(client=None),
+    lambda: CollectionWatcher(EntityCache()),
+])
+def test_watchers_fail_when_the_ready_page_lacks_their_modules(make):
+    with pytest.raises(ClientInitError, match="WAWebCollections"):
+        make().attach(FakePage(["WAWebCollections"]))
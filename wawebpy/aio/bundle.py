@@ -0,0 +1,25 @@
+from playwright.async_api import Page
+from typing import Any, List
+from ..bundle import BUNDLE_VERSION, BUNDLE_SCRIPT, BUNDLE_CALL, MODULES, _MISSING, _report_missing
+from ..logger import logger
+
+
+async def install_bundle(page: Page) -> List[str]:
+    """Awaitable counterpart of :func:`wawebpy.bundle.install_bundle`."""
+    logger.debug(f"Installing helper bundle v{BUNDLE_VERSION}.")
+    await page.add_init_script(BUNDLE_SCRIPT)
+    await page.evaluate(BUNDLE_SCRIPT)
+    return _report_missing(await page.evaluate(BUNDLE_CALL, ["resolveModules", [MODULES], BUNDLE_VERSION]))
+
+
+async def call_bundle(page: Page, name: str, *args: Any) -> Any:
+    """Awaitable counterpart of :func:`wawebpy.bundle.call_bundle`."""
+    result = await page.evaluate(BUNDLE_CALL, [name, list(args), BUNDLE_VERSION])
+    if result == _MISSING:
+        logger.debug(f"Helper bundle missing for '{name}', injecting it.")
+        await page.evaluate(BUNDLE_SCRIPT)
+        result = await page.evaluate(BUNDLE_CALL, [name, list(args), BUNDLE_VERSION])
+    return result
+
+
+__all__ = ["install_bundle", "call_bundle"]
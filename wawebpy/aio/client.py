@@ -0,0 +1,258 @@
+from ..client import BaseClient
+from ..structures.clientoptions import ClientOptions
+from ..structures.collectionwatcher import CollectionWatcher
+from ..structures.messagewatcher import MessageWatcher
+from ..structures.outbox import SendHandle
+from ..structures.history import HistoryChunk, JsonlSink
+from ..structures.media import MediaDownload, MediaSink, MediaSource
+from .structures.history import iter_history
+from .structures.auth.baseauth import AsyncBaseAuth
+from .structures.auth.noauth import AsyncNoAuth
+from .structures.contact import AsyncContact
+from .structures.group import AsyncGroup
+from .structures.message import AsyncMessage
+from ..logger import logger
+from ..exceptions import (
+    ClientAlreadyInitialized,
+    ClientInitError,
+    ClientStopError,
+    SettingStatusError,
+    GettingChatError,
+    MessageSendError,
+    MediaDownloadError,
+)
+from .bundle import call_bundle, install_bundle
+from typing import Union, List, Dict, Tuple, Optional, AsyncIterator
+import asyncio
+import time
+from playwright.async_api import async_playwright, Playwright, Page
+
+
+class AsyncClient(BaseClient):
+    """
+    Client for interacting with WhatsApp Web via ``playwright.async_api``.
+
+    Mirrors :class:`Client`, but every method that talks to the page is a coroutine,
+    so many lookups can be in flight at once over the same page. Event
+    callbacks may be plain functions or coroutine functions.
+    """
+
+    _auth_type = AsyncBaseAuth
+    _default_auth = AsyncNoAuth
+
+    def __init__(self):
+        super().__init__()
+        self._playwright: Playwright = None
+        self._page: Page = None
+
+    async def initialize(self, options: ClientOptions):
+        """
+        Initializes the client, starts Playwright, opens a browser page,
+        and triggers the authentication method.
+        """
+        if self.initialized:
+            logger.error("Attempted to initialize an already initialized client.")
+            raise ClientAlreadyInitialized("You try to initialize a Client that's already initialized.")
+
+        logger.info("Initializing client...")
+        self._setup_options(options)
+        self._startup_timings = {}
+        self._phase_started = time.perf_counter()
+
+        self._initialized = True
+        self._owns_playwright = options.get("playwright") is None
+        self._owns_browser = options.get("browser") is None
+        if not self._owns_playwright:
+            logger.debug("Using the shared Playwright driver.")
+            self._playwright = options["playwright"]
+        else:
+            try:
+                logger.debug("Starting Playwright...")
+                self._playwright = await async_playwright().start()
+                logger.info("Playwright started successfully.")
+            except Exception as e:
+                self._initialized = False
+                logger.exception("Failed to start Playwright.")
+                raise ClientInitError("Failed to start Playwright: " + str(e))
+        self._record_phase("playwright")
+
+        try:
+            logger.debug("Authenticating client...")
+            self._page = await options.get("auth").authenticate(
+                client_options=options, playwright=self._playwright
+            )
+            logger.info("Client authenticated and page loaded.")
+
+            self._missing_modules = await install_bundle(self._page)
+            self._record_phase("bundle")
+            if self._cache is not None and options.get("watch_collections"):
+                await CollectionWatcher(self._cache).attach_async(self._page)
+            await MessageWatcher(
+                self,
+                message_type=AsyncMessage,
+                batch_size=options.get("event_batch_size"),
+                batch_interval=options.get("event_batch_interval"),
+            ).attach_async(self._page)
+            self._outbox = self._make_outbox(options)
+            await self._outbox.attach_async(self._page)
+            self._downloader = self._make_downloader(options)
+            await self._downloader.attach_async(self._page)
+            self._record_phase("watchers")
+            self._log_startup_timings()
+            self.emit("ready")
+        except Exception as e:
+            logger.exception("Authentication failed.")
+            self._initialized = False
+            raise ClientInitError("Authentication failed: " + str(e))
+
+    async def set_status(self, status: str) -> bool:
+        logger.debug(f"Setting status to: {status}")
+        try:
+            result = await call_bundle(self._page, "setStatus", status)
+            return self._set_status_result(status, result)
+        except Exception as e:
+            logger.exception("Failed to set status.")
+            raise SettingStatusError("Failed to set status: " + str(e))
+
+    async def send_message(self, chat_id: str, body: str) -> SendHandle:
+        """Awaitable counterpart of :meth:`Client.send_message`. Await the handle for the server ack."""
+        return (await self.send_messages([(chat_id, body)]))[0]
+
+    async def send_messages(self, messages: List[Tuple[str, str]]) -> List[SendHandle]:
+        """Awaitable counterpart of :meth:`Client.send_messages`."""
+        logger.debug(f"Queueing {len(messages)} messages")
+        try:
+            return await self._outbox.send_async(messages)
+        except Exception as e:
+            logger.exception(f"Error queueing {len(messages)} messages.")
+            raise MessageSendError(f"Failed to queue {len(messages)} messages: {str(e)}")
+
+    async def send_media(self, chat_id: str, media: MediaSource, caption: str = "", filename: Optional[str] = None,
+                         mimetype: Optional[str] = None, as_document: bool = False) -> SendHandle:
+        """Awaitable counterpart of :meth:`Client.send_media`. Await the handle for the server ack."""
+        logger.debug(f"Queueing media to {chat_id}")
+        try:
+            return await self._outbox.send_media_async(chat_id, media, caption=caption, filename=filename,
+                                                       mimetype=mimetype, as_document=as_document)
+        except Exception as e:
+            logger.exception(f"Error queueing media to {chat_id}.")
+            raise MessageSendError(f"Failed to queue media to {chat_id}: {str(e)}")
+
+    async def download_media(self, message: Union[AsyncMessage, str], sink: MediaSink) -> MediaDownload:
+        """Awaitable counterpart of :meth:`Client.download_media`. Await the handle for the byte count."""
+        return (await self.download_media_batch([(message, sink)]))[0]
+
+    async def download_media_batch(self, jobs: List[Tuple[Union[AsyncMessage, str], MediaSink]]) -> List[MediaDownload]:
+        """Awaitable counterpart of :meth:`Client.download_media_batch`."""
+        logger.debug(f"Starting {len(jobs)} media downloads")
+        try:
+            return await self._downloader.download_async([(getattr(message, "id", message), sink) for message, sink in jobs])
+        except Exception as e:
+            logger.exception(f"Error starting {len(jobs)} media downloads.")
+            raise MediaDownloadError(f"Failed to start {len(jobs)} media downloads: {str(e)}")
+
+    async def iter_history(self, chat_id: str, chunk_size: int = 100, before: Optional[str] = None) -> AsyncIterator[HistoryChunk]:
+        """Async iterator counterpart of :meth:`Client.iter_history`."""
+        logger.debug(f"Reading history of {chat_id} before {before}")
+        try:
+            async for chunk in iter_history(self._page, chat_id, chunk_size=chunk_size, before=before):
+                before = chunk["cursor"]
+                yield chunk
+        except Exception as e:
+            logger.exception(f"Error reading history of {chat_id}.")
+            raise GettingChatError(f"Failed to read history of {chat_id} before {before}: {str(e)}")
+
+    async def export_history(self, chat_id: str, path: str, chunk_size: int = 100, before: Optional[str] = None) -> int:
+        """Awaitable counterpart of :meth:`Client.export_history`."""
+        with JsonlSink(path, append=before is not None) as sink:
+            async for chunk in self.iter_history(chat_id, chunk_size=chunk_size, before=before):
+                sink.write(chunk["messages"])
+        logger.info(f"Exported {sink.written} messages of {chat_id} to {path}")
+        return sink.written
+
+    async def get_contact(self, jid: str) -> Union[AsyncContact, None]:
+        logger.debug(f"Fetching contact: {jid}")
+        try:
+            contact = await AsyncContact.get(self._page, jid, cache=self._cache)
+            logger.info(f"Contact fetched: {jid}")
+            return contact
+        except Exception as e:
+            logger.exception(f"Error fetching contact {jid}.")
+            raise GettingChatError(f"Failed to get Contact {jid}: {str(e)}")
+
+    async def get_group(self, jid: str) -> Union[AsyncGroup, None]:
+        logger.debug(f"Fetching group: {jid}")
+        try:
+            group = await AsyncGroup.get(self._page, jid, cache=self._cache)
+            logger.info(f"Group fetched: {jid}")
+            return group
+        except Exception as e:
+            logger.exception(f"Error fetching group {jid}.")
+            raise GettingChatError(f"Failed to get Group {jid}: {str(e)}")
+
+    async def get_contacts(self, jids: List[str]) -> Tuple[Dict[str, AsyncContact], Dict[str, Exception]]:
+        """Awaitable counterpart of :meth:`Client.get_contacts`."""
+        logger.debug(f"Fetching {len(jids)} contacts")
+        try:
+            contacts, errors = await AsyncContact.get_many(self._page, jids, cache=self._cache)
+            logger.info(f"Contacts fetched: {len(contacts)}, failed: {len(errors)}")
+            return contacts, errors
+        except Exception as e:
+            logger.exception(f"Error fetching {len(jids)} contacts.")
+            raise GettingChatError(f"Failed to get {len(jids)} Contacts: {str(e)}")
+
+    async def get_groups(self, jids: List[str]) -> Tuple[Dict[str, AsyncGroup], Dict[str, Exception]]:
+        """Awaitable counterpart of :meth:`Client.get_groups`."""
+        logger.debug(f"Fetching {len(jids)} groups")
+        try:
+            groups, errors = await AsyncGroup.get_many(self._page, jids, cache=self._cache)
+            logger.info(f"Groups fetched: {len(groups)}, failed: {len(errors)}")
+            return groups, errors
+        except Exception as e:
+            logger.exception(f"Error fetching {len(jids)} groups.")
+            raise GettingChatError(f"Failed to get {len(jids)} Groups: {str(e)}")
+
+    async def run_forever(self) -> None:
+        """Waits until the client is stopped; events are dispatched by the running event loop."""
+        logger.info("Waiting until the client is stopped.")
+        while self.initialized and self._page and not self._page.is_closed():
+            await asyncio.sleep(1)
+
+    async def stop(self):
+        """
+        Stops the client by closing the Playwright page, browser, and stopping Playwright.
+        """
+        logger.info("Stopping client...")
+        if self._outbox is not None:
+            self._outbox.close()
+        if self._downloader is not None:
+            self._downloader.close()
+        try:
+            if self._page:
+                logger.debug("Closing page...")
+                context = self._page.context
+                await self._page.close()
+                if not self._owns_playwright:
+                    # Stopping a shared driver is up to its owner, so release what this client opened.
+                    await context.close()
+                    if self._owns_browser and context.browser:
+                        await context.browser.close()
+                logger.debug("Page closed.")
+        except Exception as e:
+            logger.exception("Error closing page.")
+            raise ClientStopError(f"Error closing page: {str(e)}")
+
+        try:
+            if self._playwright and self._owns_playwright:
+                logger.debug("Stopping Playwright...")
+                await self._playwright.stop()
+                logger.debug("Playwright stopped.")
+        except Exception as e:
+            logger.exception("Error stopping Playwright.")
+            raise ClientStopError(f"Error stopping Playwright: {str(e)}")
+        finally:
+            self._initialized = False
+            logger.info("Client stopped and de-initialized.")
+
+
+__all__ = ["AsyncClient"]
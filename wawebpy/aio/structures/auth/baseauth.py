@@ -0,0 +1,112 @@
+from ....logger import logger
+from abc import abstractmethod
+from playwright._impl._errors import Error as PWError
+from wawebpy.exceptions import QrNotFound, SessionExpired, SessionLoadError
+from playwright.async_api import Page
+from ....structures.auth.baseauth import BaseAuth
+from ....structures.loginwatcher import LoginWatcher
+from ....structures.launchprofile import apply_routes_async
+
+
+class AsyncBaseAuth(BaseAuth):
+    """
+    Base class for authentication methods of the AsyncClient.
+    Mirrors BaseAuth on top of ``playwright.async_api``.
+    """
+
+    @abstractmethod
+    async def authenticate(self, client_options, playwright) -> Page:
+        """
+        Abstract coroutine that must be implemented by subclasses
+        to perform the actual authentication.
+        """
+        pass
+
+    async def _auth_with_qr(self, browser_or_ctx, client_options, max_retries: int = 5) -> Page:
+        """
+        Handles QR-based authentication for WhatsApp Web.
+
+        See BaseAuth._auth_with_qr.
+        """
+        page = await browser_or_ctx.new_page()
+        await apply_routes_async(page, client_options)
+        watcher = LoginWatcher(self.client, client_options)
+        await watcher.attach_async(page)
+        logger.info("Opening WhatsApp Web at %s", client_options.get("web_url"))
+        await page.goto(client_options.get("web_url"))
+        self.client._record_phase("navigation")
+
+        retry = 0
+        while True:
+            qr_count = watcher.qr_count
+            try:
+                login_state = await watcher.wait_async(self.READY_TIMEOUT)
+            except PWError as exc:
+                if page.is_closed():
+                    raise
+                # A page that keeps navigating would otherwise be waited on forever.
+                retry += 1
+                if retry >= max_retries:
+                    logger.error("Page kept navigating while waiting for login on %s", page.url)
+                    raise QrNotFound(f"Page kept navigating while waiting for login on {page.url}") from exc
+                logger.debug(f"Page navigated while waiting for login ({exc}), waiting again.")
+                continue
+
+            if login_state["state"] == "ready":
+                logger.info("WhatsApp interface loaded successfully.")
+                break
+
+            retry = 1 if watcher.qr_count != qr_count else retry + 1
+            logger.warning(
+                "No new QR code or ready session (attempt %d/%d) at %s",
+                retry, max_retries, page.url,
+            )
+            if retry >= max_retries:
+                logger.error(
+                    "Failed to find QR code after %d retries on %s",
+                    max_retries, page.url,
+                )
+                raise QrNotFound(f"QR code not found after {max_retries} retries on {page.url}")
+            logger.info("Reloading page to try QR fetch again.")
+            await page.reload()
+
+        self.client._record_phase("login")
+        return page
+
+    async def _load_session(self, client_options, browser_or_ctx, max_retries: int = 3) -> Page:
+        """Awaitable counterpart of :meth:`BaseAuth._load_session`."""
+        page = await browser_or_ctx.new_page()
+        await apply_routes_async(page, client_options)
+        watcher = LoginWatcher(self.client, client_options)
+        await watcher.attach_async(page)
+        await page.goto(client_options.get("web_url"))
+        self.client._record_phase("navigation")
+
+        retry = 0
+        while retry <= max_retries:
+            try:
+                login_state = await watcher.wait_async(self.READY_TIMEOUT, stop_on_qr=True)
+            except PWError as exc:
+                if page.is_closed():
+                    raise
+                logger.debug(f"Page navigated while loading the session ({exc}), retry {retry}.")
+                retry += 1
+                continue
+
+            if login_state["state"] == "timeout":
+                logger.debug(f"Page not ready yet, retry {retry}. Reloading.")
+                retry += 1
+                await page.reload()
+                continue
+
+            if login_state["state"] == "qr":
+                await self.logout()
+                logger.warning("Saved session expired.")
+                raise SessionExpired(f"Saved session of {type(self).__name__} expired.")
+
+            logger.info("Saved session loaded successfully.")
+            self.client._record_phase("session")
+            return page
+
+        logger.error(f"Failed to load saved session after {max_retries} retries.")
+        raise SessionLoadError(f"Failed to load saved session after {max_retries} retries.")
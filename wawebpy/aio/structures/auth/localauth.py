@@ -0,0 +1,69 @@
+from .baseauth import AsyncBaseAuth
+from ....structures.auth.localauth import LocalAuth
+from ....structures.auth.snapshot import origin_of, read_snapshot, write_snapshot
+from ....structures.launchprofile import launch_options
+from ....logger import logger
+import os
+import shutil
+from playwright.async_api import Page
+
+
+class AsyncLocalAuth(LocalAuth, AsyncBaseAuth):
+    """
+    Local session persistence for the AsyncClient.
+    Shares its session directory and snapshot layout with LocalAuth.
+    """
+
+    async def authenticate(self, client_options, playwright) -> Page:
+        logger.info("Starting LocalAuth authentication.")
+        browser = client_options.get("browser")
+        snapshot = self._snapshot if self._snapshot is not None else browser is not None
+        self._origin = origin_of(client_options.get("web_url"))
+
+        if snapshot:
+            session_exists = os.path.exists(self.snapshot_path)
+            logger.debug(f"Session snapshot exists: {session_exists} at {self.snapshot_path}")
+            if browser is None:
+                browser = await playwright.chromium.launch(**launch_options(client_options))
+            state = read_snapshot(self.snapshot_path)["state"] if session_exists else None
+            ctx = await browser.new_context(storage_state=state)
+        else:
+            session_exists = os.path.exists(self.filepath)
+            logger.debug(f"Session directory exists: {session_exists} at {self.filepath}")
+            ctx = await playwright.chromium.launch_persistent_context(
+                user_data_dir=self.filepath,
+                **launch_options(client_options)
+            )
+        self._context = ctx
+        self.client._record_phase("browser")
+
+        if session_exists:
+            logger.info("Loading existing session.")
+            page = await self._load_session(client_options=client_options, browser_or_ctx=ctx)
+        else:
+            logger.info("No existing session found. Saving new session via QR login.")
+            page = await self._save_session(client_options=client_options, browser_or_ctx=ctx)
+
+        if snapshot:
+            await self.save_state()
+        return page
+
+    async def save_state(self) -> int:
+        """Awaitable counterpart of :meth:`LocalAuth.save_state`."""
+        return write_snapshot(await self._context.storage_state(indexed_db=True), self.snapshot_path, self._origin)
+
+    async def logout(self) -> None:
+        logger.info("Logging out and removing local session.")
+        await self.client.stop()
+        shutil.rmtree(self.filepath, ignore_errors=True)
+        logger.debug(f"Removed session directory: {self.filepath}")
+
+    async def _save_session(self, client_options, browser_or_ctx) -> Page:
+        logger.info("Authenticating via QR to save new session.")
+        try:
+            page = await self._auth_with_qr(browser_or_ctx=browser_or_ctx, client_options=client_options)
+            logger.info("New session saved successfully.")
+            return page
+        except Exception as e:
+            logger.error(f"Failed to save session: {e}")
+            raise
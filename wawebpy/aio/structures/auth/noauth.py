@@ -0,0 +1,24 @@
+from ....logger import logger
+from playwright.async_api import Page, Playwright
+
+from .baseauth import AsyncBaseAuth
+from ....structures.launchprofile import launch_options
+
+
+class AsyncNoAuth(AsyncBaseAuth):
+    """
+    QR-based login without any saved session, for the AsyncClient.
+    See NoAuth.
+    """
+
+    async def authenticate(self, client_options, playwright: Playwright) -> Page:
+        logger.info("Starting NoAuth authentication (QR required).")
+        browser = client_options.get("browser") or await playwright.chromium.launch(**launch_options(client_options))
+        self.client._record_phase("browser")
+        try:
+            page = await self._auth_with_qr(client_options=client_options, browser_or_ctx=browser)
+            logger.info("NoAuth authentication successful, session established.")
+            return page
+        except Exception as e:
+            logger.error("NoAuth authentication failed: %s", e)
+            raise
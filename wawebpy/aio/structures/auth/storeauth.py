@@ -0,0 +1,55 @@
+from .baseauth import AsyncBaseAuth
+from ....structures.auth.storeauth import StoreAuth
+from ....structures.auth.snapshot import origin_of
+from ....structures.launchprofile import launch_options
+from ....logger import logger
+from playwright.async_api import Page
+import asyncio
+
+
+class AsyncStoreAuth(StoreAuth, AsyncBaseAuth):
+    """
+    Store-backed session persistence for the AsyncClient.
+    Store operations are synchronous; both reference stores are local and quick.
+    Checkpoints compress and save the snapshot in a worker thread.
+    """
+
+    async def authenticate(self, client_options, playwright) -> Page:
+        logger.info(f"Starting StoreAuth authentication for session {self.session_id}.")
+        self._origin = origin_of(client_options.get("web_url"))
+        state = self._load_state()
+
+        browser = client_options.get("browser") or await playwright.chromium.launch(**launch_options(client_options))
+        ctx = await browser.new_context(storage_state=state)
+        self._context = ctx
+        self.client._record_phase("browser")
+
+        if state is not None:
+            logger.info("Loading stored session.")
+            page = await self._load_session(client_options=client_options, browser_or_ctx=ctx)
+        else:
+            logger.info("No stored session found. Saving new session via QR login.")
+            page = await self._auth_with_qr(browser_or_ctx=ctx, client_options=client_options)
+
+        await self.checkpoint(force=True)
+        return page
+
+    async def checkpoint(self, force: bool = False) -> bool:
+        """Awaitable counterpart of :meth:`StoreAuth.checkpoint`."""
+        if not self._due(force):
+            return False
+        state = await self._context.storage_state(indexed_db=True)
+        return await asyncio.to_thread(self._store_state, state)
+
+    async def save_state(self) -> bool:
+        """Awaitable counterpart of :meth:`StoreAuth.save_state`."""
+        return await self.checkpoint(force=True)
+
+    async def logout(self) -> None:
+        logger.info(f"Logging out and removing session {self.session_id} from the store.")
+        await self.client.stop()
+        self.store.delete(self.session_id)
+        self._digest = None
+
+
+__all__ = ["AsyncStoreAuth"]
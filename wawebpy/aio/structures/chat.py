@@ -0,0 +1,32 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple, Any
+from playwright.async_api import Page
+from ...exceptions import GettingChatError
+from ...structures.chat import BaseChat
+from ..bundle import call_bundle
+
+
+class AsyncChat(BaseChat):
+    """Chat bound to a ``playwright.async_api`` page; page-touching methods are awaitable."""
+
+    # --- Factory ---
+    @staticmethod
+    async def get(page: Page, jid: str) -> AsyncChat:
+        results, errors = await AsyncChat._fetch_attributes(page, [jid])
+        if jid in errors:
+            raise GettingChatError(f"Failed to fetch chat {jid}: {errors[jid]}")
+
+        return AsyncChat(page, **results[jid])
+
+    async def resync(self) -> None:
+        """Update this instance with fresh attributes from WhatsApp Web."""
+        new_chat = await AsyncChat.get(self.page, self.jid)
+        self.__dict__.update(new_chat.__dict__)
+
+    @classmethod
+    async def _fetch_attributes(cls, page: Page, jids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        batch = await call_bundle(page, "batchGetters", jids, cls._getter_map(), cls._getter_extras())
+        return batch["results"], batch["errors"]
+
+
+__all__ = ["AsyncChat"]
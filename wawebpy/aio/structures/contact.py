@@ -0,0 +1,166 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple, Union, Any, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .group import AsyncGroup
+    from ...structures.entitycache import BaseEntityCache
+from ...exceptions import StatusFetchError, ContactNotFound, ProfilePictureNotFound, WidFetchError
+from playwright.async_api import Page
+from ..bundle import call_bundle
+from ...structures.chat import ChatIDType
+from ...structures.contact import BaseContact
+from .chat import AsyncChat
+from ...logger import logger
+
+
+class AsyncContact(BaseContact, AsyncChat):
+    """Contact bound to a ``playwright.async_api`` page; page-touching methods are awaitable."""
+
+    # --- Actions ---
+    async def block(self) -> None:
+        logger.info(f"Blocking contact {self.jid}")
+        await call_bundle(self.page, "blockContact", self.jid)
+        logger.debug(f"Contact {self.jid} blocked.")
+
+    async def unblock(self) -> None:
+        logger.info(f"Unblocking contact {self.jid}")
+        await call_bundle(self.page, "unblockContact", self.jid)
+        logger.debug(f"Contact {self.jid} unblocked.")
+
+    # --- Factory ---
+    @staticmethod
+    async def get(page: Page, jid: str, cache: BaseEntityCache = None, refresh: bool = False) -> AsyncContact:
+        """Awaitable counterpart of :meth:`Contact.get`."""
+        logger.debug(f"Fetching contact {jid}")
+        if cache is not None and not refresh:
+            cached = cache.get("contact", jid)
+            if cached is not None:
+                logger.debug(f"Contact {jid} served from cache.")
+                return cached
+
+        try:
+            results, errors = await AsyncContact._fetch_attributes(page, [jid])
+        except Exception as e:
+            logger.exception(f"Failed to fetch contact {jid}")
+            raise ContactNotFound(f"Failed to fetch contact {jid}") from e
+
+        attrs = results.get(jid, {})
+        if not attrs.get("id"):
+            logger.warning(f"Contact {jid} not found in attributes: {errors.get(jid)}")
+            raise ContactNotFound(f"Contact {jid} not found")
+
+        logger.info(f"Contact {jid} fetched successfully.")
+        contact = AsyncContact._from_attributes(page, attrs)
+        contact._remember("contact", cache, jid)
+        return contact
+
+    @staticmethod
+    async def get_many(
+        page: Page, jids: List[str], cache: BaseEntityCache = None
+    ) -> Tuple[Dict[str, AsyncContact], Dict[str, Exception]]:
+        """Awaitable counterpart of :meth:`Contact.get_many`."""
+        jids = list(dict.fromkeys(jids))
+        logger.debug(f"Fetching {len(jids)} contacts")
+
+        contacts: Dict[str, AsyncContact] = {}
+        if cache is not None:
+            for jid in jids:
+                cached = cache.get("contact", jid)
+                if cached is not None:
+                    contacts[jid] = cached
+        missing = [jid for jid in jids if jid not in contacts]
+
+        try:
+            results, misses = await AsyncContact._fetch_attributes(page, missing) if missing else ({}, {})
+        except Exception as e:
+            logger.exception(f"Failed to fetch {len(missing)} contacts")
+            raise ContactNotFound(f"Failed to fetch {len(missing)} contacts") from e
+
+        errors: Dict[str, Exception] = {
+            jid: ContactNotFound(f"Contact {jid} not found: {reason}") for jid, reason in misses.items()
+        }
+        for jid, attrs in results.items():
+            if not attrs.get("id"):
+                errors[jid] = ContactNotFound(f"Contact {jid} not found")
+                continue
+            try:
+                contacts[jid] = AsyncContact._from_attributes(page, attrs)
+                contacts[jid]._remember("contact", cache, jid)
+            except WidFetchError as e:
+                errors[jid] = e
+
+        logger.info(f"Fetched {len(contacts)}/{len(jids)} contacts.")
+        return contacts, errors
+
+    @classmethod
+    def _from_attributes(cls, page: Page, attrs: Dict[str, Any]) -> AsyncContact:
+        # The WID getter already ran in-page; without a result there is nothing left to await.
+        if not attrs.get("wid"):
+            logger.error(f"No WID found for {attrs.get('id', {}).get('_serialized')}")
+            raise WidFetchError(f"Couldn't force WID conversion for contact '{attrs.get('name')}'.")
+        return super()._from_attributes(page, attrs)
+
+    async def resync(self) -> None:
+        logger.info(f"Resyncing contact {self.jid}")
+        new_contact = await AsyncContact.get(self.page, self.jid, cache=self._cache, refresh=True)
+        self.__dict__.update(new_contact.__dict__)
+        if self._cache is not None:
+            self._cache.invalidate(self.jid, ["common_groups"])
+        logger.debug(f"Contact {self.jid} resynced.")
+
+    # --- Contact-only methods ---
+    async def get_status(self) -> str:
+        logger.debug(f"Fetching status for {self.jid}")
+        try:
+            status = (await call_bundle(self.page, "getStatus", self.jid))["status"]
+            logger.info(f"Fetched status for {self.jid}: {status}")
+            return status
+        except Exception as e:
+            logger.exception(f"Failed to fetch status for {self.jid}")
+            raise StatusFetchError(f"Failed to fetch status for {self.jid}") from e
+
+    async def get_profile_picture(self) -> Union[str, None]:
+        logger.debug(f"Fetching profile picture for {self.jid}")
+        try:
+            pic = (await call_bundle(self.page, "getProfilePicture", self.jid))[0].get("eurl", None)
+            if not pic:
+                logger.warning(f"No profile picture found for {self.jid}")
+            else:
+                logger.info(f"Fetched profile picture for {self.jid}")
+
+            return pic
+        except Exception as e:
+            logger.exception(f"Failed to fetch profile picture for {self.jid}")
+            raise ProfilePictureNotFound(f"Failed to fetch profile picture for {self.jid}") from e
+
+    async def get_lid(self) -> ChatIDType:
+        logger.debug(f"Fetching LID for {self.jid}")
+        lid = await call_bundle(self.page, "getCurrentLid", self.jid)
+        logger.info(f"Fetched LID for {self.jid}")
+        return lid
+
+    async def get_common_groups(self) -> List[AsyncGroup]:
+        from .group import AsyncGroup
+
+        logger.debug(f"Fetching common groups for {self.jid}")
+        group_jids = self._cache.get("common_groups", self.jid) if self._cache is not None else None
+        if group_jids is None:
+            group_jids = await call_bundle(self.page, "getCommonGroups", self.jid)
+            if self._cache is not None:
+                self._cache.put("common_groups", self.jid, group_jids)
+        else:
+            logger.debug(f"Common groups of {self.jid} served from cache.")
+
+        groups, errors = await AsyncGroup.get_many(self.page, group_jids, cache=self._cache)
+        for jid, error in errors.items():
+            logger.warning(f"Failed to fetch group {jid} for common groups of {self.jid}: {error}")
+
+        common_groups = [groups[jid] for jid in group_jids if jid in groups]
+        logger.info(f"Found {len(common_groups)} common groups for {self.jid}")
+        return common_groups
+
+    async def get_wid(self) -> ChatIDType:
+        # Async contacts are only built once the page resolved their WID.
+        return self._wid
+
+
+__all__ = ["AsyncContact"]
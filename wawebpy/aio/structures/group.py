@@ -0,0 +1,151 @@
+from __future__ import annotations
+from typing import AsyncIterator, Dict, List, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ...structures.entitycache import BaseEntityCache
+
+from ...exceptions import GroupNotFound, FetchGroupMetadataError
+from ...logger import logger
+from playwright.async_api import Page
+from ...structures.group import BaseGroup, BaseGroupParticipant, GroupMetadata, GroupParticipantObject
+from .chat import AsyncChat
+from .contact import AsyncContact
+from ..bundle import call_bundle
+
+
+class AsyncGroupParticipant(BaseGroupParticipant, AsyncContact):
+    """Group member bound to a ``playwright.async_api`` page."""
+
+
+class AsyncGroup(BaseGroup, AsyncChat):
+    """Group bound to a ``playwright.async_api`` page; page-touching methods are awaitable."""
+
+    @staticmethod
+    async def get(page: Page, jid: str, cache: BaseEntityCache = None, refresh: bool = False) -> AsyncGroup:
+        """Awaitable counterpart of :meth:`Group.get`."""
+        logger.debug(f"Fetching group {jid}")
+        if cache is not None and not refresh:
+            cached = cache.get("group", jid)
+            if cached is not None:
+                logger.debug(f"Group {jid} served from cache")
+                return cached
+
+        try:
+            results, errors = await AsyncGroup._fetch_attributes(page, [jid])
+            if jid in errors:
+                raise GroupNotFound(f"Group {jid} not found: {errors[jid]}")
+
+            logger.info(f"Successfully fetched group {jid}")
+            group = AsyncGroup(page, **results[jid])
+            group._remember("group", cache, jid)
+            return group
+        except Exception as e:
+            logger.error(f"Failed to fetch group {jid}: {e}")
+            raise GroupNotFound(f"An error occurred while trying to get Group {jid}") from e
+
+    @staticmethod
+    async def get_many(
+        page: Page, jids: List[str], cache: BaseEntityCache = None
+    ) -> Tuple[Dict[str, AsyncGroup], Dict[str, Exception]]:
+        """Awaitable counterpart of :meth:`Group.get_many`."""
+        jids = list(dict.fromkeys(jids))
+        logger.debug(f"Fetching {len(jids)} groups")
+
+        groups: Dict[str, AsyncGroup] = {}
+        if cache is not None:
+            for jid in jids:
+                cached = cache.get("group", jid)
+                if cached is not None:
+                    groups[jid] = cached
+        missing = [jid for jid in jids if jid not in groups]
+
+        try:
+            results, misses = await AsyncGroup._fetch_attributes(page, missing) if missing else ({}, {})
+        except Exception as e:
+            logger.error(f"Failed to fetch {len(missing)} groups: {e}")
+            raise GroupNotFound(f"An error occurred while trying to get {len(missing)} groups") from e
+
+        errors: Dict[str, Exception] = {
+            jid: GroupNotFound(f"Group {jid} not found: {reason}") for jid, reason in misses.items()
+        }
+        for jid, attrs in results.items():
+            try:
+                groups[jid] = AsyncGroup(page, **attrs)
+                groups[jid]._remember("group", cache, jid)
+            except Exception as e:
+                errors[jid] = GroupNotFound(f"Group {jid} has incomplete attributes: {e}")
+
+        logger.info(f"Fetched {len(groups)}/{len(jids)} groups")
+        return groups, errors
+
+    async def resync(self) -> None:
+        logger.debug(f"Resyncing group {self.jid}")
+        try:
+            new_group = await AsyncGroup.get(self.page, self.jid, cache=self._cache, refresh=True)
+            self.__dict__.update(new_group.__dict__)
+            if self._cache is not None:
+                self._cache.invalidate(self.jid, ["group_metadata"])
+            logger.info(f"Resynced group {self.jid}")
+        except Exception as e:
+            logger.error(f"Failed to resync group {self.jid}: {e}")
+            raise e
+
+    async def get_metadata(self, refresh: bool = False) -> GroupMetadata:
+        logger.debug(f"Fetching metadata for group {self.jid}")
+        if self._cache is not None and not refresh:
+            cached = self._cache.get("group_metadata", self.jid)
+            if cached is not None:
+                logger.debug(f"Metadata for group {self.jid} served from cache")
+                return cached
+
+        try:
+            metadata = (await call_bundle(self.page, "queryGroupMetadata", self.jid))[0]
+            logger.info(f"Fetched metadata for group {self.jid}")
+            if self._cache is not None:
+                self._cache.put("group_metadata", self.jid, metadata)
+            return metadata
+        except Exception as e:
+            logger.error(f"Error fetching metadata for group {self.jid}: {e}")
+            raise FetchGroupMetadataError(
+                f"Failed to fetch Group Metadata for {self.jid}"
+            ) from e
+
+    async def get_participants(self) -> List[AsyncGroupParticipant]:
+        logger.debug(f"Fetching participants for group {self.jid}")
+        try:
+            participant_objects = await self._get_participant_objects()
+            participants = await self._resolve_participants(participant_objects)
+
+            logger.info(f"Fetched {len(participants)} participants for group {self.jid}")
+            return participants
+        except Exception as e:
+            logger.error(f"Error fetching participants for group {self.jid}: {e}")
+            raise FetchGroupMetadataError(
+                f"Failed to fetch participants for group {self.jid}"
+            ) from e
+
+    async def iter_participants(self, chunk_size: int = 256) -> AsyncIterator[List[AsyncGroupParticipant]]:
+        """Asynchronously yields the group participants in chunks of at most ``chunk_size``."""
+        logger.debug(f"Streaming participants for group {self.jid} in chunks of {chunk_size}")
+        try:
+            participant_objects = await self._get_participant_objects()
+        except Exception as e:
+            logger.error(f"Error fetching participants for group {self.jid}: {e}")
+            raise FetchGroupMetadataError(
+                f"Failed to fetch participants for group {self.jid}"
+            ) from e
+
+        for i in range(0, len(participant_objects), chunk_size):
+            yield await self._resolve_participants(participant_objects[i:i + chunk_size])
+
+    async def _get_participant_objects(self) -> List[GroupParticipantObject]:
+        return self._valid_participant_objects(await self.get_metadata())
+
+    async def _resolve_participants(
+        self, participant_objects: List[GroupParticipantObject]
+    ) -> List[AsyncGroupParticipant]:
+        jids = [obj["id"]["_serialized"] for obj in participant_objects]
+        results, errors = await AsyncGroupParticipant._fetch_attributes(self.page, jids)
+        return self._build_participants(AsyncGroupParticipant, participant_objects, results, errors)
+
+
+__all__ = ["AsyncGroup", "AsyncGroupParticipant"]
@@ -0,0 +1,22 @@
+from ...structures.history import HistoryChunk
+from ...logger import logger
+from ..bundle import call_bundle
+from typing import AsyncIterator, Optional
+
+
+async def iter_history(page, chat_id: str, chunk_size: int = 100, before: Optional[str] = None) -> AsyncIterator[HistoryChunk]:
+    """Async iterator counterpart of :func:`wawebpy.structures.history.iter_history`."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    while True:
+        chunk: HistoryChunk = await call_bundle(page, "loadHistory", chat_id, before, chunk_size)
+        logger.debug(f"Loaded {len(chunk['messages'])} messages of {chat_id} before {before}")
+        if chunk["messages"]:
+            yield chunk
+        if chunk["done"] or not chunk["messages"]:
+            return
+        before = chunk["cursor"]
+
+
+__all__ = ["iter_history"]
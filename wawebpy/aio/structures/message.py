@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import List, Union
+from ...structures.message import BaseMessage, MessageDetails, MediaInfo, _UNSET
+from ...logger import logger
+from .contact import AsyncContact
+from ..bundle import call_bundle
+
+
+class AsyncMessage(BaseMessage):
+    """Message bound to a ``playwright.async_api`` page; lazy fields are fetched by coroutines."""
+
+    __slots__ = ()
+
+    async def get_contact(self) -> AsyncContact:
+        """Fetches the Contact that sent the message. Memoized."""
+        if self._contact is _UNSET:
+            jid = self.author or self.from_
+            logger.debug(f"Fetching sender {jid} of message {self.id}")
+            self._contact = await AsyncContact.get(self.page, jid, cache=self._cache)
+        return self._contact
+
+    async def get_quoted_message(self) -> Union[AsyncMessage, None]:
+        """Returns the message this one quotes, or None. Memoized."""
+        if self._quoted_message is _UNSET:
+            quoted = (await self._get_details())["quoted"] if self.has_quoted_msg else None
+            self._quoted_message = self._from_payload(quoted) if quoted else None
+        return self._quoted_message
+
+    async def get_media_info(self) -> Union[MediaInfo, None]:
+        """Returns the media descriptor, or None for messages without media. Memoized."""
+        if not self.has_media:
+            return None
+        return (await self._get_details())["media"]
+
+    async def get_mentions(self) -> List[str]:
+        """Returns the serialized JIDs mentioned in the message. Memoized."""
+        return (await self._get_details())["mentions"]
+
+    async def _get_details(self) -> MessageDetails:
+        if self._details is _UNSET:
+            logger.debug(f"Hydrating message {self.id}")
+            self._details = self._parse_details(await call_bundle(self.page, "getMessageDetails", self.id))
+        return self._details
+
+
+__all__ = ["AsyncMessage"]
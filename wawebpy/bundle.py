@@ -0,0 +1,619 @@
+from playwright.sync_api import Page
+from typing import Any, List, Optional, get_args
+from .constants import WAWebModuleType
+from .exceptions import ClientInitError
+from .logger import logger
+import json
+
+# Bump whenever BUNDLE_SCRIPT changes, so pages holding an older bundle get it replaced.
+BUNDLE_VERSION = 13
+
+# Serializes a Msg model into a MessagePayload. Media bodies hold a base64
+# thumbnail, so only the caption is sent for non-text messages.
+SERIALIZE_MESSAGE_JS = """(msg) => ({
+    id: msg.id._serialized,
+    from_: (msg.from || msg.id.remote)._serialized,
+    to: msg.to ? msg.to._serialized : null,
+    author: msg.author ? msg.author._serialized : null,
+    timestamp: msg.t,
+    type: msg.type,
+    body: (msg.type === "chat" ? msg.body : msg.caption) || "",
+    fromMe: msg.id.fromMe,
+    hasMedia: Boolean(msg.mediaKey && msg.directPath),
+    hasQuotedMsg: Boolean(msg.quotedMsg),
+    ack: msg.ack,
+    isForwarded: Boolean(msg.isForwarded),
+})"""
+
+# Page binding that receives the acks of outgoing messages (see Outbox).
+SEND_ACK_BINDING = "__wawebpyOnSendAck"
+
+# Page binding that receives failed media downloads (see MediaDownloader).
+MEDIA_ERROR_BINDING = "__wawebpyOnMediaError"
+
+# Prefix of the file name a media download is saved under; the job's ref follows it.
+MEDIA_DOWNLOAD_PREFIX = "wawebpy-media-"
+
+# Attribute of the file inputs outgoing media is staged in; its value is the job's ref.
+MEDIA_UPLOAD_ATTR = "data-wawebpy-upload"
+
+# How often and how many times whenModules retries modules that aren't defined yet.
+MODULE_WAIT_INTERVAL_MS = 250
+MODULE_WAIT_ATTEMPTS = 240
+
+# Installs ``window.__wawebpy``. Every helper takes plain JSON arguments, so
+# the page compiles this once and each call only passes data.
+BUNDLE_SCRIPT = f"""(() => {{
+    const version = {BUNDLE_VERSION};
+    if (window.__wawebpy && window.__wawebpy.version === version) return version;
+
+    // Module handles, resolved once per document. A reload of WhatsApp Web
+    // starts a new document with an empty registry. Failed lookups aren't
+    // remembered, since lazily loaded modules may show up later.
+    const registry = new Map();
+    // Paths whenModules gave up on; resolveModules reports them as missing.
+    const unresolved = new Set();
+    const mod = (path) => {{
+        let value = registry.get(path);
+        if (value === undefined) {{
+            const [name, ...attrs] = path.split(".");
+            value = attrs.reduce((parent, attr) => parent == null ? parent : parent[attr], require(name));
+            if (value == null) throw new Error(`Module ${{path}} is not available`);
+            registry.set(path, value);
+        }}
+        return value;
+    }};
+    const contactIndex = () => mod("WAWebContactCollection.ContactCollection")._index;
+    const model = (jid) => {{
+        const found = contactIndex()[jid];
+        if (!found) throw new Error(`${{jid}} is missing from ContactCollection`);
+        return found;
+    }};
+    const serializeMessage = {SERIALIZE_MESSAGE_JS};
+    const findChat = async (chatId) => {{
+        const loaded = mod("WAWebCollections").Chat.get(chatId);
+        if (loaded) return loaded;
+        const found = await mod("WAWebFindChatAction").findOrCreateLatestChat(mod("WAWebWidFactory").createWid(chatId));
+        return found && found.chat ? found.chat : found;
+    }};
+
+    // At most ``limit`` holders at once; the rest wait in order. The limit may
+    // change between calls.
+    const slots = (limit) => ({{
+        limit,
+        active: 0,
+        waiting: [],
+        take() {{
+            if (this.active < this.limit) {{
+                this.active += 1;
+                return Promise.resolve();
+            }}
+            return new Promise((resolve) => this.waiting.push(resolve));
+        }},
+        give() {{
+            if (this.waiting.length && this.active <= this.limit) this.waiting.shift()();
+            else this.active -= 1;
+        }},
+    }});
+
+    // Outgoing messages. Each chat has a promise chain, so its messages go out in
+    // order while other chats proceed in parallel. A token bucket shared by all
+    // chats paces the account; a chat only takes a token once it is its turn.
+    const outbox = {{
+        chains: new Map(),
+        gate: Promise.resolve(),
+        rate: 1,
+        burst: 1,
+        ackTimeout: null,
+        uploads: slots(1),
+        tokens: null,
+        updated: 0,
+        acks: [],
+        flushing: false,
+    }};
+    const takeToken = () => {{
+        outbox.gate = outbox.gate.then(async () => {{
+            for (;;) {{
+                const now = Date.now();
+                outbox.tokens = Math.min(outbox.burst, outbox.tokens + (now - outbox.updated) / 1000 * outbox.rate);
+                outbox.updated = now;
+                if (outbox.tokens >= 1) {{
+                    outbox.tokens -= 1;
+                    return;
+                }}
+                await new Promise((resolve) => setTimeout(resolve, (1 - outbox.tokens) / outbox.rate * 1000));
+            }}
+        }});
+        return outbox.gate;
+    }};
+    // Acks of one task are delivered as one binding call.
+    const pushAck = (ack) => {{
+        outbox.acks.push(ack);
+        if (outbox.flushing) return;
+        outbox.flushing = true;
+        setTimeout(() => {{
+            const acks = outbox.acks;
+            outbox.acks = [];
+            outbox.flushing = false;
+            window.{SEND_ACK_BINDING}(acks);
+        }}, 0);
+    }};
+    // Outgoing media is staged by Python in a file input (set_input_files), so the
+    // page gets a disk-backed File instead of encoded bytes. It is prepared and
+    // uploaded as soon as an upload slot is free; only sending waits for the
+    // chat's turn.
+    const prepareMedia = async ({{ ref, mimetype, filename, asDocument }}) => {{
+        const input = document.querySelector(`input[{MEDIA_UPLOAD_ATTR}="${{ref}}"]`);
+        const staged = input && input.files[0];
+        if (input) input.remove();
+        if (!staged) throw new Error(`No file was staged for upload ${{ref}}`);
+
+        const OpaqueData = mod("WAWebMediaOpaqueData");
+        const file = new File([staged], filename, {{ type: mimetype }});
+        const prep = mod("WAWebPrepRawMedia").prepRawMedia(await OpaqueData.createFromData(file, file.type), {{ asDocument }});
+        const mediaData = await prep.waitForPrep();
+        const mediaObject = mod("WAWebMediaStorage").getOrCreateMediaObject(mediaData.filehash);
+        const mediaType = mod("WAWebMmsMediaTypes").msgToMediaType({{ type: mediaData.type, isGif: mediaData.isGif }});
+        if (!(mediaData.mediaBlob instanceof OpaqueData)) {{
+            mediaData.mediaBlob = await OpaqueData.createFromData(mediaData.mediaBlob, mediaData.mediaBlob.type);
+        }}
+        mediaData.renderableUrl = mediaData.mediaBlob.url();
+        mediaObject.consolidate(mediaData.toJSON());
+        mediaData.mediaBlob.autorelease();
+
+        const {{ mediaEntry }} = await mod("WAWebMediaMmsV4Upload").uploadMedia({{ mimetype: mediaData.mimetype, mediaObject, mediaType }});
+        mediaData.set({{
+            clientUrl: mediaEntry.mediaUrl,
+            directPath: mediaEntry.directPath,
+            mediaKey: mediaEntry.mediaKey,
+            mediaKeyTimestamp: mediaEntry.mediaKeyTimestamp,
+            filehash: mediaObject.filehash,
+            encFilehash: mediaEntry.encFilehash,
+            uploadhash: mediaEntry.uploadHash,
+            size: mediaObject.size,
+            streamingSidecar: mediaEntry.sidecar,
+            firstFrameSidecar: mediaEntry.firstFrameSidecar,
+        }});
+        return mediaData;
+    }};
+    // Fields of uploaded media that let it be sent again without another upload
+    // (see MediaCache). Blobs and sidecars stay behind.
+    const UPLOAD_FIELDS = [
+        "type", "mimetype", "filename", "filehash", "encFilehash", "uploadhash", "size",
+        "directPath", "mediaKey", "mediaKeyTimestamp", "clientUrl",
+        "width", "height", "duration", "isGif", "preview",
+    ];
+    const uploadHandle = (mediaData) => Object.fromEntries(
+        UPLOAD_FIELDS.filter((field) => mediaData[field] != null).map((field) => [field, mediaData[field]])
+    );
+    const sendOne = async ({{ ref, chatId, body, media, prepared }}) => {{
+        const mediaData = prepared ? await prepared : null;
+        const chat = await findChat(chatId);
+        const meUser = mod("WAWebUserPrefsMeUser").getMaybeMeUser();
+        const MsgKey = mod("WAWebMsgKey");
+        const key = new MsgKey({{
+            from: meUser,
+            to: chat.id,
+            id: await MsgKey.newId(),
+            participant: chat.id.isGroup() ? meUser : undefined,
+            selfDir: "out",
+        }});
+        const result = mod("WAWebSendMsgChatAction").addAndSendMsgToChat(chat, {{
+            id: key,
+            ack: 0,
+            body,
+            from: meUser,
+            to: chat.id,
+            local: true,
+            self: "out",
+            t: Math.floor(Date.now() / 1000),
+            isNewMsg: true,
+            type: "chat",
+            ...(mediaData ? {{
+                ...mediaData,
+                body: mediaData.type === "sticker" ? undefined : mediaData.preview,
+                caption: body,
+            }} : {{}}),
+        }});
+        const [added, sent] = Array.isArray(result) ? result : [result, result];
+        await added;
+        const id = key._serialized;
+        pushAck(mediaData && !media.handle ? {{ ref, id, ack: 0, upload: uploadHandle(mediaData) }} : {{ ref, id, ack: 0 }});
+
+        // Exactly one final ack per message: the server ack, a failure, or the timeout.
+        let settled = false;
+        let unlisten = () => {{}};
+        const settle = (ack) => {{
+            if (settled) return;
+            settled = true;
+            clearTimeout(timer);
+            unlisten();
+            pushAck(ack);
+        }};
+        const timer = outbox.ackTimeout ? setTimeout(
+            () => settle({{ ref, id, error: `No server ack within ${{outbox.ackTimeout / 1000}}s` }}),
+            outbox.ackTimeout,
+        ) : null;
+
+        let sendResult;
+        try {{
+            sendResult = await sent;
+        }} catch (e) {{
+            settle({{ ref, id, error: String((e && e.message) || e) }});
+            return;
+        }}
+        if (sendResult && sendResult.messageSendResult && sendResult.messageSendResult !== "OK") {{
+            settle({{ ref, id, error: `Send failed: ${{sendResult.messageSendResult}}` }});
+            return;
+        }}
+        const msg = mod("WAWebCollections").Msg.get(id);
+        if (!msg || msg.ack >= 1) {{
+            settle({{ ref, id, ack: msg ? msg.ack : 1 }});
+            return;
+        }}
+        const onAck = () => {{
+            if (msg.ack < 0) settle({{ ref, id, error: `Message failed with ack ${{msg.ack}}` }});
+            else if (msg.ack >= 1) settle({{ ref, id, ack: msg.ack }});
+        }};
+        unlisten = () => msg.off("change:ack", onAck);
+        msg.on("change:ack", onAck);
+    }};
+
+    // History exports in progress, per chat.
+    const histories = new Map();
+
+    // Media downloads. The decrypted bytes leave the page as a browser download
+    // of a blob URL, which Playwright writes to disk, instead of being encoded
+    // into an evaluate result. At most ``limit`` blobs are alive at once: a slot
+    // is taken before fetching and given back once Python saved the file, or
+    // when the download's deadline passes, e.g. because downloads are disabled.
+    const media = {{
+        slots: slots(1),
+        held: new Map(),
+        urls: new Map(),
+    }};
+    const downloadOne = async ({{ ref, id }}, signal) => {{
+        const msg = mod("WAWebCollections").Msg.get(id);
+        if (!msg) throw new Error(`Message ${{id}} is not loaded`);
+        if (!msg.directPath || !msg.mediaKey) throw new Error(`Message ${{id}} has no downloadable media`);
+        const data = await mod("WAWebDownloadManager.downloadManager").downloadAndMaybeDecrypt({{
+            directPath: msg.directPath,
+            encFilehash: msg.encFilehash,
+            filehash: msg.filehash,
+            mediaKey: msg.mediaKey,
+            mediaKeyTimestamp: msg.mediaKeyTimestamp,
+            type: msg.type,
+            signal,
+        }});
+        const url = URL.createObjectURL(new Blob([data], {{ type: msg.mimetype }}));
+        media.urls.set(ref, url);
+        const link = document.createElement("a");
+        link.href = url;
+        link.download = `{MEDIA_DOWNLOAD_PREFIX}${{ref}}`;
+        link.click();
+    }};
+
+    // Attributes computed from the model that no getter module provides.
+    const extras = {{
+        // Resolves the phone-number WID so that LID contacts need no extra round-trip.
+        // Unsupported servers yield null and fall back to Contact.get_wid, which raises.
+        wid: (model) => {{
+            if (model.id.server === "c.us") return model.id;
+            if (model.id.server === "lid") return mod("WAWebApiContact").getPhoneNumber(model.id) || null;
+            return null;
+        }},
+    }};
+
+    window.__wawebpy = {{
+        version,
+        mod,
+        serializeMessage,
+
+        resolveModules(paths) {{
+            const missing = [];
+            for (const path of paths) {{
+                try {{
+                    mod(path);
+                }} catch (e) {{
+                    missing.push(path);
+                }}
+            }}
+            for (const path of unresolved) {{
+                if (!missing.includes(path)) missing.push(path);
+            }}
+            return missing;
+        }},
+
+        // Calls ``fn`` with the modules at ``paths`` once all of them resolve. Init
+        // scripts run before WhatsApp Web defined its modules, so this retries
+        // every {MODULE_WAIT_INTERVAL_MS} ms, at most {MODULE_WAIT_ATTEMPTS} times, then records the
+        // paths as unresolved. Returns the paths that are still missing now.
+        // Only the top document runs WhatsApp Web.
+        whenModules(paths, fn, attempts = {MODULE_WAIT_ATTEMPTS}) {{
+            if (window !== window.top) return [];
+            let modules;
+            try {{
+                modules = paths.map(mod);
+            }} catch (e) {{
+                const missing = paths.filter((path) => {{
+                    try {{
+                        mod(path);
+                        return false;
+                    }} catch (e) {{
+                        return true;
+                    }}
+                }});
+                if (attempts > 1) {{
+                    setTimeout(() => window.__wawebpy.whenModules(paths, fn, attempts - 1), {MODULE_WAIT_INTERVAL_MS});
+                }} else {{
+                    missing.forEach((path) => unresolved.add(path));
+                    console.error(`wawebpy: gave up waiting for WhatsApp Web modules ${{missing.join(", ")}}`);
+                }}
+                return missing;
+            }}
+            fn(...modules);
+            return [];
+        }},
+
+        batchGetters(jids, getters, extraNames) {{
+            const index = contactIndex();
+            const modules = Object.fromEntries(Object.keys(getters).map((name) => [name, mod(name)]));
+            const results = {{}};
+            const errors = {{}};
+            for (const jid of jids) {{
+                const found = index[jid];
+                if (!found) {{
+                    errors[jid] = "missing from ContactCollection";
+                    continue;
+                }}
+                try {{
+                    const attrs = {{}};
+                    for (const [name, map] of Object.entries(getters)) {{
+                        for (const [fn, attr] of Object.entries(map)) {{
+                            attrs[attr] = modules[name][fn](found);
+                        }}
+                    }}
+                    for (const attr of extraNames) {{
+                        attrs[attr] = extras[attr](found);
+                    }}
+                    results[jid] = attrs;
+                }} catch (e) {{
+                    errors[jid] = String(e);
+                }}
+            }}
+            return {{ results, errors }};
+        }},
+
+        setStatus: (status) => mod("WAWebContactStatusBridge").setMyStatus(status),
+        blockContact: (jid) => mod("WAWebBlockContactAction").blockContact(model(jid)),
+        unblockContact: (jid) => mod("WAWebBlockContactAction").unblockContact(model(jid)),
+        getStatus: (jid) => mod("WAWebContactStatusBridge").getStatus(model(jid).id),
+        getProfilePicture: (jid) => mod("WAWebContactProfilePicThumbBridge").profilePicResync([model(jid)]),
+        getCurrentLid: (jid) => mod("WAWebApiContact").getCurrentLid(model(jid).id),
+        getPhoneNumber: (jid) => mod("WAWebApiContact").getPhoneNumber(model(jid).id),
+        createWid: (jid) => mod("WAWebWidFactory").createWid(model(jid).id),
+        async getCommonGroups(jid) {{
+            const groups = await mod("WAWebFindCommonGroupsContactAction").findCommonGroups(model(jid));
+            return Object.keys((groups && groups._index) || {{}});
+        }},
+        queryGroupMetadata: (jid) => mod("WAWebGroupQueryJob").queryGroupsById([model(jid).id._serialized]),
+
+        sendMessages(jobs, rate, burst, ackTimeout, uploadLimit) {{
+            outbox.rate = rate;
+            outbox.burst = burst;
+            outbox.ackTimeout = ackTimeout;
+            outbox.uploads.limit = uploadLimit;
+            if (outbox.tokens === null) {{
+                outbox.tokens = burst;
+                outbox.updated = Date.now();
+            }}
+            for (const job of jobs) {{
+                if (job.media) {{
+                    // A handle of an earlier upload is sent as it is.
+                    job.prepared = job.media.handle ? Promise.resolve(job.media.handle) : outbox.uploads.take()
+                        .then(() => prepareMedia({{ ref: job.ref, ...job.media }}))
+                        .finally(() => outbox.uploads.give());
+                    // Failures surface when the job's turn comes.
+                    job.prepared.catch(() => {{}});
+                }}
+                const tail = (outbox.chains.get(job.chatId) || Promise.resolve())
+                    .then(takeToken)
+                    .then(() => sendOne(job))
+                    .catch((e) => pushAck({{ ref: job.ref, error: String((e && e.message) || e) }}));
+                outbox.chains.set(job.chatId, tail);
+                tail.then(() => {{
+                    if (outbox.chains.get(job.chatId) === tail) outbox.chains.delete(job.chatId);
+                }});
+            }}
+            return jobs.length;
+        }},
+
+        // Returns up to ``limit`` messages older than the message ``before`` (the
+        // newest ones without a cursor), newest first. Earlier messages are
+        // loaded from WhatsApp as needed.
+        async loadHistory(chatId, before, limit) {{
+            const chat = await findChat(chatId);
+            const models = () => chat.msgs.getModelsArray();
+            // Where the previous chunk left the cursor, so paging needn't search the chat.
+            let state = histories.get(chatId);
+            if (!before || !state || state.cursor !== before) {{
+                state = {{ cursor: before, index: -1, original: new Set(models().map((msg) => msg.id._serialized)) }};
+                histories.set(chatId, state);
+            }}
+            const locate = (guess) => {{
+                const all = models();
+                if (!before) return all.length;
+                if (all[guess] && all[guess].id._serialized === before) return guess;
+                return all.findIndex((msg) => msg.id._serialized === before);
+            }};
+
+            let end = locate(state.index);
+            let exhausted = Boolean(chat.msgs.msgLoadState.noEarlierMsgs);
+            while ((end === -1 || end < limit) && !exhausted) {{
+                const loaded = await mod("WAWebChatLoadMessages").loadEarlierMsgs(chat);
+                exhausted = !loaded || !loaded.length || Boolean(chat.msgs.msgLoadState.noEarlierMsgs);
+                // Earlier messages are inserted before the cursor.
+                end = locate(end === -1 ? -1 : end + (loaded ? loaded.length : 0));
+            }}
+            if (end === -1) throw new Error(`Cursor ${{before}} is not in the history of ${{chatId}}`);
+
+            const start = Math.max(0, end - limit);
+            const chunk = models().slice(start, end).reverse();
+            const messages = chunk.map(serializeMessage);
+            const cursor = chunk.length ? chunk[chunk.length - 1].id._serialized : before;
+            const done = start === 0 && exhausted;
+
+            // Messages the export loaded are dropped once exported, so the page holds
+            // one chunk at a time. The cursor stays as the anchor of the next load;
+            // messages that were loaded before the export began are left alone.
+            const stale = models().slice(start + 1, end + 1).filter((msg) => !state.original.has(msg.id._serialized));
+            if (stale.length) {{
+                try {{
+                    chat.msgs.remove(stale);
+                }} catch (e) {{}}
+            }}
+            if (done) histories.delete(chatId);
+            else Object.assign(state, {{ cursor, index: start }});
+            return {{ messages, cursor, done }};
+        }},
+
+        downloadMedia(jobs, limit, timeout) {{
+            media.slots.limit = limit;
+            const fail = (ref, error) => {{
+                if (!media.held.has(ref)) return;
+                window.__wawebpy.releaseMedia(ref);
+                window.{MEDIA_ERROR_BINDING}(ref, error);
+            }};
+            for (const job of jobs) {{
+                media.slots.take()
+                    .then(() => {{
+                        const controller = new AbortController();
+                        media.held.set(job.ref, setTimeout(() => {{
+                            controller.abort();
+                            fail(job.ref, `Media download timed out after ${{timeout / 1000}}s`);
+                        }}, timeout));
+                        return downloadOne(job, controller.signal);
+                    }})
+                    .catch((e) => fail(job.ref, String(e && e.message || e)));
+            }}
+        }},
+
+        mediaHashes(ids) {{
+            const Msg = mod("WAWebCollections").Msg;
+            return Object.fromEntries(ids.map((id) => {{
+                const msg = Msg.get(id);
+                return [id, (msg && msg.filehash) || null];
+            }}));
+        }},
+
+        releaseMedia(ref) {{
+            if (!media.held.has(ref)) return;
+            clearTimeout(media.held.get(ref));
+            media.held.delete(ref);
+            const url = media.urls.get(ref);
+            if (url) {{
+                URL.revokeObjectURL(url);
+                media.urls.delete(ref);
+            }}
+            media.slots.give();
+        }},
+
+        stageUpload(ref) {{
+            const input = document.createElement("input");
+            input.type = "file";
+            input.style.display = "none";
+            input.setAttribute("{MEDIA_UPLOAD_ATTR}", String(ref));
+            document.body.appendChild(input);
+        }},
+
+        getMessageDetails(id) {{
+            const msg = mod("WAWebCollections").Msg.get(id);
+            if (!msg) return null;
+            const quoted = msg.quotedMsg ? mod("WAWebQuotedMsgModelUtils").getQuotedMsgObj(msg) : null;
+            return {{
+                quoted: quoted ? serializeMessage(quoted) : null,
+                media: msg.mediaKey && msg.directPath ? {{
+                    mimetype: msg.mimetype,
+                    filename: msg.filename || null,
+                    size: msg.size,
+                    duration: msg.duration || null,
+                    width: msg.width || null,
+                    height: msg.height || null,
+                    directPath: msg.directPath,
+                    mediaKey: msg.mediaKey,
+                    mediaKeyTimestamp: msg.mediaKeyTimestamp,
+                    filehash: msg.filehash,
+                    encFilehash: msg.encFilehash,
+                }} : null,
+                mentions: (msg.mentionedJidList || []).map((wid) => wid._serialized),
+            }};
+        }},
+    }};
+    return version;
+}})()"""
+
+# Every module the bundle resolves up front.
+MODULES: List[str] = list(get_args(WAWebModuleType))
+
+# Marker returned by BUNDLE_CALL when the page has no (or an outdated) bundle.
+_MISSING = "__wawebpyBundleMissing"
+
+# The only expression evaluated per call; its source never changes.
+BUNDLE_CALL = f"""([name, args, version]) => {{
+    const bundle = window.__wawebpy;
+    if (!bundle || bundle.version !== version) return {json.dumps(_MISSING)};
+    return bundle[name](...args);
+}}"""
+
+
+def install_bundle(page: Page) -> List[str]:
+    """
+    Injects the helper bundle into ``page`` now and into every document it loads later,
+    then resolves every module of WAWebModuleType into the in-page registry.
+
+    Returns:
+        List[str]: The modules that couldn't be resolved.
+    """
+    logger.debug(f"Installing helper bundle v{BUNDLE_VERSION}.")
+    page.add_init_script(BUNDLE_SCRIPT)
+    page.evaluate(BUNDLE_SCRIPT)
+    return _report_missing(page.evaluate(BUNDLE_CALL, ["resolveModules", [MODULES], BUNDLE_VERSION]))
+
+
+def _report_missing(missing: List[str]) -> List[str]:
+    if missing:
+        logger.warning(f"{len(missing)}/{len(MODULES)} WhatsApp Web modules are missing: {', '.join(missing)}")
+    else:
+        logger.info(f"Resolved all {len(MODULES)} WhatsApp Web modules.")
+    return missing
+
+
+def require_modules(missing: Optional[List[str]], user: str) -> None:
+    """
+    Fails when modules ``user`` waits for with ``whenModules`` aren't defined
+    in a page that is already ready, as they would never show up.
+
+    Raises:
+        ClientInitError: If ``missing`` names any module
+    """
+    if missing:
+        logger.error(f"{user} can't start; WhatsApp Web modules are missing: {', '.join(missing)}")
+        raise ClientInitError(f"{user} needs WhatsApp Web modules that are missing: {', '.join(missing)}")
+
+
+def call_bundle(page: Page, name: str, *args: Any) -> Any:
+    """
+    Calls ``window.__wawebpy[name](*args)`` in ``page``.
+
+    Arguments are passed as structured data, never interpolated into source.
+    The bundle is injected on the fly if the page doesn't have it yet.
+    """
+    result = page.evaluate(BUNDLE_CALL, [name, list(args), BUNDLE_VERSION])
+    if result == _MISSING:
+        logger.debug(f"Helper bundle missing for '{name}', injecting it.")
+        page.evaluate(BUNDLE_SCRIPT)
+        result = page.evaluate(BUNDLE_CALL, [name, list(args), BUNDLE_VERSION])
+    return result
+
+
+__all__ = ["BUNDLE_VERSION", "BUNDLE_SCRIPT", "SEND_ACK_BINDING", "MEDIA_ERROR_BINDING", "MEDIA_DOWNLOAD_PREFIX", "MEDIA_UPLOAD_ATTR", "BUNDLE_CALL", "MODULES", "SERIALIZE_MESSAGE_JS", "install_bundle", "require_modules", "call_bundle"]
@@ -5,6 +5,14 @@ from .structures.eventemitter import EventEmitter
 from .structures.clientoptions import ClientOptions
 from .structures.contact import Contact
 from .structures.group import Group
+from .structures.entitycache import BaseEntityCache
+from .structures.dispatcher import Dispatcher
+from .structures.collectionwatcher import CollectionWatcher
+from .structures.messagewatcher import MessageWatcher
+from .structures.outbox import Outbox, SendHandle
+from .structures.history import HistoryChunk, JsonlSink, iter_history
+from .structures.media import MediaDownload, MediaDownloader, MediaSink, MediaSource
+from .structures.mediacache import MediaCache
 from .logger import logger
 from .exceptions import (
     ClientAlreadyInitialized,
@@ -13,15 +21,24 @@ from .exceptions import (
     ClientStopError,
     SettingStatusError,
     GettingChatError,
+    MessageSendError,
+    MediaDownloadError,
 )
-from qrcode import QRCode
-from .util import get_module_script
-from typing import overload, Literal, Callable, Union
+from .structures.qr import QrCode
+from .bundle import call_bundle, install_bundle
+import time
+from typing import overload, Literal, Callable, Union, Optional, List, Dict, Tuple, Iterator
 from playwright.sync_api import sync_playwright, Playwright, Page
 
 
-class Client(EventEmitter):
-    """Main client class for interacting with WhatsApp Web via Playwright."""
+class BaseClient(EventEmitter):
+    """
+    State, options and events shared by :class:`Client` and the awaitable
+    ``AsyncClient``, which add the methods that talk to the page.
+
+    Subclasses set ``_auth_type``, the auth base class they accept, and
+    ``_default_auth``, the auth used when the options have none.
+    """
 
     def __init__(self):
         """
@@ -31,7 +48,15 @@ class Client(EventEmitter):
         # Pre Initialization
         self._initialized: bool = False
         self._playwright: Playwright = None
+        self._owns_playwright: bool = True
+        self._owns_browser: bool = True
         self._page: Page = None
+        self._cache: Optional[BaseEntityCache] = None
+        self._missing_modules: List[str] = []
+        self._outbox: Optional[Outbox] = None
+        self._downloader: Optional[MediaDownloader] = None
+        self._startup_timings: Dict[str, float] = {}
+        self._phase_started: float = 0.0
 
         logger.debug("Client instance created (not initialized yet).")
 
@@ -41,7 +66,9 @@ class Client(EventEmitter):
     @overload
     def on(self, event_name: Literal["message"], callback: Callable[[Message], None]) -> None: ...
     @overload
-    def on(self, event_name: Literal["qr"], callback: Callable[[QRCode], None]) -> None: ...
+    def on(self, event_name: Literal["qr"], callback: Callable[[QrCode], None]) -> None: ...
+    @overload
+    def on(self, event_name: Literal["message_ack"], callback: Callable[[str, int], None]) -> None: ...
     @overload
     def on(self, event_name: Literal["connection"], callback: Callable[[], None]) -> None: ...
 
@@ -52,26 +79,59 @@ class Client(EventEmitter):
         logger.debug(f"Registered event listener for '{event_name}'.")
         return super().on(event_name=event_name, callback=callback)
 
+    @overload
+    def on_batch(self, event_name: Literal["message"], callback: Callable[[List[Message]], None]) -> None: ...
+
+    def on_batch(self, event_name: str, callback: Callable[[List], None]) -> None:
+        """
+        Registers a listener receiving batched events as one list.
+        See the ``event_batch_size`` and ``event_batch_interval`` options.
+        """
+        logger.debug(f"Registered batch event listener for '{event_name}'.")
+        return super().on_batch(event_name=event_name, callback=callback)
+
     @property
     def initialized(self):
         """Returns True if the client has been initialized, False otherwise."""
         return self._initialized
 
-    def initialize(self, options: ClientOptions):
+    @property
+    def cache(self) -> Optional[BaseEntityCache]:
+        """Returns the entity cache passed in the options, or None when caching is disabled."""
+        return self._cache
+
+    @property
+    def missing_modules(self) -> List[str]:
+        """Returns the WhatsApp Web modules that couldn't be resolved when the client initialized."""
+        return self._missing_modules
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
         """
-        Initializes the client, starts Playwright, opens a browser page,
-        and triggers the authentication method.
+        Returns how many seconds each phase of the last initialize took.
+
+        Phases are listed in order (playwright, browser, navigation, session
+        or login, bundle, watchers), followed by their total.
         """
-        if self.initialized:
-            logger.error("Attempted to initialize an already initialized client.")
-            raise ClientAlreadyInitialized("You try to initialize a Client that's already initialized.")
+        return dict(self._startup_timings)
 
-        logger.info("Initializing client...")
+    def _record_phase(self, phase: str) -> None:
+        """Records the time since the previous startup phase ended as ``phase``."""
+        now = time.perf_counter()
+        self._startup_timings[phase] = now - self._phase_started
+        self._phase_started = now
 
-        options.setdefault("auth", NoAuth(client=self))
+    def _log_startup_timings(self) -> None:
+        self._startup_timings["total"] = sum(self._startup_timings.values())
+        phases = ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in self._startup_timings.items())
+        logger.info(f"Client ready in {self._startup_timings['total']:.2f}s ({phases})")
+
+    def _setup_options(self, options: ClientOptions) -> None:
+        """Validates ``options`` in place and fills in the defaults."""
+        options.setdefault("auth", self._default_auth(client=self))
         options["auth"].client = self
 
-        if not isinstance(options.get("auth"), BaseAuth):
+        if not isinstance(options.get("auth"), self._auth_type):
             logger.error("Invalid Auth object passed to Client.")
             raise InvalidAuth("Invalid Auth object passed to Client object.")
 
@@ -79,24 +139,121 @@ class Client(EventEmitter):
         options.setdefault("web_url", "https://web.whatsapp.com/")
         options.setdefault("qr_data_selector", "div[data-ref]")
         options.setdefault("loaded_selector", "span[aria-label=WhatsApp]")
+        options.setdefault("watch_collections", True)
+        options.setdefault("event_batch_size", 1)
+        options.setdefault("event_batch_interval", 20)
+        options.setdefault("send_rate", 1.0)
+        options.setdefault("send_burst", 5)
+        options.setdefault("media_concurrency", 2)
+        options.setdefault("upload_concurrency", 2)
+        options.setdefault("media_timeout", 300.0)
+
+        if options.get("cache") is not None and not isinstance(options["cache"], BaseEntityCache):
+            logger.error("Invalid cache object passed to Client.")
+            raise ClientInitError("The cache option must be a BaseEntityCache instance.")
+        self._cache = options.get("cache")
+
+        if options.get("media_cache") is not None and not isinstance(options["media_cache"], MediaCache):
+            logger.error("Invalid media cache object passed to Client.")
+            raise ClientInitError("The media_cache option must be a MediaCache instance.")
+
+        if options.get("dispatcher") is not None:
+            if not isinstance(options["dispatcher"], Dispatcher):
+                logger.error("Invalid dispatcher object passed to Client.")
+                raise ClientInitError("The dispatcher option must be a Dispatcher instance.")
+            self.set_dispatcher(options["dispatcher"])
+
+    def _make_outbox(self, options: ClientOptions) -> Outbox:
+        return Outbox(
+            self,
+            rate=options.get("send_rate"),
+            burst=options.get("send_burst"),
+            cache=options.get("media_cache"),
+            ack_timeout=options.get("send_timeout"),
+            upload_limit=options.get("upload_concurrency"),
+        )
+
+    def _make_downloader(self, options: ClientOptions) -> MediaDownloader:
+        return MediaDownloader(
+            limit=options.get("media_concurrency"),
+            cache=options.get("media_cache"),
+            timeout=options.get("media_timeout"),
+        )
+
+    @staticmethod
+    def _set_status_result(status: str, result) -> bool:
+        logger.debug(f"Set status result: {result}")
+        if not isinstance(result, dict) or "status" not in result:
+            logger.warning("Unexpected result when setting status.")
+            return False
+        success = result["status"] == 200
+        if success:
+            logger.info(f"Status updated successfully: {status}")
+        else:
+            logger.warning(f"Status update failed with code: {result['status']}")
+        return success
+
+
+class Client(BaseClient):
+    """Main client class for interacting with WhatsApp Web via Playwright."""
+
+    _auth_type = BaseAuth
+    _default_auth = NoAuth
+
+    def initialize(self, options: ClientOptions):
+        """
+        Initializes the client, starts Playwright, opens a browser page,
+        and triggers the authentication method.
+        """
+        if self.initialized:
+            logger.error("Attempted to initialize an already initialized client.")
+            raise ClientAlreadyInitialized("You try to initialize a Client that's already initialized.")
+
+        logger.info("Initializing client...")
+        self._setup_options(options)
+        self._startup_timings = {}
+        self._phase_started = time.perf_counter()
 
         self._initialized = True
-        try:
-            logger.debug("Starting Playwright...")
-            self._playwright = sync_playwright().start()
-            logger.info("Playwright started successfully.")
-        except Exception as e:
-            self._initialized = False
-            logger.exception("Failed to start Playwright.")
-            raise ClientInitError("Failed to start Playwright: " + str(e))
+        self._owns_playwright = options.get("playwright") is None
+        self._owns_browser = options.get("browser") is None
+        if not self._owns_playwright:
+            logger.debug("Using the shared Playwright driver.")
+            self._playwright = options["playwright"]
+        else:
+            try:
+                logger.debug("Starting Playwright...")
+                self._playwright = sync_playwright().start()
+                logger.info("Playwright started successfully.")
+            except Exception as e:
+                self._initialized = False
+                logger.exception("Failed to start Playwright.")
+                raise ClientInitError("Failed to start Playwright: " + str(e))
+        self._record_phase("playwright")
 
         try:
             logger.debug("Authenticating client...")
             self._page = options.get("auth").authenticate(
                 client_options=options, playwright=self._playwright
             )
-            self._page.wait_for_load_state("networkidle")
             logger.info("Client authenticated and page loaded.")
+
+            self._missing_modules = install_bundle(self._page)
+            self._record_phase("bundle")
+
+            if self._cache is not None and options.get("watch_collections"):
+                CollectionWatcher(self._cache).attach(self._page)
+            MessageWatcher(
+                self,
+                batch_size=options.get("event_batch_size"),
+                batch_interval=options.get("event_batch_interval"),
+            ).attach(self._page)
+            self._outbox = self._make_outbox(options)
+            self._outbox.attach(self._page)
+            self._downloader = self._make_downloader(options)
+            self._downloader.attach(self._page)
+            self._record_phase("watchers")
+            self._log_startup_timings()
             self.emit("ready")
         except Exception as e:
             logger.exception("Authentication failed.")
@@ -105,28 +262,123 @@ class Client(EventEmitter):
 
     def set_status(self, status: str) -> bool:
         logger.debug(f"Setting status to: {status}")
-        script = get_module_script("WAWebContactStatusBridge", "setMyStatus", (f"'{status}'",))
-
         try:
-            result = self._page.evaluate(script)
-            logger.debug(f"Set status result: {result}")
-            if not isinstance(result, dict) or "status" not in result:
-                logger.warning("Unexpected result when setting status.")
-                return False
-            success = result["status"] == 200
-            if success:
-                logger.info(f"Status updated successfully: {status}")
-            else:
-                logger.warning(f"Status update failed with code: {result['status']}")
-            return success
+            result = call_bundle(self._page, "setStatus", status)
+            return self._set_status_result(status, result)
         except Exception as e:
             logger.exception("Failed to set status.")
             raise SettingStatusError("Failed to set status: " + str(e))
 
+    def send_message(self, chat_id: str, body: str) -> SendHandle:
+        """
+        Queues a text message to ``chat_id`` without waiting for it to be sent.
+
+        Returns:
+            SendHandle: Resolves with the message id once the server acknowledged the message.
+        """
+        return self.send_messages([(chat_id, body)])[0]
+
+    def send_messages(self, messages: List[Tuple[str, str]]) -> List[SendHandle]:
+        """
+        Queues many ``(chat_id, body)`` text messages with a single page round-trip.
+
+        Messages to one chat are sent in order; different chats are served in
+        parallel, paced by the ``send_rate`` and ``send_burst`` options.
+
+        Returns:
+            List[SendHandle]: One handle per message, in order.
+        """
+        logger.debug(f"Queueing {len(messages)} messages")
+        try:
+            return self._outbox.send(messages)
+        except Exception as e:
+            logger.exception(f"Error queueing {len(messages)} messages.")
+            raise MessageSendError(f"Failed to queue {len(messages)} messages: {str(e)}")
+
+    def send_media(self, chat_id: str, media: MediaSource, caption: str = "", filename: Optional[str] = None,
+                   mimetype: Optional[str] = None, as_document: bool = False) -> SendHandle:
+        """
+        Queues a media message to ``chat_id`` without waiting for it to be sent.
+
+        ``media`` is a file path, or bytes-like data such as a memoryview or an
+        mmap, which is spooled to a temporary file. The page reads the file
+        itself, so the payload is neither loaded into Python nor encoded. The
+        mimetype is detected from the first bytes when it isn't given.
+
+        Returns:
+            SendHandle: Resolves with the message id once the server acknowledged the message.
+        """
+        logger.debug(f"Queueing media to {chat_id}")
+        try:
+            return self._outbox.send_media(chat_id, media, caption=caption, filename=filename,
+                                           mimetype=mimetype, as_document=as_document)
+        except Exception as e:
+            logger.exception(f"Error queueing media to {chat_id}.")
+            raise MessageSendError(f"Failed to queue media to {chat_id}: {str(e)}")
+
+    def download_media(self, message: Union[Message, str], sink: MediaSink) -> MediaDownload:
+        """
+        Starts downloading the media of ``message`` into ``sink``, a file path
+        or a binary file-like object, without waiting for it.
+
+        Returns:
+            MediaDownload: Resolves with the number of bytes written.
+        """
+        return self.download_media_batch([(message, sink)])[0]
+
+    def download_media_batch(self, jobs: List[Tuple[Union[Message, str], MediaSink]]) -> List[MediaDownload]:
+        """
+        Starts downloading the media of many ``(message, sink)`` pairs with a single page round-trip.
+
+        At most ``media_concurrency`` downloads run at once; the rest are queued.
+
+        Returns:
+            List[MediaDownload]: One handle per job, in order.
+        """
+        logger.debug(f"Starting {len(jobs)} media downloads")
+        try:
+            return self._downloader.download([(getattr(message, "id", message), sink) for message, sink in jobs])
+        except Exception as e:
+            logger.exception(f"Error starting {len(jobs)} media downloads.")
+            raise MediaDownloadError(f"Failed to start {len(jobs)} media downloads: {str(e)}")
+
+    def iter_history(self, chat_id: str, chunk_size: int = 100, before: Optional[str] = None) -> Iterator[HistoryChunk]:
+        """
+        Pages backwards through the history of ``chat_id``, ``chunk_size`` messages at a time.
+
+        Each chunk carries a ``cursor``; passing it as ``before`` later
+        resumes right after that chunk.
+        """
+        logger.debug(f"Reading history of {chat_id} before {before}")
+        try:
+            for chunk in iter_history(self._page, chat_id, chunk_size=chunk_size, before=before):
+                before = chunk["cursor"]
+                yield chunk
+        except Exception as e:
+            logger.exception(f"Error reading history of {chat_id}.")
+            raise GettingChatError(f"Failed to read history of {chat_id} before {before}: {str(e)}")
+
+    def export_history(self, chat_id: str, path: str, chunk_size: int = 100, before: Optional[str] = None) -> int:
+        """
+        Writes the history of ``chat_id`` to ``path`` as JSON lines, newest message first.
+
+        Paths ending in ``.gz``, ``.bz2`` or ``.xz`` are compressed. When
+        ``before`` is given, the export resumes from that cursor and is
+        appended to ``path``; a failed export names the cursor to resume from.
+
+        Returns:
+            int: Number of messages written.
+        """
+        with JsonlSink(path, append=before is not None) as sink:
+            for chunk in self.iter_history(chat_id, chunk_size=chunk_size, before=before):
+                sink.write(chunk["messages"])
+        logger.info(f"Exported {sink.written} messages of {chat_id} to {path}")
+        return sink.written
+
     def get_contact(self, jid: str) -> Union[Contact, None]:
         logger.debug(f"Fetching contact: {jid}")
         try:
-            contact = Contact.get(self._page, jid)
+            contact = Contact.get(self._page, jid, cache=self._cache)
             logger.info(f"Contact fetched: {jid}")
             return contact
         except Exception as e:
@@ -136,29 +388,89 @@ class Client(EventEmitter):
     def get_group(self, jid: str) -> Union[Group, None]:
         logger.debug(f"Fetching group: {jid}")
         try:
-            group = Group.get(self._page, jid)
+            group = Group.get(self._page, jid, cache=self._cache)
             logger.info(f"Group fetched: {jid}")
             return group
         except Exception as e:
             logger.exception(f"Error fetching group {jid}.")
             raise GettingChatError(f"Failed to get Group {jid}: {str(e)}")
 
+    def get_contacts(self, jids: List[str]) -> Tuple[Dict[str, Contact], Dict[str, Exception]]:
+        """
+        Fetches many contacts with a single page round-trip.
+
+        Returns:
+            A ``(contacts, errors)`` tuple keyed by JID. Misses don't raise;
+            they are reported in ``errors`` instead.
+        """
+        logger.debug(f"Fetching {len(jids)} contacts")
+        try:
+            contacts, errors = Contact.get_many(self._page, jids, cache=self._cache)
+            logger.info(f"Contacts fetched: {len(contacts)}, failed: {len(errors)}")
+            return contacts, errors
+        except Exception as e:
+            logger.exception(f"Error fetching {len(jids)} contacts.")
+            raise GettingChatError(f"Failed to get {len(jids)} Contacts: {str(e)}")
+
+    def get_groups(self, jids: List[str]) -> Tuple[Dict[str, Group], Dict[str, Exception]]:
+        """
+        Fetches many groups with a single page round-trip.
+
+        Returns:
+            A ``(groups, errors)`` tuple keyed by JID. Misses don't raise;
+            they are reported in ``errors`` instead.
+        """
+        logger.debug(f"Fetching {len(jids)} groups")
+        try:
+            groups, errors = Group.get_many(self._page, jids, cache=self._cache)
+            logger.info(f"Groups fetched: {len(groups)}, failed: {len(errors)}")
+            return groups, errors
+        except Exception as e:
+            logger.exception(f"Error fetching {len(jids)} groups.")
+            raise GettingChatError(f"Failed to get {len(jids)} Groups: {str(e)}")
+
+    def run_forever(self) -> None:
+        """
+        Blocks and dispatches pushed events, such as ``message``, until the client is stopped.
+
+        The sync Playwright API only delivers page callbacks while a Playwright
+        call is in progress, so a client that only reacts to events should call this.
+        """
+        logger.info("Dispatching events until the client is stopped.")
+        while self.initialized and self._page and not self._page.is_closed():
+            try:
+                self._page.wait_for_timeout(1000)
+            except Exception:
+                if not self.initialized:
+                    break
+                raise
+
     def stop(self):
         """
         Stops the client by closing the Playwright page, browser, and stopping Playwright.
         """
         logger.info("Stopping client...")
+        if self._outbox is not None:
+            self._outbox.close()
+        if self._downloader is not None:
+            self._downloader.close()
         try:
             if self._page:
                 logger.debug("Closing page...")
+                context = self._page.context
                 self._page.close()
+                if not self._owns_playwright:
+                    # Stopping a shared driver is up to its owner, so release what this client opened.
+                    context.close()
+                    if self._owns_browser and context.browser:
+                        context.browser.close()
                 logger.debug("Page closed.")
         except Exception as e:
             logger.exception("Error closing page.")
             raise ClientStopError(f"Error closing page: {str(e)}")
 
         try:
-            if self._playwright:
+            if self._playwright and self._owns_playwright:
                 logger.debug("Stopping Playwright...")
                 self._playwright.stop()
                 logger.debug("Playwright stopped.")
@@ -170,4 +482,4 @@ class Client(EventEmitter):
             logger.info("Client stopped and de-initialized.")
 
 
-__all__ = ["Client"]
\ No newline at end of file
+__all__ = ["BaseClient", "Client"]
@@ -56,4 +56,16 @@ class SessionExpired(InvalidAuth):
 
 class SessionLoadError(InvalidAuth):
     """Raised when session could not be loaded after retries."""
-    pass
\ No newline at end of file
+    pass
+
+class SessionPoolError(Exception):
+    """Raised when a SessionPool operation fails or targets an unusable session."""
+    pass
+
+class MessageSendError(Exception):
+    """Raised when an outgoing message can't be queued or the page reports it as failed."""
+    pass
+
+class MediaDownloadError(Exception):
+    """Raised when the media of a message can't be downloaded or saved."""
+    pass
@@ -1,5 +1,5 @@
 from ..structures.chat import Chat, ChatIDType
-from ..util import get_module_script
+from ..bundle import call_bundle
 from playwright.sync_api import Page
 
 class Wid:
@@ -8,10 +8,4 @@ class Wid:
     
     @staticmethod
     def fromChat(page: Page, chat: Chat) -> ChatIDType:
-        script = page.evaluate(Wid.fromChatScript(chat))
-        
-        return script
-    
-    @staticmethod
-    def fromChatScript(chat: Chat) -> str:
-        return get_module_script(module="WAWebWidFactory", function="createWid", args=(chat._js_variable_repr("id"),))
\ No newline at end of file
+        return call_bundle(page, "createWid", chat.jid)
@@ -0,0 +1,505 @@
+from .sessionpool import SessionPool, SessionHealth
+from .structures.eventemitter import EventEmitter
+from .structures.clientoptions import ClientOptions
+from .structures.media import MediaSource
+from .structures.qr import QrCode
+from .exceptions import ClientInitError, SessionPoolError
+from .logger import logger
+from concurrent.futures import Future
+from functools import partial
+from multiprocessing.connection import Client as connect, Connection, Listener
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import itertools
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import zlib
+
+# Client events forwarded from the workers; listeners receive the session id first.
+FORWARDED_EVENTS: Tuple[str, ...] = ("qr", "ready", "message")
+
+
+def _to_wire(value: Any) -> Any:
+    """Converts entities into plain data that can cross the process boundary."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _to_wire(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_wire(item) for item in value)
+    return value
+
+
+def _event_arg(value: Any) -> Any:
+    # QR codes pickle as their raw data and are only encoded if the parent renders them.
+    if isinstance(value, QrCode):
+        return value
+    return _to_wire(value)
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return SessionPoolError(f"{type(error).__name__}: {error}")
+
+
+def _map_future(future: Future, fn: Callable[[Any], Any]) -> Future:
+    mapped: Future = Future()
+
+    def _done(future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            mapped.set_exception(error)
+        else:
+            mapped.set_result(fn(future.result()))
+
+    future.add_done_callback(_done)
+    return mapped
+
+
+def _chain_future(future: Future, fn: Callable[[Any], Future]) -> Future:
+    """Like :func:`_map_future`, for an ``fn`` returning a future whose outcome is passed on."""
+    chained: Future = Future()
+
+    def _settle(source: Future) -> None:
+        error = source.exception()
+        if error is not None:
+            chained.set_exception(error)
+        else:
+            chained.set_result(source.result())
+
+    def _done(future: Future) -> None:
+        if future.exception() is not None:
+            _settle(future)
+            return
+        try:
+            inner = fn(future.result())
+        except Exception as e:
+            chained.set_exception(e)
+            return
+        inner.add_done_callback(_settle)
+
+    future.add_done_callback(_done)
+    return chained
+
+
+def _outcomes(futures: List[Future]) -> Future:
+    """Resolves with ``(ok, result or error)`` of every future once all of them are done."""
+    gathered: Future = Future()
+    lock = Lock()
+    remaining = len(futures)
+
+    def _done(_: Future) -> None:
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            if remaining:
+                return
+        gathered.set_result([
+            (False, _picklable(future.exception())) if future.exception() is not None else (True, future.result())
+            for future in futures
+        ])
+
+    if not futures:
+        gathered.set_result([])
+    for future in futures:
+        future.add_done_callback(_done)
+    return gathered
+
+
+def _call_method(client, method: str, args: tuple, kwargs: dict) -> Any:
+    # Runs on the pool thread, where entities may still touch their page while converting.
+    return _to_wire(getattr(client, method)(*args, **kwargs))
+
+
+def _call_send(client, method: str, args: tuple, kwargs: dict) -> Any:
+    # SendHandles stay in the worker; only the message ids they resolve with are sent back.
+    return getattr(client, method)(*args, **kwargs)
+
+
+class _Worker:
+    """Serves one parent connection on top of a SessionPool, inside a worker process."""
+
+    def __init__(self, conn: Connection, pool_kwargs: Dict[str, Any]):
+        self._conn = conn
+        self._send_lock = Lock()
+        self._pool = SessionPool(**pool_kwargs)
+
+    def send(self, message: tuple) -> None:
+        with self._send_lock:
+            self._conn.send(message)
+
+    def serve(self) -> None:
+        try:
+            self._pool.start()
+        except Exception as e:
+            self.send(("started", _picklable(e)))
+            return
+        self.send(("started", None))
+
+        try:
+            while True:
+                try:
+                    op, request_id, *args = self._conn.recv()
+                except EOFError:
+                    break
+                if op == "close":
+                    break
+                try:
+                    future = getattr(self, f"_op_{op}")(*args)
+                except Exception as e:
+                    self._reply(request_id, e)
+                    continue
+                future.add_done_callback(partial(self._reply_future, request_id))
+        finally:
+            self._pool.close()
+            self._conn.close()
+
+    def _reply_future(self, request_id: int, future: Future) -> None:
+        error = future.exception()
+        self._reply(request_id, error, None if error is not None else future.result())
+
+    def _reply(self, request_id: int, error: Optional[BaseException], value: Any = None) -> None:
+        try:
+            if error is not None:
+                self.send(("result", request_id, False, _picklable(error)))
+            else:
+                self.send(("result", request_id, True, value))
+        except Exception as e:
+            logger.exception(f"Failed to send the result of request {request_id}.")
+            self.send(("result", request_id, False, SessionPoolError(f"Unsendable result: {e}")))
+
+    def _op_add(self, session_id: str, options: ClientOptions) -> Future:
+        future = self._pool.add_session(session_id, options, setup=partial(self._forward_events, session_id))
+        return _map_future(future, lambda client: None)
+
+    def _op_remove(self, session_id: str) -> Future:
+        return self._pool.remove_session(session_id)
+
+    def _op_call(self, session_id: str, method: str, args: tuple, kwargs: dict) -> Future:
+        if method.startswith("_"):
+            raise SessionPoolError(f"Method {method} can't be called remotely.")
+        return self._pool.submit(session_id, _call_method, method, args, kwargs)
+
+    def _op_send(self, session_id: str, method: str, args: tuple, kwargs: dict) -> Future:
+        if method not in ("send_message", "send_media"):
+            raise SessionPoolError(f"{method} doesn't send a message.")
+        return _chain_future(self._pool.submit(session_id, _call_send, method, args, kwargs), lambda handle: handle)
+
+    def _op_send_batch(self, session_id: str, messages: List[Tuple[str, str]]) -> Future:
+        return _chain_future(self._pool.submit(session_id, _call_send, "send_messages", (messages,), {}), _outcomes)
+
+    def _op_health(self) -> Future:
+        future: Future = Future()
+        future.set_result(self._pool.health())
+        return future
+
+    def _forward_events(self, session_id: str, client) -> None:
+        for event_name in FORWARDED_EVENTS:
+            if event_name == "message":
+                # One message per send would dominate the IPC cost, so messages travel in their batches.
+                client.on_batch("message", partial(self._forward_batch, session_id))
+            else:
+                client.on(event_name, partial(self._forward, session_id, event_name))
+
+    def _forward(self, session_id: str, event_name: str, *args: Any) -> None:
+        self.send(("event", session_id, event_name, [[_event_arg(arg) for arg in args]]))
+
+    def _forward_batch(self, session_id: str, messages: List[Any]) -> None:
+        self.send(("event", session_id, "message", [[message.to_dict()] for message in messages]))
+
+
+def _worker_main(address: str, authkey: bytes, pool_kwargs: Dict[str, Any]) -> None:
+    with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+        conn = listener.accept()
+    _Worker(conn, pool_kwargs).serve()
+
+
+class _WorkerHandle:
+    """Parent-side state of one worker process."""
+
+    def __init__(self, index: int, process: multiprocessing.Process, address: str):
+        self.index = index
+        self.process = process
+        self.address = address
+        self.conn: Connection = None
+        self.send_lock = Lock()
+        self.pending: Dict[int, Future] = {}
+        self.reader: Thread = None
+
+
+class Fleet(EventEmitter):
+    """
+    Shards sessions across worker processes, each running its own SessionPool.
+
+    A session always lives on the worker picked by a stable hash of its id,
+    so one host can spread its accounts over all of its cores. The parent
+    talks to every worker over a Unix socket: calls are routed to the owning
+    worker and return futures, and the workers' ``qr``, ``ready`` and
+    ``message`` events are emitted by the Fleet with the session id as first
+    argument. Results and event payloads cross the process boundary as plain
+    data (see the ``to_dict`` methods), and QR codes as QrCode objects.
+
+    Sessions authenticate with LocalAuth under the pool's ``dir_path``, or
+    with StoreAuth when a ``store`` pool argument is given; a shared store
+    lets a session move to another host.
+    Options and pool arguments are pickled, so they can't hold objects such
+    as an auth, a cache or a dispatcher.
+
+    Example:
+        with Fleet(workers=4, dir_path="sessions") as fleet:
+            fleet.on("message", lambda session_id, message: print(session_id, message["body"]))
+            fleet.add_session("alice").result()
+            contact = fleet.get_contact("alice", "123@c.us").result()
+            message_id = fleet.send_message("alice", "123@c.us", "Hi").result()
+    """
+
+    def __init__(self, workers: int = None, **pool_kwargs: Any):
+        """
+        Args:
+            workers: Number of worker processes (defaults to the number of CPUs).
+            **pool_kwargs: SessionPool arguments of every worker.
+        """
+        super().__init__()
+        self._size = workers or os.cpu_count() or 1
+        self._pool_kwargs = pool_kwargs
+        self._workers: List[_WorkerHandle] = []
+        self._request_ids = itertools.count()
+        self._tmpdir: Optional[str] = None
+
+    # --- Lifecycle ---
+    def start(self, timeout: float = 60) -> None:
+        """Spawns the workers and waits until each has started its browser."""
+        if self._workers:
+            raise SessionPoolError("The fleet is already started.")
+
+        logger.info(f"Starting fleet of {self._size} workers...")
+        ctx = multiprocessing.get_context("spawn")
+        authkey = os.urandom(32)
+        self._tmpdir = tempfile.mkdtemp(prefix="wawebpy-fleet-")
+        for index in range(self._size):
+            address = os.path.join(self._tmpdir, f"worker-{index}.sock")
+            process = ctx.Process(
+                target=_worker_main,
+                args=(address, authkey, self._pool_kwargs),
+                name=f"wawebpy-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._workers.append(_WorkerHandle(index, process, address))
+
+        try:
+            for worker in self._workers:
+                self._connect(worker, authkey, timeout)
+        except Exception:
+            self.close()
+            raise
+        logger.info("Fleet started.")
+
+    def close(self, timeout: float = 10) -> None:
+        """Stops every worker and its sessions."""
+        logger.info("Closing fleet...")
+        for worker in self._workers:
+            if worker.conn is not None:
+                try:
+                    with worker.send_lock:
+                        worker.conn.send(("close", -1))
+                except (OSError, EOFError):
+                    pass
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                logger.warning(f"Worker {worker.index} didn't stop in time; terminating it.")
+                worker.process.terminate()
+            if worker.conn is not None:
+                worker.conn.close()
+        self._workers = []
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+        logger.info("Fleet closed.")
+
+    def __enter__(self) -> "Fleet":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Sessions ---
+    def shard_of(self, session_id: str) -> int:
+        """Returns the index of the worker owning ``session_id``."""
+        return zlib.crc32(session_id.encode()) % self._size
+
+    def add_session(self, session_id: str, options: ClientOptions = None) -> "Future[None]":
+        """Starts ``session_id`` on its worker. See :meth:`SessionPool.add_session`."""
+        options = dict(options or {})
+        if "auth" in options:
+            raise SessionPoolError("Fleet sessions authenticate through the pool; the auth option can't be passed.")
+        return self._request(self._owner(session_id), "add", session_id, options)
+
+    def remove_session(self, session_id: str) -> "Future[None]":
+        return self._request(self._owner(session_id), "remove", session_id)
+
+    def call(self, session_id: str, method: str, *args: Any, **kwargs: Any) -> Future:
+        """
+        Calls ``Client.<method>(*args, **kwargs)`` of the session on its worker.
+
+        Messages are sent with :meth:`send_message`, :meth:`send_messages` and
+        :meth:`send_media` instead, as their SendHandles can't leave the worker.
+
+        Returns:
+            A future resolving to the result as plain data.
+        """
+        return self._request(self._owner(session_id), "call", session_id, method, args, kwargs)
+
+    def send_message(self, session_id: str, chat_id: str, body: str) -> Future:
+        """
+        Sends a text message from the session. See :meth:`Client.send_message`.
+
+        Returns:
+            A future resolving with the message id once the server acked the
+            message, or failing with MessageSendError.
+        """
+        return self._request(self._owner(session_id), "send", session_id, "send_message", (chat_id, body), {})
+
+    def send_messages(self, session_id: str, messages: List[Tuple[str, str]]) -> List[Future]:
+        """
+        Sends many ``(chat_id, body)`` text messages from the session with one
+        request. See :meth:`Client.send_messages`.
+
+        Returns:
+            A future per message, like :meth:`send_message`. They are settled
+            together, once the worker has the outcome of every message.
+        """
+        messages = [tuple(message) for message in messages]
+        batch = self._request(self._owner(session_id), "send_batch", session_id, messages)
+        futures: List[Future] = [Future() for _ in messages]
+
+        def _done(batch: Future) -> None:
+            error = batch.exception()
+            outcomes = [(False, error)] * len(futures) if error is not None else batch.result()
+            for future, (ok, value) in zip(futures, outcomes):
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+        batch.add_done_callback(_done)
+        return futures
+
+    def send_media(self, session_id: str, chat_id: str, media: MediaSource, caption: str = "",
+                   filename: Optional[str] = None, mimetype: Optional[str] = None, as_document: bool = False) -> Future:
+        """
+        Sends a media message from the session. See :meth:`Client.send_media`.
+
+        ``media`` is a path on the worker's host, or bytes-like data, which is
+        copied to the worker.
+
+        Returns:
+            A future resolving with the message id once the server acked the
+            message, or failing with MessageSendError.
+        """
+        if not isinstance(media, (str, os.PathLike)):
+            media = bytes(media)
+        kwargs = {"caption": caption, "filename": filename, "mimetype": mimetype, "as_document": as_document}
+        return self._request(self._owner(session_id), "send", session_id, "send_media", (chat_id, media), kwargs)
+
+    def get_contact(self, session_id: str, jid: str) -> Future:
+        return self.call(session_id, "get_contact", jid)
+
+    def get_group(self, session_id: str, jid: str) -> Future:
+        return self.call(session_id, "get_group", jid)
+
+    def set_status(self, session_id: str, status: str) -> Future:
+        return self.call(session_id, "set_status", status)
+
+    def health(self, timeout: float = 10) -> Dict[str, SessionHealth]:
+        """Returns the health of every session across all live workers."""
+        futures = [(worker, self._request(worker, "health")) for worker in self._workers]
+        health: Dict[str, SessionHealth] = {}
+        for worker, future in futures:
+            try:
+                health.update(future.result(timeout))
+            except Exception as e:
+                logger.warning(f"Worker {worker.index} didn't report its health: {e}")
+        return health
+
+    # --- Transport ---
+    def _owner(self, session_id: str) -> _WorkerHandle:
+        if not self._workers:
+            raise SessionPoolError("The fleet is not running.")
+        return self._workers[self.shard_of(session_id)]
+
+    def _connect(self, worker: _WorkerHandle, authkey: bytes, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                worker.conn = connect(worker.address, family="AF_UNIX", authkey=authkey)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if not worker.process.is_alive() or time.monotonic() > deadline:
+                    raise ClientInitError(f"Worker {worker.index} didn't come up.")
+                time.sleep(0.05)
+
+        if not worker.conn.poll(max(deadline - time.monotonic(), 0)):
+            raise ClientInitError(f"Worker {worker.index} didn't start in time.")
+        _, error = worker.conn.recv()
+        if error is not None:
+            raise ClientInitError(f"Worker {worker.index} failed to start: {error}") from error
+
+        worker.reader = Thread(target=self._read, args=(worker,), name=f"wawebpy-fleet-{worker.index}", daemon=True)
+        worker.reader.start()
+
+    def _request(self, worker: _WorkerHandle, op: str, *args: Any) -> Future:
+        future: Future = Future()
+        request_id = next(self._request_ids)
+        with worker.send_lock:
+            worker.pending[request_id] = future
+            try:
+                worker.conn.send((op, request_id, *args))
+            except (OSError, EOFError) as e:
+                worker.pending.pop(request_id, None)
+                raise SessionPoolError(f"Worker {worker.index} is unreachable.") from e
+        return future
+
+    def _read(self, worker: _WorkerHandle) -> None:
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if message[0] == "result":
+                _, request_id, ok, value = message
+                with worker.send_lock:
+                    future = worker.pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            elif message[0] == "event":
+                _, session_id, event_name, calls = message
+                for args in calls:
+                    try:
+                        self.emit(event_name, session_id, *args)
+                    except Exception:
+                        logger.exception(f"Listener of '{event_name}' failed for session {session_id}.")
+
+        with worker.send_lock:
+            pending = list(worker.pending.values())
+            worker.pending.clear()
+        for future in pending:
+            future.set_exception(SessionPoolError(f"Worker {worker.index} exited."))
+        logger.info(f"Connection to worker {worker.index} closed.")
+
+
+__all__ = ["Fleet", "FORWARDED_EVENTS"]
@@ -0,0 +1,457 @@
+from .client import Client
+from .structures.clientoptions import ClientOptions
+from .structures.auth.localauth import LocalAuth
+from .structures.auth.storeauth import StoreAuth
+from .structures.auth.store import SessionStore
+from .structures.launchprofile import launch_options
+from .exceptions import ClientInitError, SessionPoolError
+from .logger import logger
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread, current_thread
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Tuple, Type, TypedDict, Union
+from playwright.sync_api import sync_playwright, Browser, Playwright
+import time
+
+SessionState = Literal["starting", "ready", "failed", "crashed", "stopped"]
+
+
+class SessionHealth(TypedDict):
+    """
+    Health snapshot of a pooled session.
+
+    Attributes:
+        state: Lifecycle state of the session
+        queued: Number of calls waiting to run
+        calls: Number of calls that ran
+        failures: Number of calls that raised
+        last_error: Message of the last error, if any
+        last_activity: ``time.time()`` of the last finished call or state change
+    """
+    state: SessionState
+    queued: int
+    calls: int
+    failures: int
+    last_error: Optional[str]
+    last_activity: float
+
+
+_Job = Tuple[Callable[..., Any], tuple, dict, Future]
+
+
+class _Session:
+    """A pooled client and its pending calls."""
+
+    def __init__(self, session_id: str, client: Client, options: ClientOptions, setup: Optional[Callable[[Client], None]]):
+        self.session_id = session_id
+        self.client = client
+        self.options = options
+        self.setup = setup
+        self.auth: Optional[Union[LocalAuth, StoreAuth]] = None
+        self.jobs: Deque[_Job] = deque()
+        self.state: SessionState = "starting"
+        self.calls = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_activity = time.time()
+
+    def set_state(self, state: SessionState, error: Optional[BaseException] = None) -> None:
+        self.state = state
+        self.last_activity = time.time()
+        if error is not None:
+            self.last_error = str(error)
+
+
+class SessionPool:
+    """
+    Runs many WhatsApp accounts over one Playwright driver and one browser.
+
+    Every session gets an isolated browser context with its own storage
+    (see LocalAuth and StoreAuth), instead of a Playwright driver and a Chromium profile
+    of its own. The sync Playwright API is bound to the thread that started
+    it, so the pool owns a single thread that starts the driver and runs
+    every call. Calls are submitted from any thread and return futures;
+    sessions with pending calls are served round-robin, one call each per
+    round, so a busy account can't starve the others. While idle the
+    thread keeps the driver dispatching page events.
+
+    Event callbacks run on the pool thread and may call their client
+    directly. They must not wait on a future of this pool, which would
+    deadlock the thread that is supposed to resolve it. A session waiting
+    for a QR scan holds up the other sessions' calls until it's done, so
+    authenticate new accounts before adding them to a busy pool.
+
+    Example:
+        with SessionPool() as pool:
+            pool.add_session("alice").result()
+            contact = pool.submit("alice", Client.get_contact, "123@c.us").result()
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        dir_path: str = ".wawebpy_auth",
+        client_options: ClientOptions = None,
+        client_type: Type[Client] = Client,
+        pump_interval: int = 50,
+        store: Optional[SessionStore] = None,
+    ):
+        """
+        Args:
+            headless: Whether the shared browser runs headless.
+            dir_path: Directory holding the per-session snapshots.
+            client_options: Options applied to every session before its own options.
+                Their ``launch_profile`` also configures the shared browser.
+            client_type: Client class to instantiate per session.
+            pump_interval: Milliseconds to dispatch page events for while no call is pending.
+            store: Keep sessions in this store with StoreAuth instead of under ``dir_path``.
+                Idle time is used to checkpoint them; snapshots are compressed
+                and saved on a writer thread, off the pool thread.
+        """
+        self._headless = headless
+        self._dir_path = dir_path
+        self._client_options: ClientOptions = client_options or {}
+        self._client_type = client_type
+        self._pump_interval = pump_interval
+        self._store = store
+
+        self._sessions: Dict[str, _Session] = {}
+        self._control: Deque[_Job] = deque()
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._started = Event()
+        self._closing = False
+        self._start_error: Optional[BaseException] = None
+        self._thread: Optional[Thread] = None
+        self._playwright: Playwright = None
+        self._browser: Browser = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        """Starts the pool thread with the shared Playwright driver and browser."""
+        if self._thread is not None:
+            raise SessionPoolError("The session pool is already started.")
+
+        logger.info("Starting session pool...")
+        self._thread = Thread(target=self._run, name="wawebpy-sessionpool", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._start_error is not None:
+            raise ClientInitError(f"Failed to start the session pool: {self._start_error}") from self._start_error
+        logger.info("Session pool started.")
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stops every session, then the shared browser and driver."""
+        if self._thread is None:
+            return
+        logger.info("Closing session pool...")
+        self._closing = True
+        self._wakeup.set()
+        if current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "SessionPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Sessions ---
+    def add_session(
+        self,
+        session_id: str,
+        options: ClientOptions = None,
+        setup: Callable[[Client], None] = None,
+    ) -> "Future[Client]":
+        """
+        Creates and initializes a client for ``session_id``.
+
+        Args:
+            session_id: Unique id of the session; also its LocalAuth or StoreAuth session id.
+            options: Client options of this session. The shared driver and
+                browser are filled in, and ``auth`` defaults to a StoreAuth
+                on the pool's store, or else a LocalAuth under its ``dir_path``.
+            setup: Called with the client before it initializes, to register
+                listeners for events such as ``qr`` and ``ready``.
+
+        Returns:
+            A future resolving to the initialized client.
+        """
+        return self._call_soon(self._start_session, session_id, dict(options or {}), setup)
+
+    def remove_session(self, session_id: str) -> "Future[None]":
+        """Stops the session's client and fails its pending calls."""
+        return self._call_soon(self._stop_session, session_id)
+
+    def restart_session(self, session_id: str) -> "Future[Client]":
+        """Stops the session and starts it again with the same options, e.g. after a crash."""
+        return self._call_soon(self._restart_session, session_id)
+
+    @property
+    def sessions(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def get_client(self, session_id: str) -> Client:
+        """
+        Returns the client of ``session_id``.
+        Only use it from the pool thread, e.g. in event callbacks or submitted calls.
+        """
+        with self._lock:
+            return self._get_session(session_id).client
+
+    def health(self) -> Dict[str, SessionHealth]:
+        """Returns a health snapshot of every session."""
+        with self._lock:
+            return {
+                session_id: SessionHealth(
+                    state=session.state,
+                    queued=len(session.jobs),
+                    calls=session.calls,
+                    failures=session.failures,
+                    last_error=session.last_error,
+                    last_activity=session.last_activity,
+                )
+                for session_id, session in self._sessions.items()
+            }
+
+    # --- Calls ---
+    def submit(self, session_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedules ``fn(client, *args, **kwargs)`` on the pool thread.
+
+        Returns:
+            A future resolving to the return value of ``fn``.
+        """
+        future: Future = Future()
+        with self._lock:
+            session = self._get_session(session_id)
+            if session.state not in ("starting", "ready"):
+                raise SessionPoolError(f"Session {session_id} is {session.state}.")
+            session.jobs.append((fn, args, kwargs, future))
+        self._wakeup.set()
+        return future
+
+    # --- Pool thread ---
+    def _call_soon(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self._thread is None or self._closing:
+            raise SessionPoolError("The session pool is not running.")
+        future: Future = Future()
+        with self._lock:
+            self._control.append((fn, args, {}, future))
+        self._wakeup.set()
+        return future
+
+    def _get_session(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionPoolError(f"Unknown session {session_id}.")
+        return session
+
+    def _run(self) -> None:
+        try:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                **launch_options({**self._client_options, "headless": self._headless})
+            )
+        except Exception as e:
+            logger.exception("Failed to start the shared browser.")
+            self._start_error = e
+            self._started.set()
+            return
+        self._started.set()
+
+        try:
+            while not self._closing:
+                self._wakeup.clear()
+                ran = self._run_control()
+                ran = self._run_round() or ran
+                if not ran:
+                    self._checkpoint()
+                    self._idle()
+        finally:
+            self._shutdown()
+
+    def _run_control(self) -> bool:
+        ran = False
+        while True:
+            with self._lock:
+                if not self._control:
+                    return ran
+                job = self._control.popleft()
+            self._run_job(job)
+            ran = True
+
+    def _run_round(self) -> bool:
+        """Runs at most one pending call of every session."""
+        with self._lock:
+            sessions = [session for session in self._sessions.values() if session.jobs]
+
+        for session in sessions:
+            with self._lock:
+                if not session.jobs:
+                    continue
+                fn, args, kwargs, future = session.jobs.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(session.client, *args, **kwargs))
+            except BaseException as e:
+                session.failures += 1
+                session.last_error = str(e)
+                future.set_exception(e)
+            session.calls += 1
+            session.last_activity = time.time()
+        return bool(sessions)
+
+    def _run_job(self, job: _Job) -> None:
+        fn, args, kwargs, future = job
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _checkpoint(self) -> None:
+        # StoreAuth debounces checkpoints itself, so this only reads the
+        # storage of sessions whose interval has passed.
+        with self._lock:
+            sessions = [
+                session for session in self._sessions.values()
+                if session.state == "ready" and isinstance(session.auth, StoreAuth)
+            ]
+        if sessions and self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wawebpy-checkpoint")
+        for session in sessions:
+            try:
+                written = session.auth.checkpoint_in(self._writer)
+            except Exception as e:
+                logger.warning(f"Couldn't checkpoint session {session.session_id}: {e}")
+                continue
+            if written is not None:
+                written.add_done_callback(lambda f, session_id=session.session_id: self._on_checkpoint(session_id, f))
+
+    def _on_checkpoint(self, session_id: str, written: Future) -> None:
+        if written.exception() is not None:
+            logger.warning(f"Couldn't checkpoint session {session_id}: {written.exception()}")
+
+    def _idle(self) -> None:
+        # Any sync Playwright call dispatches the pending events of every page.
+        with self._lock:
+            pages = [
+                session.client._page for session in self._sessions.values()
+                if session.state == "ready" and session.client._page and not session.client._page.is_closed()
+            ]
+        if not pages:
+            self._wakeup.wait(self._pump_interval / 1000)
+            return
+        try:
+            pages[0].wait_for_timeout(self._pump_interval)
+        except Exception:
+            logger.debug("Event pump interrupted; retrying with the next page.")
+
+    def _start_session(self, session_id: str, options: ClientOptions, setup: Optional[Callable[[Client], None]]) -> Client:
+        with self._lock:
+            if session_id in self._sessions:
+                raise SessionPoolError(f"Session {session_id} already exists.")
+            client = self._client_type()
+            session = _Session(session_id, client, options, setup)
+            self._sessions[session_id] = session
+
+        session_options: ClientOptions = {**self._client_options, **options}
+        session_options["playwright"] = self._playwright
+        session_options["browser"] = self._browser
+        if self._store is not None:
+            session_options.setdefault("auth", StoreAuth(client, self._store, sessionId=session_id))
+        else:
+            session_options.setdefault("auth", LocalAuth(client, dirPath=self._dir_path, sessionId=session_id))
+        session.auth = session_options["auth"]
+
+        logger.info(f"Starting session {session_id}")
+        try:
+            if setup is not None:
+                setup(client)
+            client.initialize(session_options)
+        except Exception as e:
+            logger.error(f"Session {session_id} failed to start: {e}")
+            session.set_state("failed", e)
+            self._fail_jobs(session, e)
+            raise
+
+        page = client._page
+        page.on("crash", lambda _: self._on_page_lost(session, "crashed"))
+        page.on("close", lambda _: self._on_page_lost(session, "stopped"))
+        session.set_state("ready")
+        logger.info(f"Session {session_id} ready.")
+        return client
+
+    def _stop_session(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            raise SessionPoolError(f"Unknown session {session_id}.")
+
+        logger.info(f"Stopping session {session_id}")
+        try:
+            if session.state == "ready" and isinstance(session.auth, (LocalAuth, StoreAuth)):
+                session.auth.save_state()
+        except Exception as e:
+            logger.warning(f"Couldn't save the snapshot of session {session_id}: {e}")
+        try:
+            if session.client.initialized:
+                session.client.stop()
+        finally:
+            session.set_state("stopped")
+            self._fail_jobs(session, SessionPoolError(f"Session {session_id} was stopped."))
+
+    def _restart_session(self, session_id: str) -> Client:
+        with self._lock:
+            session = self._get_session(session_id)
+        self._stop_session(session_id)
+        return self._start_session(session_id, session.options, session.setup)
+
+    def _on_page_lost(self, session: _Session, state: SessionState) -> None:
+        if session.state != "ready":
+            return
+        logger.warning(f"Session {session.session_id} {state}.")
+        with self._lock:
+            session.set_state(state, SessionPoolError(f"Page {state}."))
+        self._fail_jobs(session, SessionPoolError(f"Session {session.session_id} {state}."))
+
+    def _fail_jobs(self, session: _Session, error: BaseException) -> None:
+        with self._lock:
+            jobs = list(session.jobs)
+            session.jobs.clear()
+        for _, _, _, future in jobs:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _shutdown(self) -> None:
+        for session_id in self.sessions:
+            try:
+                self._stop_session(session_id)
+            except Exception as e:
+                logger.warning(f"Error stopping session {session_id}: {e}")
+
+        with self._lock:
+            control = list(self._control)
+            self._control.clear()
+        for _, _, _, future in control:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(SessionPoolError("The session pool was closed."))
+
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+        try:
+            if self._browser:
+                self._browser.close()
+        finally:
+            if self._playwright:
+                self._playwright.stop()
+            logger.info("Session pool closed.")
+
+
+__all__ = ["SessionPool", "SessionHealth", "SessionState"]
@@ -1,11 +1,15 @@
 from ...logger import logger
 from abc import ABC, abstractmethod
-from playwright._impl._errors import TimeoutError as PWTimeoutError
-from wawebpy.exceptions import QrNotFound
+from playwright._impl._errors import Error as PWError
+from wawebpy.exceptions import QrNotFound, SessionExpired, SessionLoadError
 from playwright.sync_api import Page
-from ...util import get_qr_in_page
+from ..loginwatcher import LoginWatcher
+from ..launchprofile import apply_routes
 
 class BaseAuth(ABC):
+    # Milliseconds to wait for the page to show a QR code or a ready session before reloading.
+    READY_TIMEOUT = 30000
+
     def __init__(self, client):
         """
         Base class for authentication methods.
@@ -25,69 +29,100 @@ class BaseAuth(ABC):
         """
         Handles QR-based authentication for WhatsApp Web.
 
-        Continuously checks for the QR code, emits it when it changes,
-        and waits for the main WhatsApp interface to load. Retries
-        a limited number of times if the QR is not found.
+        A LoginWatcher emits every new QR code the moment the page shows it
+        and wakes this up once the session is ready. The page is reloaded
+        when no new QR code shows up in time, up to ``max_retries`` times in a row;
+        navigations that interrupt the wait count as attempts too.
 
         Args:
             client_options: Dictionary of client options including selectors.
         """
-        qr = None  # Store the last QR code to detect changes
         page = browser_or_ctx.new_page()
+        apply_routes(page, client_options)
+        watcher = LoginWatcher(self.client, client_options)
+        watcher.attach(page)
         logger.info("Opening WhatsApp Web at %s", client_options.get("web_url"))
         page.goto(client_options.get("web_url"))
+        self.client._record_phase("navigation")
 
         retry = 0
-        while retry <= max_retries:
+        while True:
+            qr_count = watcher.qr_count
             try:
-                # Try to get the current QR code from the page
-                current_qr = get_qr_in_page(
-                    page=page,
-                    qr_data_selector=client_options.get("qr_data_selector"),
-                    timeout=5000,
-                )
-                logger.debug("QR code successfully retrieved.")
-                retry = 0  # Reset retry counter on success
-            except QrNotFound as exc:
+                login_state = watcher.wait(self.READY_TIMEOUT)
+            except PWError as exc:
+                if page.is_closed():
+                    raise
+                # A page that keeps navigating would otherwise be waited on forever.
                 retry += 1
-                logger.warning(
-                    "QR code not found (attempt %d/%d) at %s",
-                    retry, max_retries, page.url,
+                if retry >= max_retries:
+                    logger.error("Page kept navigating while waiting for login on %s", page.url)
+                    raise QrNotFound(f"Page kept navigating while waiting for login on {page.url}") from exc
+                logger.debug(f"Page navigated while waiting for login ({exc}), waiting again.")
+                continue
+
+            if login_state["state"] == "ready":
+                logger.info("WhatsApp interface loaded successfully.")
+                break
+
+            retry = 1 if watcher.qr_count != qr_count else retry + 1
+            logger.warning(
+                "No new QR code or ready session (attempt %d/%d) at %s",
+                retry, max_retries, page.url,
+            )
+            if retry >= max_retries:
+                logger.error(
+                    "Failed to find QR code after %d retries on %s",
+                    max_retries, page.url,
                 )
+                raise QrNotFound(f"QR code not found after {max_retries} retries on {page.url}")
+            logger.info("Reloading page to try QR fetch again.")
+            page.reload()
 
-                if retry >= max_retries:
-                    logger.error(
-                        "Failed to find QR code after %d retries on %s",
-                        max_retries, page.url,
-                    )
-                    raise QrNotFound(
-                        f"QR code not found after {max_retries} retries on {page.url}"
-                    ) from exc
-                elif retry % 3 == 0:
-                    logger.info("Reloading page to try QR fetch again.")
-                    page.reload()
-
-                current_qr = None
-
-            # Emit QR only if it exists and has changed
-            if (
-                current_qr is not None
-                and (qr is None or qr.data_list[0].data != current_qr.data_list[0].data)
-            ):
-                logger.info("Emitting new QR code.")
-                self.client.emit("qr", current_qr)
-                qr = current_qr
-
-            # Check if the main WhatsApp interface has loaded
+        self.client._record_phase("login")
+        return page
+
+    def _load_session(self, client_options, browser_or_ctx, max_retries: int = 3) -> Page:
+        """
+        Opens WhatsApp Web in a context restored from a saved session and waits until it's ready.
+        A QR code means the saved session is no longer valid, so it is logged out.
+
+        Raises:
+            SessionExpired: If WhatsApp Web asks for a QR login
+            SessionLoadError: If the page isn't ready after ``max_retries`` reloads or interrupted waits
+        """
+        page = browser_or_ctx.new_page()
+        apply_routes(page, client_options)
+        watcher = LoginWatcher(self.client, client_options)
+        watcher.attach(page)
+        page.goto(client_options.get("web_url"))
+        self.client._record_phase("navigation")
+
+        retry = 0
+        while retry <= max_retries:
             try:
-                if current_qr is None:
-                    page.wait_for_selector(
-                        client_options.get("loaded_selector"),
-                        timeout=1000,
-                    )
-                    logger.info("WhatsApp interface loaded successfully.")
-                    break
-            except PWTimeoutError:
-                logger.debug("WhatsApp interface not loaded yet, retrying...")
+                login_state = watcher.wait(self.READY_TIMEOUT, stop_on_qr=True)
+            except PWError as exc:
+                if page.is_closed():
+                    raise
+                logger.debug(f"Page navigated while loading the session ({exc}), retry {retry}.")
+                retry += 1
+                continue
 
-        return page
+            if login_state["state"] == "timeout":
+                logger.debug(f"Page not ready yet, retry {retry}. Reloading.")
+                retry += 1
+                page.reload()
+                continue
+
+            if login_state["state"] == "qr":
+                self.logout()
+                logger.warning("Saved session expired.")
+                raise SessionExpired(f"Saved session of {type(self).__name__} expired.")
+
+            logger.info("Saved session loaded successfully.")
+            self.client._record_phase("session")
+            return page
+
+        logger.error(f"Failed to load saved session after {max_retries} retries.")
+        raise SessionLoadError(f"Failed to load saved session after {max_retries} retries.")
@@ -1,11 +1,11 @@
 from .baseauth import BaseAuth
-from ...exceptions import QrNotFound, SessionExpired, SessionLoadError
-from ...util import get_qr_in_page
+from .snapshot import origin_of, read_snapshot, write_snapshot
+from ..launchprofile import launch_options
 from ...logger import logger
+from typing import Optional
 import os
 import shutil
-from playwright.sync_api import Page
-from playwright._impl._errors import TimeoutError as PWTimeoutError
+from playwright.sync_api import Page, BrowserContext
 
 
 class LocalAuth(BaseAuth):
@@ -14,33 +14,101 @@ class LocalAuth(BaseAuth):
 
     Extends BaseAuth. Intended to persist session data locally so
     that QR scanning is not required on subsequent logins.
+
+    By default the session directory is a Chromium profile of its own.
+    In snapshot mode the session is kept as a single compressed file
+    holding only the cookies, localStorage and IndexedDB of WhatsApp Web
+    (see :mod:`snapshot`), and is restored into a fresh browser context.
+    Snapshot mode is implied when the ``browser`` client option is set.
+
+    Args:
+        client: The client instance
+        dirPath: Directory holding the sessions
+        sessionId: Name of this session inside ``dirPath``
+        snapshot: Force snapshot mode on or off. Defaults to on only with a shared browser.
     """
     
-    def __init__(self, client, dirPath: str = ".wawebpy_auth", sessionId: str = "default"):
+    def __init__(self, client, dirPath: str = ".wawebpy_auth", sessionId: str = "default", snapshot: Optional[bool] = None):
         super().__init__(client)
         self._dirPath = dirPath.rstrip("/").rstrip("\\") + "/"
         self._sessionId = f'{sessionId.replace("/", "").replace("\\", "")}-session/'
+        self._snapshot = snapshot
+        self._context: BrowserContext = None
+        self._origin: str = None
 
     @property
     def filepath(self):
         return f"{self._dirPath}{self._sessionId}"
 
+    @property
+    def snapshot_path(self) -> str:
+        """Snapshot file of the session in snapshot mode."""
+        return f"{self.filepath}session.json.gz"
+
     def authenticate(self, client_options, playwright) -> Page:
         logger.info("Starting LocalAuth authentication.")
-        session_exists = os.path.exists(self.filepath)
-        logger.debug(f"Session directory exists: {session_exists} at {self.filepath}")
+        browser = client_options.get("browser")
+        snapshot = self._snapshot if self._snapshot is not None else browser is not None
+        self._origin = origin_of(client_options.get("web_url"))
 
-        ctx = playwright.chromium.launch_persistent_context(
-            user_data_dir=self.filepath,
-            headless=client_options.get("headless")
-        )
+        if snapshot:
+            session_exists = os.path.exists(self.snapshot_path)
+            logger.debug(f"Session snapshot exists: {session_exists} at {self.snapshot_path}")
+            if browser is None:
+                browser = playwright.chromium.launch(**launch_options(client_options))
+            state = read_snapshot(self.snapshot_path)["state"] if session_exists else None
+            ctx = browser.new_context(storage_state=state)
+        else:
+            session_exists = os.path.exists(self.filepath)
+            logger.debug(f"Session directory exists: {session_exists} at {self.filepath}")
+            ctx = playwright.chromium.launch_persistent_context(
+                user_data_dir=self.filepath,
+                **launch_options(client_options)
+            )
+        self._context = ctx
+        self.client._record_phase("browser")
 
         if session_exists:
             logger.info("Loading existing session.")
-            return self._load_session(client_options=client_options, browser_or_ctx=ctx)
-        
-        logger.info("No existing session found. Saving new session via QR login.")
-        return self._save_session(client_options=client_options, browser_or_ctx=ctx)
+            page = self._load_session(client_options=client_options, browser_or_ctx=ctx)
+        else:
+            logger.info("No existing session found. Saving new session via QR login.")
+            page = self._save_session(client_options=client_options, browser_or_ctx=ctx)
+
+        if snapshot:
+            self.save_state()
+        return page
+
+    def save_state(self) -> int:
+        """
+        Writes the session snapshot to :attr:`snapshot_path`.
+        Only needed in snapshot mode; a persistent profile saves itself.
+
+        Returns:
+            int: Size of the snapshot in bytes.
+        """
+        return write_snapshot(self._context.storage_state(indexed_db=True), self.snapshot_path, self._origin)
+
+    def export_snapshot(self, path: str) -> None:
+        """
+        Copies the session snapshot to ``path``, e.g. for a backup or another host.
+        Call :meth:`save_state` first to include changes of the running session.
+        """
+        shutil.copyfile(self.snapshot_path, path)
+        logger.info(f"Exported session snapshot to {path}")
+
+    def import_snapshot(self, path: str) -> None:
+        """
+        Makes the snapshot at ``path`` this session's snapshot. It is restored on the
+        next :meth:`authenticate` in snapshot mode.
+
+        Raises:
+            SessionLoadError: If ``path`` isn't a valid snapshot
+        """
+        read_snapshot(path)
+        os.makedirs(self.filepath, exist_ok=True)
+        shutil.copyfile(path, self.snapshot_path)
+        logger.info(f"Imported session snapshot from {path}")
 
     def logout(self) -> None:
         logger.info("Logging out and removing local session.")
@@ -48,38 +116,6 @@ class LocalAuth(BaseAuth):
         shutil.rmtree(self.filepath, ignore_errors=True)
         logger.debug(f"Removed session directory: {self.filepath}")
 
-    def _load_session(self, client_options, browser_or_ctx, max_retries: int = 3) -> Page:
-        page = browser_or_ctx.new_page()
-        page.goto(client_options.get("web_url"))
-
-        retry = 0
-        page_is_valid = False
-        while retry <= max_retries:
-            try:
-                get_qr_in_page(page, client_options.get("qr_data_selector"), 5000)
-                self.logout()
-                logger.warning("Local session expired.")
-                raise SessionExpired(f"Local session expired at {self.filepath}")
-            except QrNotFound:
-                logger.debug(f"No QR found, assuming session is valid. Retry {retry}.")
-
-            try:
-                page.wait_for_selector(client_options.get("loaded_selector"), timeout=5000)
-                page_is_valid = True
-                logger.info("Local session loaded successfully.")
-                break
-            except PWTimeoutError:
-                logger.debug(f"Page not loaded yet, retry {retry}. Reloading.")
-            
-            page.reload()
-            retry += 1
-
-        if not page_is_valid:
-            logger.error(f"Failed to load local session after {retry} retries.")
-            raise SessionLoadError(f"Failed to load local session after {retry} retries.")
-
-        return page
-
     def _save_session(self, client_options, browser_or_ctx) -> Page:
         logger.info("Authenticating via QR to save new session.")
         try:
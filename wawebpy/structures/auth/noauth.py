@@ -2,6 +2,7 @@ from ...logger import logger
 from playwright.sync_api import Page, Playwright
 
 from .baseauth import BaseAuth
+from ..launchprofile import launch_options
 
 
 
@@ -26,7 +27,8 @@ class NoAuth(BaseAuth):
             The result of the _auth_with_qr method, which handles QR authentication.
         """
         logger.info("Starting NoAuth authentication (QR required).")
-        browser = playwright.chromium.launch(headless=client_options.get("headless"))
+        browser = client_options.get("browser") or playwright.chromium.launch(**launch_options(client_options))
+        self.client._record_phase("browser")
         try:
             page = self._auth_with_qr(client_options=client_options, browser_or_ctx=browser)
             logger.info("NoAuth authentication successful, session established.")
@@ -0,0 +1,173 @@
+from ...exceptions import SessionLoadError
+from ...logger import logger
+from typing import Any, Dict, Iterable, Optional, TypedDict
+from urllib.parse import urlsplit
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# Bump when the layout of SessionSnapshot changes.
+SNAPSHOT_VERSION = 1
+
+# IndexedDB databases that hold the login: the account, the encryption keys of
+# local storage and the Signal keys. Chats, messages and media caches are
+# synced again after a restore, and change all the time.
+AUTH_DATABASES = ("wawc", "wawc_db_enc", "signal-storage")
+
+
+class SessionSnapshot(TypedDict):
+    """
+    A compact WhatsApp Web session.
+
+    Attributes:
+        version: SNAPSHOT_VERSION the snapshot was written with
+        origin: Origin the state belongs to, e.g. "https://web.whatsapp.com"
+        created: Unix timestamp of the snapshot
+        state: Playwright storage state of that origin only: cookies, localStorage and the AUTH_DATABASES
+    """
+    version: int
+    origin: str
+    created: float
+    state: Dict[str, Any]
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def compact_state(state: Dict[str, Any], origin: str,
+                  databases: Optional[Iterable[str]] = AUTH_DATABASES) -> Dict[str, Any]:
+    """
+    Keeps only the cookies and origin storage of ``origin`` from a Playwright storage state.
+
+    Args:
+        state: Playwright storage state
+        origin: Origin to keep, e.g. "https://web.whatsapp.com"
+        databases: Names of the IndexedDB databases to keep (all when None)
+    """
+    host = urlsplit(origin).hostname or ""
+    keep = None if databases is None else set(databases)
+    origins = []
+    for entry in state.get("origins", []):
+        if entry.get("origin") != origin:
+            continue
+        if keep is not None and "indexedDB" in entry:
+            entry = {**entry, "indexedDB": [db for db in entry["indexedDB"] if db.get("name") in keep]}
+        origins.append(entry)
+    return {
+        "cookies": [
+            cookie for cookie in state.get("cookies", [])
+            if host == cookie["domain"].lstrip(".") or host.endswith("." + cookie["domain"].lstrip("."))
+        ],
+        "origins": origins,
+    }
+
+
+def dump_snapshot(state: Dict[str, Any], origin: str) -> bytes:
+    """Serializes the ``origin`` part of a Playwright storage state into gzipped JSON."""
+    snapshot = SessionSnapshot(
+        version=SNAPSHOT_VERSION,
+        origin=origin,
+        created=time.time(),
+        state=compact_state(state, origin),
+    )
+    return gzip.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8"), compresslevel=9)
+
+
+def load_snapshot(data: bytes, source: str = "<bytes>") -> SessionSnapshot:
+    """
+    Parses a snapshot serialized by :func:`dump_snapshot`.
+
+    Args:
+        data: The serialized snapshot
+        source: Where ``data`` comes from, for error messages
+
+    Raises:
+        SessionLoadError: If ``data`` is corrupt or of another snapshot version
+    """
+    try:
+        snapshot: SessionSnapshot = json.loads(gzip.decompress(data).decode("utf-8"))
+    except (OSError, EOFError, ValueError) as e:
+        raise SessionLoadError(f"Couldn't read the session snapshot from {source}: {e}") from e
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise SessionLoadError(
+            f"Session snapshot from {source} has version {snapshot.get('version')}, expected {SNAPSHOT_VERSION}."
+        )
+    return snapshot
+
+
+def state_digest(state: Dict[str, Any]) -> str:
+    """Content hash of a storage state, independent of key order."""
+    return hashlib.sha256(json.dumps(state, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def write_snapshot(state: Dict[str, Any], path: str, origin: str) -> int:
+    """
+    Writes the ``origin`` part of ``state`` to ``path`` as a snapshot.
+    The file is replaced atomically, so a crash never leaves a truncated snapshot.
+
+    Returns:
+        int: Size of the snapshot in bytes.
+    """
+    data = dump_snapshot(state, origin)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    logger.debug(f"Wrote session snapshot of {len(data)} bytes to {path}")
+    return len(data)
+
+
+def read_snapshot(path: str) -> SessionSnapshot:
+    """
+    Reads a snapshot written by :func:`write_snapshot`.
+
+    Raises:
+        SessionLoadError: If the file is unreadable or of another snapshot version
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise SessionLoadError(f"Couldn't read the session snapshot at {path}: {e}") from e
+    return load_snapshot(data, path)
+
+
+def snapshot_from_profile(playwright, user_data_dir: str, path: str, web_url: str = "https://web.whatsapp.com/") -> int:
+    """
+    Converts a persistent Chromium profile, as kept by LocalAuth without
+    snapshots, into a snapshot at ``path``.
+
+    Returns:
+        int: Size of the snapshot in bytes.
+    """
+    ctx = playwright.chromium.launch_persistent_context(user_data_dir=user_data_dir, headless=True)
+    try:
+        page = ctx.new_page()
+        # Storage is only collected for origins the context has opened.
+        page.goto(web_url)
+        state = ctx.storage_state(indexed_db=True)
+    finally:
+        ctx.close()
+    return write_snapshot(state, path, origin_of(web_url))
+
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "AUTH_DATABASES",
+    "SessionSnapshot",
+    "origin_of",
+    "compact_state",
+    "dump_snapshot",
+    "load_snapshot",
+    "state_digest",
+    "write_snapshot",
+    "read_snapshot",
+    "snapshot_from_profile",
+]
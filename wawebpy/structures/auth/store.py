@@ -0,0 +1,133 @@
+from ...logger import logger
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import List, Optional
+from urllib.parse import quote, unquote
+import os
+import sqlite3
+
+
+class SessionStore(ABC):
+    """
+    Storage for session snapshots (see :mod:`snapshot`), keyed by session id.
+
+    Implementations must be safe to use from several threads, and any
+    process that can reach the same storage can pick up a session, which
+    is how sessions move between hosts.
+    """
+
+    @abstractmethod
+    def save(self, session_id: str, data: bytes) -> None:
+        """Stores ``data`` as the snapshot of ``session_id``, replacing any previous one."""
+        pass
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[bytes]:
+        """Returns the snapshot of ``session_id``, or None if there is none."""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Removes the snapshot of ``session_id``, if any."""
+        pass
+
+    @abstractmethod
+    def list(self) -> List[str]:
+        """Returns the ids of all stored sessions."""
+        pass
+
+
+class FileSessionStore(SessionStore):
+    """
+    Keeps every snapshot in a file of its own, e.g. on a shared mount.
+    File names are the percent-encoded session ids, so every id maps to a
+    file of its own inside ``dir_path``.
+
+    Args:
+        dir_path: Directory holding the snapshots
+    """
+
+    SUFFIX = ".snapshot.gz"
+
+    def __init__(self, dir_path: str = ".wawebpy_sessions"):
+        self._dir_path = dir_path
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self._dir_path, quote(session_id, safe="") + self.SUFFIX)
+
+    def save(self, session_id: str, data: bytes) -> None:
+        os.makedirs(self._dir_path, exist_ok=True)
+        path = self._path(session_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved session {session_id} ({len(data)} bytes) to {path}")
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        try:
+            with open(self._path(session_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> List[str]:
+        if not os.path.isdir(self._dir_path):
+            return []
+        return sorted(
+            unquote(name[:-len(self.SUFFIX)]) for name in os.listdir(self._dir_path) if name.endswith(self.SUFFIX)
+        )
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Keeps every snapshot as a row of one SQLite database file.
+
+    A connection is opened per operation, so the store can be shared
+    between threads and pickled into worker processes.
+
+    Args:
+        path: Path of the database file
+    """
+
+    def __init__(self, path: str = "wawebpy_sessions.db"):
+        self._path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    def save(self, session_id: str, data: bytes) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, data, updated) VALUES (?, ?, julianday('now')) "
+                "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                (session_id, data),
+            )
+        logger.debug(f"Saved session {session_id} ({len(data)} bytes) to {self._path}")
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def list(self) -> List[str]:
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT session_id FROM sessions ORDER BY session_id")]
+
+
+__all__ = ["SessionStore", "FileSessionStore", "SQLiteSessionStore"]
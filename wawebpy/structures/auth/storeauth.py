@@ -0,0 +1,139 @@
+from .baseauth import BaseAuth
+from .snapshot import compact_state, dump_snapshot, load_snapshot, origin_of, state_digest
+from .store import SessionStore
+from ..launchprofile import launch_options
+from ...logger import logger
+from concurrent.futures import Executor, Future
+from typing import Any, Dict, Optional
+import time
+from playwright.sync_api import Page, BrowserContext
+
+
+class StoreAuth(BaseAuth):
+    """
+    Handles authentication with a session kept in a SessionStore.
+
+    The session runs in a fresh browser context, restored from its
+    snapshot, so any host with access to the store can take it over.
+    Changes are written back by :meth:`checkpoint`, which is debounced
+    and skips snapshots whose content didn't change, so a busy session
+    doesn't rewrite its state all the time. Only the IndexedDB databases
+    of the login are kept (see AUTH_DATABASES).
+
+    Args:
+        client: The client instance
+        store: Where the session snapshot is kept
+        sessionId: Key of the session in ``store``
+        checkpoint_interval: Minimum seconds between two unforced checkpoints
+    """
+
+    def __init__(self, client, store: SessionStore, sessionId: str = "default", checkpoint_interval: float = 60.0):
+        super().__init__(client)
+        self.store = store
+        self.session_id = sessionId
+        self.checkpoint_interval = checkpoint_interval
+        self._context: BrowserContext = None
+        self._origin: str = None
+        self._digest: Optional[str] = None
+        self._last_checkpoint = 0.0
+        self._writing: Optional[Future] = None
+
+    def authenticate(self, client_options, playwright) -> Page:
+        logger.info(f"Starting StoreAuth authentication for session {self.session_id}.")
+        self._origin = origin_of(client_options.get("web_url"))
+        state = self._load_state()
+
+        browser = client_options.get("browser") or playwright.chromium.launch(**launch_options(client_options))
+        ctx = browser.new_context(storage_state=state)
+        self._context = ctx
+        self.client._record_phase("browser")
+
+        if state is not None:
+            logger.info("Loading stored session.")
+            page = self._load_session(client_options=client_options, browser_or_ctx=ctx)
+        else:
+            logger.info("No stored session found. Saving new session via QR login.")
+            page = self._auth_with_qr(browser_or_ctx=ctx, client_options=client_options)
+
+        self.checkpoint(force=True)
+        return page
+
+    def checkpoint(self, force: bool = False) -> bool:
+        """
+        Saves the session to the store if it changed since the last save.
+
+        Unless ``force`` is set, nothing is read from the page within
+        ``checkpoint_interval`` seconds of the previous checkpoint, so
+        this is cheap to call often, e.g. from a polling loop.
+
+        Returns:
+            bool: Whether a snapshot was written.
+        """
+        if not self._due(force):
+            return False
+        self._wait_for_write()
+        return self._store_state(self._context.storage_state(indexed_db=True))
+
+    def checkpoint_in(self, executor: Executor, force: bool = False) -> Optional["Future[bool]"]:
+        """
+        Like :meth:`checkpoint`, but only reads the storage on this thread.
+        Compacting, hashing, compressing and saving run on ``executor``.
+
+        Returns:
+            A future resolving to whether a snapshot was written, or None if
+            the checkpoint isn't due or the previous one is still being written.
+        """
+        if self._writing is not None and not self._writing.done():
+            return None
+        if not self._due(force):
+            return None
+        self._writing = executor.submit(self._store_state, self._context.storage_state(indexed_db=True))
+        return self._writing
+
+    def save_state(self) -> bool:
+        """Saves the session now if it changed. Same as ``checkpoint(force=True)``."""
+        return self.checkpoint(force=True)
+
+    def logout(self) -> None:
+        logger.info(f"Logging out and removing session {self.session_id} from the store.")
+        self.client.stop()
+        self.store.delete(self.session_id)
+        self._digest = None
+
+    def _due(self, force: bool) -> bool:
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < self.checkpoint_interval:
+            return False
+        self._last_checkpoint = now
+        return True
+
+    def _wait_for_write(self) -> None:
+        # A newer snapshot must not be overtaken by an older one still being written.
+        if self._writing is not None:
+            try:
+                self._writing.result()
+            except Exception:
+                pass
+            self._writing = None
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        data = self.store.load(self.session_id)
+        if data is None:
+            return None
+        state = load_snapshot(data, f"session {self.session_id}")["state"]
+        # Restoring an unchanged session must not trigger a write.
+        self._digest = state_digest(state)
+        return state
+
+    def _store_state(self, state: Dict[str, Any]) -> bool:
+        state = compact_state(state, self._origin)
+        digest = state_digest(state)
+        if digest == self._digest:
+            logger.debug(f"Session {self.session_id} unchanged, skipping checkpoint.")
+            return False
+        self.store.save(self.session_id, dump_snapshot(state, self._origin))
+        self._digest = digest
+        return True
+
+
+__all__ = ["StoreAuth"]
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import TypedDict, Dict, Any
+from typing import TypedDict, Dict, List, Tuple, Optional, Any, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .entitycache import BaseEntityCache, EntityKind
 from playwright.sync_api import Page
-from ..util import get_contact_script, get_module_script
+from ..bundle import call_bundle
+from ..exceptions import GettingChatError
 
 
 class ChatIDType(TypedDict, total=True):
@@ -18,8 +21,12 @@ class ChatKwargs(TypedDict, total=True):
     
 
 
-class Chat:
-    """Base class for WhatsApp chats (both contacts and groups)."""
+class BaseChat:
+    """
+    Attributes of a WhatsApp chat (both contacts and groups), shared by
+    :class:`Chat` and the awaitable ``AsyncChat``, which add the methods
+    that talk to the page.
+    """
 
     _attribute_map = {
         "getId": "id",
@@ -28,8 +35,15 @@ class Chat:
         "getUnreadCount": "unreadCount",
     }
 
+    # Attributes that can be patched in place from pushed collection changes.
+    _patchable_attributes = {
+        "name": "_name",
+        "unreadCount": "_unread_count",
+    }
+
     def __init__(self, page: Page, **kwargs: ChatKwargs):
         self._page: Page = page
+        self._cache: Optional[BaseEntityCache] = None
 
         # Identifiers
         self._id: ChatIDType = kwargs["id"]
@@ -39,26 +53,40 @@ class Chat:
         self._is_group: bool = kwargs["isGroup"]
         self._unread_count: int = kwargs["unreadCount"]
 
-    # --- Factory ---
-    @staticmethod
-    def get(page: Page, jid: str) -> Chat:
-        attrs: Dict[str, Any] = {}
-        for func_name, attr_name in Chat._attribute_map.items():
-            chat_script = get_contact_script(jid)
-            script = get_module_script(
-                module="WAWebChatGetters",
-                function=func_name,
-                args=(chat_script,),
-            )
-            attr_value = page.evaluate(script)
-            attrs[attr_name] = attr_value
-
-        return Chat(page, **attrs)
-
-    def resync(self) -> None:
-        """Update this instance with fresh attributes from WhatsApp Web."""
-        new_chat = Chat.get(self.page, self.jid)
-        self.__dict__.update(new_chat.__dict__)
+    def _remember(self, kind: EntityKind, cache: Optional[BaseEntityCache], *jids: str) -> None:
+        """Attaches ``cache`` to this instance and stores it under its own and the given JIDs."""
+        self._cache = cache
+        if cache is None:
+            return
+        for jid in {self.jid, *jids}:
+            cache.put(kind, jid, self)
+
+    def _patch(self, attrs: Dict[str, Any]) -> None:
+        """Updates the patchable attributes from a pushed collection change."""
+        for attr_name, value in attrs.items():
+            field = self._patchable_attributes.get(attr_name)
+            if field is not None:
+                setattr(self, field, value)
+
+    # --- Batched attribute fetching ---
+    @classmethod
+    def _getter_map(cls) -> Dict[str, Dict[str, str]]:
+        """Getter modules and their ``{function: attribute}`` maps for this type."""
+        return {"WAWebChatGetters": BaseChat._attribute_map}
+
+    @classmethod
+    def _getter_extras(cls) -> List[str]:
+        """Names of the extra attributes computed by the bundle (``window.__wawebpy`` extras)."""
+        return []
+
+    def to_dict(self) -> ChatKwargs:
+        """Returns the attributes as plain data, in the form the constructor accepts."""
+        return ChatKwargs(
+            id=self._id,
+            name=self._name,
+            isGroup=self._is_group,
+            unreadCount=self._unread_count,
+        )
 
     # --- Properties ---
     @property
@@ -85,13 +113,35 @@ class Chat:
     def unread_count(self) -> int:
         return self._unread_count
 
-    @property
-    def _js_repr(self) -> str:
-        return get_contact_script(self.jid)
-
-    def _js_variable_repr(self, variable: str) -> str:
-        return f"{self._js_repr}.{variable}"
-
     def __str__(self) -> str:
         kind = "Group" if self.is_group else "Contact"
         return f"{kind}({self.name}, {self.jid})"
+
+
+class Chat(BaseChat):
+    """A WhatsApp chat bound to a sync page."""
+
+    # --- Factory ---
+    @staticmethod
+    def get(page: Page, jid: str) -> Chat:
+        results, errors = Chat._fetch_attributes(page, [jid])
+        if jid in errors:
+            raise GettingChatError(f"Failed to fetch chat {jid}: {errors[jid]}")
+
+        return Chat(page, **results[jid])
+
+    @classmethod
+    def _fetch_attributes(cls, page: Page, jids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Fetches the attributes of every JID in a single round-trip.
+
+        Returns:
+            A ``(results, errors)`` tuple keyed by JID.
+        """
+        batch = call_bundle(page, "batchGetters", jids, cls._getter_map(), cls._getter_extras())
+        return batch["results"], batch["errors"]
+
+    def resync(self) -> None:
+        """Update this instance with fresh attributes from WhatsApp Web."""
+        new_chat = Chat.get(self.page, self.jid)
+        self.__dict__.update(new_chat.__dict__)
@@ -4,13 +4,44 @@ class ClientOptions(TypedDict):
     TypedDict for client configuration options.
     
     Attributes:
-        auth: Authentication method (NoAuth, LegacySessionAuth, LocalAuth)
+        auth: Authentication method (NoAuth, LegacySessionAuth, LocalAuth, StoreAuth)
         headless: Whether to run browser in headless mode
         web_url: URL of WhatsApp Web
         qr_data_selector: CSS selector for the QR code data element
+        loaded_selector: CSS selector present once WhatsApp Web has loaded
+        cache: Entity cache for contacts, groups and group metadata (disabled when omitted)
+        watch_collections: Keep the cache coherent with pushed in-page collection changes
+        event_batch_size: Maximum number of messages delivered per batch (1 disables batching)
+        event_batch_interval: Maximum time in milliseconds a message waits in the page for its batch
+        dispatcher: Dispatcher that runs event callbacks on a worker pool (inline when omitted)
+        playwright: Already started Playwright driver to share; the client won't stop it
+        browser: Shared browser; the session gets an isolated context in it instead of its own browser
+        launch_profile: Chromium flags and resource blocking of the session, e.g. LEAN_PROFILE
+        send_rate: Messages per second the account sends at most, over all chats
+        send_burst: Messages that may be sent at once before ``send_rate`` applies
+        send_timeout: Seconds a created message may wait for its server ack before it fails (unlimited when omitted)
+        media_concurrency: Media downloads that may run at once
+        upload_concurrency: Outgoing media files that may be prepared and uploaded at once
+        media_timeout: Seconds a media download may hold its slot before it fails
+        media_cache: Content-addressed MediaCache for downloads and upload handles (disabled when omitted)
     """
-    auth: Union['NoAuth', 'LegacySessionAuth', 'LocalAuth']
+    auth: Union['NoAuth', 'LegacySessionAuth', 'LocalAuth', 'StoreAuth']
     headless: bool
     web_url: str
     qr_data_selector: str
     loaded_selector: str
+    cache: 'BaseEntityCache'
+    watch_collections: bool
+    event_batch_size: int
+    event_batch_interval: int
+    dispatcher: 'Dispatcher'
+    playwright: 'Playwright'
+    browser: 'Browser'
+    launch_profile: 'LaunchProfile'
+    send_rate: float
+    send_burst: int
+    send_timeout: float
+    media_concurrency: int
+    upload_concurrency: int
+    media_timeout: float
+    media_cache: 'MediaCache'
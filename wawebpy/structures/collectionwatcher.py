@@ -0,0 +1,146 @@
+from ..bundle import require_modules
+from ..logger import logger
+from .entitycache import BaseEntityCache
+from playwright.sync_api import Page
+from typing import Any, Dict, List, Literal, Optional, TypedDict
+
+
+class CollectionChange(TypedDict):
+    """
+    A change pushed from an in-page collection listener.
+
+    Attributes:
+        collection: Collection the change originated from
+        event: Collection event name
+        jid: Serialized JID of the changed model
+        alt: The model's other JID, if known: the phone-number JID of a LID or the LID of a phone number
+        attrs: Fresh attribute values for 'change' events on the chat collection
+    """
+    collection: Literal["contact", "chat", "groupMetadata"]
+    event: Literal["add", "change", "remove"]
+    jid: str
+    alt: Optional[str]
+    attrs: Dict[str, Any]
+
+
+class CollectionWatcher:
+    """
+    Keeps an entity cache coherent with WhatsApp Web's in-page collections.
+
+    Listeners on the contact, chat and group metadata collections push their
+    add/change/remove events to Python through a page binding. Chat changes,
+    which fire on every incoming message, patch the cached entity in place;
+    every other change invalidates the affected entries. A model may be
+    keyed by its LID in the page while callers cache it under its phone
+    number, so changes apply to both JIDs.
+
+    The listeners are installed as an init script, so they follow the page
+    across reloads; they register once the collections are defined.
+    Attaching raises ClientInitError if the ready page lacks any of them.
+    """
+
+    BINDING_NAME = "__wawebpyCollectionChange"
+
+    # Debounce window for in-page changes; a burst of changes is sent as one call.
+    FLUSH_INTERVAL_MS = 50
+
+    def __init__(self, cache: BaseEntityCache):
+        self._cache = cache
+        self._page: Page = None
+
+    def attach(self, page: Page) -> None:
+        """Exposes the binding on ``page`` and registers the in-page listeners, now and on every reload."""
+        logger.debug("Attaching collection watcher.")
+        self._page = page
+        page.expose_binding(self.BINDING_NAME, self._on_changes)
+        page.add_init_script(self._script())
+        require_modules(page.evaluate(self._script()), "Collection watcher")
+        logger.info("Collection watcher attached.")
+
+    async def attach_async(self, page) -> None:
+        """Awaitable counterpart of :meth:`attach` for ``playwright.async_api`` pages."""
+        logger.debug("Attaching collection watcher.")
+        self._page = page
+        await page.expose_binding(self.BINDING_NAME, self._on_changes)
+        await page.add_init_script(self._script())
+        require_modules(await page.evaluate(self._script()), "Collection watcher")
+        logger.info("Collection watcher attached.")
+
+    def _on_changes(self, source: Dict[str, Any], changes: List[CollectionChange]) -> None:
+        logger.debug(f"Received {len(changes)} collection changes.")
+        for change in changes:
+            try:
+                self._apply(change)
+            except Exception:
+                logger.exception(f"Failed to apply collection change for {change.get('jid')}.")
+
+    def _apply(self, change: CollectionChange) -> None:
+        for jid in filter(None, (change["jid"], change.get("alt"))):
+            self._apply_to(jid, change)
+
+    def _apply_to(self, jid: str, change: CollectionChange) -> None:
+        if change["collection"] == "groupMetadata":
+            self._cache.invalidate(jid, ["group_metadata"])
+            return
+
+        if change["collection"] == "chat" and change["event"] == "change":
+            for kind in ("contact", "group"):
+                entity = self._cache.peek(kind, jid)
+                if entity is not None:
+                    entity._patch(change["attrs"])
+            return
+
+        self._cache.invalidate(jid)
+
+    def _script(self) -> str:
+        return f"""(() => {{
+    if (window.__wawebpyCollectionWatcher) return [];
+    window.__wawebpyCollectionWatcher = true;
+
+    const {{ mod, whenModules }} = window.__wawebpy;
+    let pending = [];
+    let timer = null;
+    const altOf = (id) => {{
+        try {{
+            const api = mod("WAWebApiContact");
+            const alt = id.server === "lid" ? api.getPhoneNumber(id) : id.server === "c.us" ? api.getCurrentLid(id) : null;
+            return alt ? alt._serialized : null;
+        }} catch (e) {{
+            return null;
+        }}
+    }};
+    const push = (collection, event, model, attrs) => {{
+        const jid = model && model.id && model.id._serialized;
+        if (!jid) return;
+        pending.push({{ collection, event, jid, alt: altOf(model.id), attrs: attrs || {{}} }});
+        if (timer === null) {{
+            timer = setTimeout(() => {{
+                const changes = pending;
+                pending = [];
+                timer = null;
+                window.{self.BINDING_NAME}(changes);
+            }}, {self.FLUSH_INTERVAL_MS});
+        }}
+    }};
+    const watch = (collection, name, attrsOf) => {{
+        if (!collection) return;
+        collection.on("add", (model) => push(name, "add", model));
+        collection.on("remove", (model) => push(name, "remove", model));
+        collection.on("change", (model) => push(name, "change", model, attrsOf && attrsOf(model)));
+    }};
+
+    return whenModules(
+        ["WAWebCollections", "WAWebChatGetters", "WAWebContactCollection.ContactCollection"],
+        (collections, chatGetters, contacts) => {{
+            watch(contacts, "contact");
+            watch(collections.Chat, "chat", (model) => ({{
+                name: chatGetters.getName(model),
+                unreadCount: chatGetters.getUnreadCount(model),
+            }}));
+            watch(collections.GroupMetadata, "groupMetadata");
+        }},
+    );
+}})()"""
+
+
+__all__ = ["CollectionWatcher", "CollectionChange"]
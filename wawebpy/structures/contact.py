@@ -1,11 +1,12 @@
 from __future__ import annotations
-from typing import TypedDict, List, Union, TYPE_CHECKING
+from typing import TypedDict, Dict, List, Tuple, Union, Any, TYPE_CHECKING
 if TYPE_CHECKING:
     from .group import Group
+    from .entitycache import BaseEntityCache
 from ..exceptions import StatusFetchError, ContactNotFound, ProfilePictureNotFound, WidFetchError
 from playwright.sync_api import Page
-from ..util import get_contact_script, get_module_script
-from .chat import Chat, ChatIDType
+from ..bundle import call_bundle
+from .chat import BaseChat, Chat, ChatIDType
 from ..logger import logger
 
 
@@ -22,9 +23,17 @@ class ContactKwargs(TypedDict, total=True):
     isBusiness: bool
     isBot: bool
     isContact: bool
+    canRequestPhoneNumber: bool
+    wid: ChatIDType
 
 
-class Contact(Chat):
+class BaseContact(BaseChat):
+    """
+    Attributes of a WhatsApp contact, shared by :class:`Contact` and the
+    awaitable ``AsyncContact``. ``wid`` is the phone-number WID, which LID
+    contacts resolve in the page before they are built.
+    """
+
     _attribute_map = {
         "getPushname": "pushName",
         "getNotifyName": "notifyName",
@@ -47,7 +56,8 @@ class Contact(Chat):
         self._short_name: str = kwargs["shortName"]
         self._mention_name: str = kwargs["mentionName"]
         self._hash: str = kwargs["hash"]
-        self._phone_number: str = self.get_wid().get("user")
+        self._wid: ChatIDType = kwargs["wid"]
+        self._phone_number: str = self._wid.get("user")
 
         # Flags
         self._can_request_number: bool = kwargs["canRequestPhoneNumber"]
@@ -58,68 +68,223 @@ class Contact(Chat):
 
         logger.debug(f"Contact initialized: {self}")
 
+    @classmethod
+    def _from_attributes(cls, page: Page, attrs: Dict[str, Any]) -> BaseContact:
+        """Builds a contact from batched attributes, forcing its id to the WID."""
+        logger.debug(f"Ensuring the id is of type WID.")
+        try:
+            contact = cls(page, **attrs)
+
+            contact._id = contact._wid
+            logger.debug(f"The id is forced as WID.")
+        except Exception as e:
+            logger.exception(f"Couldn't ensure that id is of type WID.")
+            raise WidFetchError(f"Couldn't force WID conversion for contact '{attrs.get('name')}'.") from e
+
+        return contact
+
+    @classmethod
+    def _getter_map(cls) -> Dict[str, Dict[str, str]]:
+        return {**BaseChat._getter_map(), "WAWebContactGetters": BaseContact._attribute_map}
+
+    @classmethod
+    def _getter_extras(cls) -> List[str]:
+        # The in-page WID resolution spares LID contacts an extra round-trip.
+        return ["wid"]
+
+    def to_dict(self) -> ContactKwargs:
+        return ContactKwargs(
+            **super().to_dict(),
+            pushName=self._push_name,
+            notifyName=self._notify_name,
+            shortName=self._short_name,
+            mentionName=self._mention_name,
+            hash=self._hash,
+            isMe=self._is_me,
+            isBusiness=self._is_business,
+            isBot=self._is_bot,
+            isContact=self._is_contact,
+            canRequestPhoneNumber=self._can_request_number,
+            wid=self._wid,
+        )
+
+    # --- Properties ---
+    @property
+    def phone_number(self) -> str:
+        return self._phone_number
+
+    @property
+    def jid(self) -> str:
+        return self.id["_serialized"]
+
+    @property
+    def push_name(self) -> str:
+        return self._push_name
+
+    @property
+    def notify_name(self) -> str:
+        return self._notify_name
+
+    @property
+    def short_name(self) -> str:
+        return self._short_name
+
+    @property
+    def mention_name(self) -> str:
+        return self._mention_name
+
+    @property
+    def hash(self) -> str:
+        return self._hash
+
+    @property
+    def is_me(self) -> bool:
+        return self._is_me
+
+    @property
+    def is_business(self) -> bool:
+        return self._is_business
+
+    @property
+    def is_bot(self) -> bool:
+        return self._is_bot
+
+    @property
+    def is_contact(self) -> bool:
+        return self._is_contact
+
+    @property
+    def can_request_number(self) -> bool:
+        return self._can_request_number
+
+    @property
+    def wid(self) -> ChatIDType:
+        return self._wid
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.short_name}, {self.phone_number})"
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.short_name}, {self.phone_number})"
+
+
+class Contact(BaseContact, Chat):
+    """A WhatsApp contact bound to a sync page."""
+
     # --- Actions ---
     def block(self) -> None:
         logger.info(f"Blocking contact {self.jid}")
-        script = get_module_script("WAWebBlockContactAction", "blockContact", (self._js_repr,))
-        self.page.evaluate(script)
+        call_bundle(self.page, "blockContact", self.jid)
         logger.debug(f"Contact {self.jid} blocked.")
 
     def unblock(self) -> None:
         logger.info(f"Unblocking contact {self.jid}")
-        script = get_module_script("WAWebBlockContactAction", "unblockContact", (self._js_repr,))
-        self.page.evaluate(script)
+        call_bundle(self.page, "unblockContact", self.jid)
         logger.debug(f"Contact {self.jid} unblocked.")
 
     # --- Factory ---
     @staticmethod
-    def get(page: Page, jid: str) -> Contact:
+    def get(page: Page, jid: str, cache: BaseEntityCache = None, refresh: bool = False) -> Contact:
+        """
+        Fetches a contact.
+
+        Args:
+            page: The WhatsApp Web page.
+            jid: Serialized JID of the contact.
+            cache: Optional entity cache to read from and populate.
+            refresh: Bypass the cache lookup and store a freshly fetched contact.
+        """
         logger.debug(f"Fetching contact {jid}")
-        attrs = {}
+        if cache is not None and not refresh:
+            cached = cache.get("contact", jid)
+            if cached is not None:
+                logger.debug(f"Contact {jid} served from cache.")
+                return cached
 
         try:
-            contact_script = get_contact_script(jid)
-            for func_name, attr_name in Chat._attribute_map.items():
-                script = get_module_script("WAWebChatGetters", func_name, (contact_script,))
-                attrs[attr_name] = page.evaluate(script)
-
-            for func_name, attr_name in Contact._attribute_map.items():
-                script = get_module_script("WAWebContactGetters", func_name, (contact_script,))
-                attrs[attr_name] = page.evaluate(script)
+            results, errors = Contact._fetch_attributes(page, [jid])
         except Exception as e:
             logger.exception(f"Failed to fetch contact {jid}")
             raise ContactNotFound(f"Failed to fetch contact {jid}") from e
 
+        attrs = results.get(jid, {})
         if not attrs.get("id"):
-            logger.warning(f"Contact {jid} not found in attributes.")
+            logger.warning(f"Contact {jid} not found in attributes: {errors.get(jid)}")
             raise ContactNotFound(f"Contact {jid} not found")
 
         logger.info(f"Contact {jid} fetched successfully.")
-        
-        logger.debug(f"Ensuring the id is of type WID.")
-        try:
-            contact = Contact(page, **attrs)
+        contact = Contact._from_attributes(page, attrs)
+        contact._remember("contact", cache, jid)
+        return contact
 
-            contact._id = contact.get_wid()
-            logger.debug(f"The id is forced as WID.")
+    @staticmethod
+    def get_many(
+        page: Page, jids: List[str], cache: BaseEntityCache = None
+    ) -> Tuple[Dict[str, Contact], Dict[str, Exception]]:
+        """
+        Fetches several contacts in a single round-trip.
+
+        Args:
+            page: The WhatsApp Web page.
+            jids: Serialized JIDs of the contacts.
+            cache: Optional entity cache; only the misses are fetched from the page.
+
+        Returns:
+            A ``(contacts, errors)`` tuple. Both are keyed by the requested JID;
+            JIDs that couldn't be resolved are mapped to their exception in ``errors``.
+        """
+        jids = list(dict.fromkeys(jids))
+        logger.debug(f"Fetching {len(jids)} contacts")
+
+        contacts: Dict[str, Contact] = {}
+        if cache is not None:
+            for jid in jids:
+                cached = cache.get("contact", jid)
+                if cached is not None:
+                    contacts[jid] = cached
+        missing = [jid for jid in jids if jid not in contacts]
+
+        try:
+            results, misses = Contact._fetch_attributes(page, missing) if missing else ({}, {})
         except Exception as e:
-            logger.exception(f"Couldn't ensure that id is of type WID.")
-            raise WidFetchError(f"Couldn't force WID conversion for contact '{contact.name}'.") 
-        
-        return contact
+            logger.exception(f"Failed to fetch {len(missing)} contacts")
+            raise ContactNotFound(f"Failed to fetch {len(missing)} contacts") from e
+
+        errors: Dict[str, Exception] = {
+            jid: ContactNotFound(f"Contact {jid} not found: {reason}") for jid, reason in misses.items()
+        }
+        for jid, attrs in results.items():
+            if not attrs.get("id"):
+                errors[jid] = ContactNotFound(f"Contact {jid} not found")
+                continue
+            try:
+                contacts[jid] = Contact._from_attributes(page, attrs)
+                contacts[jid]._remember("contact", cache, jid)
+            except WidFetchError as e:
+                errors[jid] = e
+
+        logger.info(f"Fetched {len(contacts)}/{len(jids)} contacts.")
+        return contacts, errors
+
+    @classmethod
+    def _from_attributes(cls, page: Page, attrs: Dict[str, Any]) -> Contact:
+        if not attrs.get("wid"):
+            attrs = {**attrs, "wid": Contact._fetch_wid(page, attrs["id"])}
+        return super()._from_attributes(page, attrs)
 
     def resync(self) -> None:
         logger.info(f"Resyncing contact {self.jid}")
-        new_contact = Contact.get(self.page, self.jid)
+        new_contact = Contact.get(self.page, self.jid, cache=self._cache, refresh=True)
         self.__dict__.update(new_contact.__dict__)
+        if self._cache is not None:
+            self._cache.invalidate(self.jid, ["common_groups"])
         logger.debug(f"Contact {self.jid} resynced.")
 
     # --- Contact-only methods ---
     def get_status(self) -> str:
         logger.debug(f"Fetching status for {self.jid}")
         try:
-            script = get_module_script("WAWebContactStatusBridge", "getStatus", (self._js_variable_repr("id"),))
-            status = self.page.evaluate(script)["status"]
+            status = call_bundle(self.page, "getStatus", self.jid)["status"]
             logger.info(f"Fetched status for {self.jid}: {status}")
             return status
         except Exception as e:
@@ -129,9 +294,7 @@ class Contact(Chat):
     def get_profile_picture(self) -> Union[str, None]:
         logger.debug(f"Fetching profile picture for {self.jid}")
         try:
-            script = get_module_script("WAWebContactProfilePicThumbBridge", "profilePicResync", (f"[{self._js_repr}]",))
-
-            pic = self.page.evaluate(script)[0].get("eurl", None)
+            pic = call_bundle(self.page, "getProfilePicture", self.jid)[0].get("eurl", None)
             if not pic:
                 logger.warning(f"No profile picture found for {self.jid}")
             else:
@@ -144,103 +307,50 @@ class Contact(Chat):
 
     def get_lid(self) -> ChatIDType:
         logger.debug(f"Fetching LID for {self.jid}")
-        script = get_module_script("WAWebApiContact", "getCurrentLid", (self._js_variable_repr("id"),))
-        lid = self.page.evaluate(script)
+        lid = call_bundle(self.page, "getCurrentLid", self.jid)
         logger.info(f"Fetched LID for {self.jid}")
         return lid
 
     def get_common_groups(self) -> List['Group']:
-        logger.debug(f"Fetching common groups for {self.jid}")
-        script = get_module_script(
-            module="WAWebFindCommonGroupsContactAction",
-            function="findCommonGroups",
-            args=(self._js_repr,),
-        )
-        group_objects = self.page.evaluate(script).get("_index", [])
-
-        common_groups = []
-        for jid in group_objects.keys():
-            logger.debug(f"Fetching group {jid} for common groups of {self.jid}")
-            common_groups.append(Group.get(jid))
+        from .group import Group
 
+        logger.debug(f"Fetching common groups for {self.jid}")
+        group_jids = self._cache.get("common_groups", self.jid) if self._cache is not None else None
+        if group_jids is None:
+            group_jids = call_bundle(self.page, "getCommonGroups", self.jid)
+            if self._cache is not None:
+                self._cache.put("common_groups", self.jid, group_jids)
+        else:
+            logger.debug(f"Common groups of {self.jid} served from cache.")
+
+        groups, errors = Group.get_many(self.page, group_jids, cache=self._cache)
+        for jid, error in errors.items():
+            logger.warning(f"Failed to fetch group {jid} for common groups of {self.jid}: {error}")
+
+        common_groups = [groups[jid] for jid in group_jids if jid in groups]
         logger.info(f"Found {len(common_groups)} common groups for {self.jid}")
         return common_groups
 
-    # --- Properties ---
-    @property
-    def phone_number(self) -> str:
-        return self._phone_number
-
-    @property
-    def jid(self) -> str:
-        return self.id["_serialized"]
-
-    @property
-    def push_name(self) -> str:
-        return self._push_name
-
-    @property
-    def notify_name(self) -> str:
-        return self._notify_name
-
-    @property
-    def short_name(self) -> str:
-        return self._short_name
-
-    @property
-    def mention_name(self) -> str:
-        return self._mention_name
-
-    @property
-    def hash(self) -> str:
-        return self._hash
-
-    @property
-    def is_me(self) -> bool:
-        return self._is_me
-
-    @property
-    def is_business(self) -> bool:
-        return self._is_business
-
-    @property
-    def is_bot(self) -> bool:
-        return self._is_bot
-
-    @property
-    def is_contact(self) -> bool:
-        return self._is_contact
-
-    @property
-    def can_request_number(self) -> bool:
-        return self._can_request_number
-
     def get_wid(self) -> ChatIDType:
-        logger.debug(f"Fetching WID for {getattr(self, 'jid', 'unknown')}")
+        return Contact._fetch_wid(self.page, self.id)
+
+    @staticmethod
+    def _fetch_wid(page: Page, chat_id: ChatIDType) -> ChatIDType:
+        jid = chat_id["_serialized"]
+        logger.debug(f"Fetching WID for {jid}")
         try:
-            if self.id["server"] == "c.us":
-                return self.id
-            elif self.id["server"] == "lid":
-                script = get_module_script(
-                    module="WAWebApiContact",
-                    function="getPhoneNumber",
-                    args=(self._js_variable_repr("id"),),
-                )
-                wid = self.page.evaluate(script)
+            if chat_id["server"] == "c.us":
+                return chat_id
+            elif chat_id["server"] == "lid":
+                wid = call_bundle(page, "getPhoneNumber", jid)
                 if not wid:
-                    logger.warning(f"No WID found for {self.jid}")
-                    raise WidFetchError(f"No WID found for {self.jid}")
-                logger.info(f"Fetched WID for {self.jid}")
+                    logger.warning(f"No WID found for {jid}")
+                    raise WidFetchError(f"No WID found for {jid}")
+                logger.info(f"Fetched WID for {jid}")
                 return wid
             else:
-                logger.error(f"Unsupported server type for {self.jid}")
-                raise WidFetchError(f"Unsupported server type for {self.jid}")
+                logger.error(f"Unsupported server type for {jid}")
+                raise WidFetchError(f"Unsupported server type for {jid}")
         except Exception as e:
-            logger.exception(f"Failed to fetch WID for {self.jid}")
-            raise WidFetchError(f"Failed to fetch WID for {self.jid}") from e
-
-    def __str__(self):
-        return f"Contact({self.short_name}, {self.phone_number})"
-
-    def __repr__(self):
-        return f"Contact({self.short_name}, {self.phone_number})"
\ No newline at end of file
+            logger.exception(f"Failed to fetch WID for {jid}")
+            raise WidFetchError(f"Failed to fetch WID for {jid}") from e
@@ -0,0 +1,211 @@
+from ..logger import logger
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Lock
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Tuple, TypedDict
+import asyncio
+import inspect
+import time
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+
+class EventMetrics(TypedDict):
+    """
+    Dispatch metrics of a single event name.
+
+    Attributes:
+        queue_depth: Number of events waiting for a worker
+        dispatched: Number of events taken off the queue
+        dropped: Number of events discarded by the overflow policy
+        failed: Number of listener invocations that raised
+        avg_wait: Average time in seconds an event waited in the queue
+        avg_latency: Average time in seconds a listener took to run
+        max_latency: Longest time in seconds a listener took to run
+    """
+    queue_depth: int
+    dispatched: int
+    dropped: int
+    failed: int
+    avg_wait: float
+    avg_latency: float
+    max_latency: float
+
+
+_Item = Tuple[List[Callable[..., Any]], tuple, dict, float]
+
+
+class _EventQueue:
+    """Bounded queue and counters of one event name."""
+
+    def __init__(self):
+        self.items: Deque[_Item] = deque()
+        self.cond = Condition()
+        self.dispatched = 0
+        self.dropped = 0
+        self.failed = 0
+        self.invocations = 0
+        self.total_wait = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, failed: bool) -> None:
+        with self.cond:
+            self.invocations += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if failed:
+                self.failed += 1
+
+
+class Dispatcher:
+    """
+    Runs event listeners on a bounded thread pool instead of inline.
+
+    Every event name has its own bounded queue. When a queue is full, the
+    overflow policy decides what happens: ``drop_oldest`` (the default)
+    discards the oldest pending event, ``drop_newest`` discards the incoming
+    one and ``block`` makes the emitter wait for room. Events are emitted on
+    the Playwright thread, so ``block`` stalls the page's event dispatch,
+    including the calls the client is waiting on, until a worker frees a
+    slot; only use it when no event may be lost. Listeners are isolated from
+    each other, so one that raises is logged and counted without stopping
+    the rest.
+
+    Coroutine listeners are scheduled on the event loop that emitted the
+    event (or the ``loop`` given here) and don't occupy a worker while they run.
+
+    Listeners running on worker threads must not call the sync Playwright
+    API, which is bound to the thread that started it. Hand that work back
+    to the client's thread, or use the AsyncClient with coroutine listeners.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        queue_size: int = 1024,
+        overflow: OverflowPolicy = "drop_oldest",
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive.")
+        if overflow not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wawebpy-dispatch")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._loop = loop
+        self._queues: Dict[str, _EventQueue] = {}
+        self._queues_lock = Lock()
+
+    def submit(self, event_name: str, callbacks: List[Callable[..., Any]], *args: Any, **kwargs: Any) -> bool:
+        """
+        Queues one event for ``callbacks``.
+
+        Returns:
+            bool: False if the event was dropped by the overflow policy.
+        """
+        if not callbacks:
+            return True
+
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        queue = self._queue(event_name)
+        with queue.cond:
+            if len(queue.items) >= self._queue_size:
+                if self._overflow == "drop_newest":
+                    queue.dropped += 1
+                    logger.warning(f"Dropped '{event_name}' event: queue is full.")
+                    return False
+                if self._overflow == "drop_oldest":
+                    queue.items.popleft()
+                    queue.dropped += 1
+                    logger.warning(f"Dropped oldest '{event_name}' event: queue is full.")
+                else:
+                    while len(queue.items) >= self._queue_size:
+                        queue.cond.wait()
+            queue.items.append((list(callbacks), args, kwargs, time.monotonic()))
+
+        self._executor.submit(self._drain_one, event_name, queue)
+        return True
+
+    def metrics(self) -> Dict[str, EventMetrics]:
+        """Returns the dispatch metrics of every event name seen so far."""
+        with self._queues_lock:
+            queues = dict(self._queues)
+
+        metrics: Dict[str, EventMetrics] = {}
+        for event_name, queue in queues.items():
+            with queue.cond:
+                metrics[event_name] = EventMetrics(
+                    queue_depth=len(queue.items),
+                    dispatched=queue.dispatched,
+                    dropped=queue.dropped,
+                    failed=queue.failed,
+                    avg_wait=queue.total_wait / queue.dispatched if queue.dispatched else 0.0,
+                    avg_latency=queue.total_latency / queue.invocations if queue.invocations else 0.0,
+                    max_latency=queue.max_latency,
+                )
+        return metrics
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker pool, running the queued events first if ``wait`` is True."""
+        self._executor.shutdown(wait=wait)
+
+    def _queue(self, event_name: str) -> _EventQueue:
+        with self._queues_lock:
+            return self._queues.setdefault(event_name, _EventQueue())
+
+    def _drain_one(self, event_name: str, queue: _EventQueue) -> None:
+        with queue.cond:
+            if not queue.items:
+                # The event this task was submitted for was dropped by drop_oldest.
+                return
+            callbacks, args, kwargs, enqueued_at = queue.items.popleft()
+            queue.dispatched += 1
+            queue.total_wait += time.monotonic() - enqueued_at
+            queue.cond.notify()
+
+        for callback in callbacks:
+            self._invoke(event_name, queue, callback, args, kwargs)
+
+    def _invoke(self, event_name: str, queue: _EventQueue, callback: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        started_at = time.monotonic()
+        try:
+            result = callback(*args, **kwargs)
+            if inspect.isawaitable(result):
+                self._run_coroutine(event_name, queue, result, started_at)
+                return
+        except Exception as e:
+            logger.exception(f"Error in '{event_name}' callback: {e}")
+            queue.record(time.monotonic() - started_at, failed=True)
+            return
+        queue.record(time.monotonic() - started_at, failed=False)
+
+    def _run_coroutine(self, event_name: str, queue: _EventQueue, awaitable: Any, started_at: float) -> None:
+        if self._loop is None or self._loop.is_closed():
+            try:
+                asyncio.run(awaitable)
+                queue.record(time.monotonic() - started_at, failed=False)
+            except Exception as e:
+                logger.exception(f"Error in async '{event_name}' callback: {e}")
+                queue.record(time.monotonic() - started_at, failed=True)
+            return
+
+        future = asyncio.run_coroutine_threadsafe(awaitable, self._loop)
+
+        def _done(future) -> None:
+            failed = future.cancelled() or future.exception() is not None
+            if failed and not future.cancelled():
+                logger.error(f"Error in async '{event_name}' callback: {future.exception()!r}")
+            queue.record(time.monotonic() - started_at, failed=failed)
+
+        future.add_done_callback(_done)
+
+
+__all__ = ["Dispatcher", "EventMetrics", "OverflowPolicy"]
@@ -0,0 +1,177 @@
+from ..logger import logger
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Dict, Iterable, Literal, Optional, Tuple, TypedDict
+import time
+
+EntityKind = Literal["contact", "group", "group_metadata", "common_groups"]
+
+
+class CacheStats(TypedDict):
+    """
+    Counters describing the cache usage.
+
+    Attributes:
+        hits: Number of cache hits per entity kind
+        misses: Number of cache misses (including expired entries) per entity kind
+        evictions: Number of entries dropped to stay within the size bound
+        expirations: Number of entries dropped because their TTL elapsed
+        invalidations: Number of entries dropped through the invalidation hooks
+        size: Current number of entries
+    """
+    hits: Dict[str, int]
+    misses: Dict[str, int]
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+
+class BaseEntityCache(ABC):
+    """
+    Base class for entity caches.
+
+    Entries are keyed by entity kind and serialized JID. Subclasses decide
+    on storage, expiry and eviction.
+    """
+
+    @abstractmethod
+    def get(self, kind: EntityKind, jid: str) -> Optional[Any]:
+        """Returns the cached entity, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def peek(self, kind: EntityKind, jid: str) -> Optional[Any]:
+        """Returns the cached entity without touching the counters or the LRU order."""
+        pass
+
+    @abstractmethod
+    def put(self, kind: EntityKind, jid: str, value: Any) -> None:
+        """Stores an entity."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, jid: str, kinds: Iterable[EntityKind] = None) -> None:
+        """Drops the entries of ``jid``, for every kind unless ``kinds`` is given."""
+        pass
+
+    @abstractmethod
+    def invalidate_kind(self, kind: EntityKind) -> None:
+        """Drops every entry of the given kind."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drops every entry."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Returns the usage counters."""
+        pass
+
+
+class EntityCache(BaseEntityCache):
+    """
+    Size-bounded in-memory cache with per-kind TTLs and LRU eviction.
+
+    Safe to share between threads.
+    """
+
+    DEFAULT_TTLS: Dict[EntityKind, float] = {
+        "contact": 300.0,
+        "group": 300.0,
+        "group_metadata": 60.0,
+        "common_groups": 60.0,
+    }
+
+    def __init__(self, max_size: int = 4096, ttls: Dict[EntityKind, float] = None):
+        """
+        Args:
+            max_size: Maximum number of entries across every kind.
+            ttls: Time-to-live in seconds per kind, merged over DEFAULT_TTLS.
+                A TTL of None keeps entries until they are evicted or invalidated.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+
+        self._max_size = max_size
+        self._ttls: Dict[str, Optional[float]] = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = RLock()
+
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, kind: EntityKind, jid: str) -> Optional[Any]:
+        key = (kind, jid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses[kind] = self._misses.get(kind, 0) + 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits[kind] = self._hits.get(kind, 0) + 1
+            return entry[0]
+
+    def peek(self, kind: EntityKind, jid: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((kind, jid))
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return None
+            return entry[0]
+
+    def put(self, kind: EntityKind, jid: str, value: Any) -> None:
+        ttl = self._ttls.get(kind)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[(kind, jid)] = (value, expires_at)
+            self._entries.move_to_end((kind, jid))
+            while len(self._entries) > self._max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._evictions += 1
+                logger.debug(f"Evicted {evicted[0]} {evicted[1]} from the entity cache.")
+
+    def invalidate(self, jid: str, kinds: Iterable[EntityKind] = None) -> None:
+        with self._lock:
+            for kind in (kinds if kinds is not None else self._ttls):
+                if self._entries.pop((kind, jid), None) is not None:
+                    self._invalidations += 1
+
+    def invalidate_kind(self, kind: EntityKind) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == kind]:
+                del self._entries[key]
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=dict(self._hits),
+                misses=dict(self._misses),
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["BaseEntityCache", "EntityCache", "EntityKind", "CacheStats"]
@@ -1,13 +1,33 @@
 from ..logger import logger
-from typing import Callable, Dict, List, Any
+from .dispatcher import Dispatcher
+from threading import Lock
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set
+import asyncio
+import inspect
 
 class EventEmitter:
     """
     Simple event emitter class to register, emit, and remove events.
+
+    Callbacks run inline on the emitting thread by default. With a
+    Dispatcher set, they are queued and run on its worker pool instead, so
+    a slow callback doesn't hold up the page.
     """
 
-    def __init__(self):
+    def __init__(self, dispatcher: Optional[Dispatcher] = None):
         self.events: Dict[str, List[Callable[..., None]]] = {}
+        self.batch_events: Dict[str, List[Callable[[List[Any]], None]]] = {}
+        self._dispatcher: Optional[Dispatcher] = dispatcher
+        # The loop only keeps weak references to tasks.
+        self._tasks: Set["asyncio.Future"] = set()
+
+    @property
+    def dispatcher(self) -> Optional[Dispatcher]:
+        return self._dispatcher
+
+    def set_dispatcher(self, dispatcher: Optional[Dispatcher]) -> None:
+        """Run callbacks on ``dispatcher``, or inline again if None."""
+        self._dispatcher = dispatcher
 
     def on(self, event_name: str, callback: Callable[..., None]) -> None:
         """Register a callback for an event."""
@@ -15,10 +35,18 @@ class EventEmitter:
 
     def once(self, event_name: str, callback: Callable[..., None]) -> None:
         """Register a callback that will be called only once."""
+        fired = False
+        lock = Lock()
 
+        # With a Dispatcher, two quick emits may both queue the wrapper before it runs.
         def wrapper(*args, **kwargs):
+            nonlocal fired
+            with lock:
+                if fired:
+                    return None
+                fired = True
             self.off(event_name, wrapper)
-            callback(*args, **kwargs)
+            return callback(*args, **kwargs)
 
         self.on(event_name, wrapper)
 
@@ -31,11 +59,81 @@ class EventEmitter:
             if not self.events[event_name]:
                 self.events.pop(event_name, None)
 
+    def on_batch(self, event_name: str, callback: Callable[[List[Any]], None]) -> None:
+        """Register a callback that receives events delivered in batches as one list."""
+        self.batch_events.setdefault(event_name, []).append(callback)
+
+    def off_batch(self, event_name: str, callback: Callable[[List[Any]], None]) -> None:
+        """Remove a specific batch callback for an event."""
+        if event_name in self.batch_events:
+            self.batch_events[event_name] = [
+                cb for cb in self.batch_events[event_name] if cb != callback
+            ]
+            if not self.batch_events[event_name]:
+                self.batch_events.pop(event_name, None)
+
+    def emit_batch(self, event_name: str, items: List[Any]) -> None:
+        """
+        Emit a batch of events.
+
+        Batch callbacks are invoked once with the whole list; regular
+        callbacks are invoked once per item.
+        """
+        if not items:
+            return
+        if self._dispatcher is not None:
+            self._dispatcher.submit(event_name, self.batch_events.get(event_name, []), items)
+            callbacks = self.events.get(event_name, [])
+            for item in items:
+                self._dispatcher.submit(event_name, callbacks, item)
+            return
+
+        for callback in self.batch_events.get(event_name, []):
+            try:
+                result = callback(items)
+            except Exception as e:
+                logger.exception(f"Error in '{event_name}' batch callback: {e}")
+                raise RuntimeError(f"An error occurred on a '{event_name}' batch callback.") from e
+            if inspect.isawaitable(result):
+                self._schedule(event_name, result)
+
+        if event_name in self.events:
+            for item in items:
+                self.emit(event_name, item)
+
     def emit(self, event_name: str, *args: Any, **kwargs: Any) -> None:
         """Emit an event, invoking all registered callbacks."""
+        if self._dispatcher is not None:
+            self._dispatcher.submit(event_name, self.events.get(event_name, []), *args, **kwargs)
+            return
+
         for callback in self.events.get(event_name, []):
             try:
-                callback(*args, **kwargs)
+                result = callback(*args, **kwargs)
             except Exception as e:
                 logger.exception(f"Error in '{event_name}' callback: {e}")
                 raise RuntimeError(f"An error occurred on a '{event_name}' callback.") from e
+            if inspect.isawaitable(result):
+                self._schedule(event_name, result)
+
+    def _schedule(self, event_name: str, awaitable: Awaitable[Any]) -> None:
+        """Runs a coroutine returned by an async callback as a task on the running loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            logger.error(f"Async '{event_name}' callback emitted without a running event loop.")
+            raise RuntimeError(
+                f"A '{event_name}' callback returned an awaitable, but no event loop is running on this thread. "
+                f"Use the AsyncClient for async callbacks, or a Dispatcher, which runs them on a loop of its own."
+            ) from None
+        task = asyncio.ensure_future(awaitable, loop=loop)
+        self._tasks.add(task)
+
+        def _done(task: "asyncio.Future") -> None:
+            self._tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Error in async '{event_name}' callback: {task.exception()!r}")
+
+        task.add_done_callback(_done)
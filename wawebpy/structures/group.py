@@ -1,12 +1,14 @@
 from __future__ import annotations
-from typing import TypedDict, List, Optional, Any
+from typing import TypedDict, Dict, Iterator, List, Tuple, Optional, Any, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .entitycache import BaseEntityCache
 
 from ..exceptions import GroupNotFound, FetchGroupMetadataError
 from ..logger import logger
 from playwright.sync_api import Page
-from ..util import get_contact_script, get_module_script
-from .contact import Contact
-from .chat import Chat, ChatKwargs
+from ..bundle import call_bundle
+from .contact import BaseContact, Contact, ContactKwargs
+from .chat import BaseChat, Chat, ChatKwargs
 
 
 class GroupIDType(TypedDict, total=True):
@@ -62,6 +64,43 @@ class GroupMetadata(TypedDict, total=False):
     trusted: Optional[bool]
 
 
+class GroupParticipantKwargs(ContactKwargs, total=True):
+    isAdmin: bool
+    isSuperAdmin: bool
+
+
+class BaseGroupParticipant(BaseContact):
+    """A group member: a contact with the admin flags from the group metadata."""
+
+    def __init__(self, page: Page, **kwargs: GroupParticipantKwargs):
+        super().__init__(page, **kwargs)
+
+        self._is_admin: bool = kwargs["isAdmin"]
+        self._is_super_admin: bool = kwargs["isSuperAdmin"]
+
+    @property
+    def is_admin(self) -> bool:
+        return self._is_admin
+
+    @property
+    def is_super_admin(self) -> bool:
+        return self._is_super_admin
+
+    def to_dict(self) -> GroupParticipantKwargs:
+        return GroupParticipantKwargs(
+            **super().to_dict(),
+            isAdmin=self._is_admin,
+            isSuperAdmin=self._is_super_admin,
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.short_name}, {self.phone_number}, admin={self.is_admin})"
+
+
+class GroupParticipant(BaseGroupParticipant, Contact):
+    """A group member bound to a sync page."""
+
+
 class GroupKwargs(ChatKwargs, total=True):
     mentionName: str
     
@@ -70,7 +109,12 @@ class GroupKwargs(ChatKwargs, total=True):
     isContact: bool
 
 
-class Group(Chat):
+class BaseGroup(BaseChat):
+    """
+    Attributes of a WhatsApp group, shared by :class:`Group` and the
+    awaitable ``AsyncGroup``.
+    """
+
     _attribute_map = {
         # Attributes
         "getMentionName": "mentionName",
@@ -83,6 +127,7 @@ class Group(Chat):
 
     def __init__(self, page: Page, **kwargs: GroupKwargs):
         self._page: Page = page
+        self._cache: Optional[BaseEntityCache] = None
 
         # Identifiers
         self._id: GroupIDType = kwargs["id"]
@@ -97,54 +142,187 @@ class Group(Chat):
 
         logger.debug(f"Initialized Group({self._name}, {self._id['_serialized']})")
 
+    @classmethod
+    def _getter_map(cls) -> Dict[str, Dict[str, str]]:
+        return {**BaseChat._getter_map(), "WAWebContactGetters": BaseGroup._attribute_map}
+
+    def to_dict(self) -> GroupKwargs:
+        return GroupKwargs(
+            id=self._id,
+            name=self._name,
+            mentionName=self._mention_name,
+            isGroup=self._is_group,
+            isMe=self._is_me,
+            isBot=self._is_bot,
+            isContact=self._is_contact,
+        )
+
+    def _valid_participant_objects(self, metadata: GroupMetadata) -> List[GroupParticipantObject]:
+        participant_objects = []
+        for obj in metadata.get("participants", []):
+            _id = obj.get("id")
+            if not _id:
+                logger.warning(f"Skipping participant with missing id in group {self.jid}")
+                continue
+            if not _id.get("_serialized"):
+                logger.warning(f"Skipping participant with missing jid in group {self.jid}")
+                continue
+            participant_objects.append(obj)
+        return participant_objects
+
+    def _build_participants(
+        self,
+        participant_cls: type,
+        participant_objects: List[GroupParticipantObject],
+        results: Dict[str, Dict[str, Any]],
+        errors: Dict[str, str],
+    ) -> List[BaseGroupParticipant]:
+        """Merges batched attributes with the admin flags of the participant objects."""
+        participants: List[BaseGroupParticipant] = []
+        for obj in participant_objects:
+            _jid = obj["id"]["_serialized"]
+            if _jid not in results:
+                logger.warning(f"Failed to fetch participant {_jid} in group {self.jid}: {errors.get(_jid)}")
+                continue
+            attrs = {
+                **results[_jid],
+                "isAdmin": obj.get("isAdmin", False),
+                "isSuperAdmin": obj.get("isSuperAdmin", False),
+            }
+            try:
+                participants.append(participant_cls._from_attributes(self.page, attrs))
+            except Exception as e:
+                logger.warning(f"Failed to fetch participant {_jid} in group {self.jid}: {e}")
+        return participants
+
+    @property
+    def mention_name(self) -> str:
+        return self._mention_name
+    
+    @property
+    def is_me(self) -> bool:
+        return self._is_me
+
+    @property
+    def is_bot(self) -> bool:
+        return self._is_bot
+
+    @property
+    def is_contact(self) -> bool:
+        return self._is_contact
+
+    def __str__(self):
+        return f"{type(self).__name__}({self._name}, {self.jid})"
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._name}, {self.jid})"
+
+
+class Group(BaseGroup, Chat):
+    """A WhatsApp group bound to a sync page."""
+
     @staticmethod
-    def get(page: Page, jid: str) -> Group:
+    def get(page: Page, jid: str, cache: BaseEntityCache = None, refresh: bool = False) -> Group:
+        """
+        Fetches a group.
+
+        Args:
+            page: The WhatsApp Web page.
+            jid: Serialized JID of the group.
+            cache: Optional entity cache to read from and populate.
+            refresh: Bypass the cache lookup and store a freshly fetched group.
+        """
         logger.debug(f"Fetching group {jid}")
-        attrs = {}
-        group_script = get_contact_script(jid)
+        if cache is not None and not refresh:
+            cached = cache.get("group", jid)
+            if cached is not None:
+                logger.debug(f"Group {jid} served from cache")
+                return cached
+
         try:
-            for func_name, attr_name in Chat._attribute_map.items():
-                script = get_module_script(
-                    module="WAWebChatGetters",
-                    function=func_name,
-                    args=(group_script,),
-                )
-                attrs[attr_name] = page.evaluate(script)
-
-            for func_name, attr_name in Group._attribute_map.items():
-                script = get_module_script(
-                    module="WAWebContactGetters",
-                    function=func_name,
-                    args=(group_script,),
-                )
-                attrs[attr_name] = page.evaluate(script)
+            results, errors = Group._fetch_attributes(page, [jid])
+            if jid in errors:
+                raise GroupNotFound(f"Group {jid} not found: {errors[jid]}")
 
             logger.info(f"Successfully fetched group {jid}")
-            return Group(page, **attrs)
+            group = Group(page, **results[jid])
+            group._remember("group", cache, jid)
+            return group
         except Exception as e:
             logger.error(f"Failed to fetch group {jid}: {e}")
             raise GroupNotFound(f"An error occurred while trying to get Group {jid}") from e
 
+    @staticmethod
+    def get_many(
+        page: Page, jids: List[str], cache: BaseEntityCache = None
+    ) -> Tuple[Dict[str, Group], Dict[str, Exception]]:
+        """
+        Fetches several groups in a single round-trip.
+
+        Args:
+            page: The WhatsApp Web page.
+            jids: Serialized JIDs of the groups.
+            cache: Optional entity cache; only the misses are fetched from the page.
+
+        Returns:
+            A ``(groups, errors)`` tuple. Both are keyed by the requested JID;
+            JIDs that couldn't be resolved are mapped to their exception in ``errors``.
+        """
+        jids = list(dict.fromkeys(jids))
+        logger.debug(f"Fetching {len(jids)} groups")
+
+        groups: Dict[str, Group] = {}
+        if cache is not None:
+            for jid in jids:
+                cached = cache.get("group", jid)
+                if cached is not None:
+                    groups[jid] = cached
+        missing = [jid for jid in jids if jid not in groups]
+
+        try:
+            results, misses = Group._fetch_attributes(page, missing) if missing else ({}, {})
+        except Exception as e:
+            logger.error(f"Failed to fetch {len(missing)} groups: {e}")
+            raise GroupNotFound(f"An error occurred while trying to get {len(missing)} groups") from e
+
+        errors: Dict[str, Exception] = {
+            jid: GroupNotFound(f"Group {jid} not found: {reason}") for jid, reason in misses.items()
+        }
+        for jid, attrs in results.items():
+            try:
+                groups[jid] = Group(page, **attrs)
+                groups[jid]._remember("group", cache, jid)
+            except Exception as e:
+                errors[jid] = GroupNotFound(f"Group {jid} has incomplete attributes: {e}")
+
+        logger.info(f"Fetched {len(groups)}/{len(jids)} groups")
+        return groups, errors
+
     def resync(self) -> None:
         logger.debug(f"Resyncing group {self.jid}")
         try:
-            new_group = Group.get(self.page, self.jid)
+            new_group = Group.get(self.page, self.jid, cache=self._cache, refresh=True)
             self.__dict__.update(new_group.__dict__)
+            if self._cache is not None:
+                self._cache.invalidate(self.jid, ["group_metadata"])
             logger.info(f"Resynced group {self.jid}")
         except Exception as e:
             logger.error(f"Failed to resync group {self.jid}: {e}")
             raise e
 
-    def get_metadata(self) -> GroupMetadata:
+    def get_metadata(self, refresh: bool = False) -> GroupMetadata:
         logger.debug(f"Fetching metadata for group {self.jid}")
-        script = get_module_script(
-            module="WAWebGroupQueryJob",
-            function="queryGroupsById",
-            args=("["+self._js_variable_repr('id')+"['_serialized']]",)
-        )
+        if self._cache is not None and not refresh:
+            cached = self._cache.get("group_metadata", self.jid)
+            if cached is not None:
+                logger.debug(f"Metadata for group {self.jid} served from cache")
+                return cached
+
         try:
-            metadata = self.page.evaluate(script)[0]
+            metadata = call_bundle(self.page, "queryGroupMetadata", self.jid)[0]
             logger.info(f"Fetched metadata for group {self.jid}")
+            if self._cache is not None:
+                self._cache.put("group_metadata", self.jid, metadata)
             return metadata
         except Exception as e:
             logger.error(f"Error fetching metadata for group {self.jid}: {e}")
@@ -152,28 +330,11 @@ class Group(Chat):
                 f"Failed to fetch Group Metadata for {self.jid}"
             ) from e
 
-    def get_participants(self) -> List[Contact]:
+    def get_participants(self) -> List[GroupParticipant]:
         logger.debug(f"Fetching participants for group {self.jid}")
-        participants: List[Contact] = []
         try:
-            metadata = self.get_metadata()
-            participant_objects = metadata.get("participants", [])
-            
-            for obj in participant_objects:
-                _id = obj.get("id")
-                if not _id:
-                    logger.warning(f"Skipping participant with missing id in group {self.jid}")
-                    continue
-                _jid = _id.get("_serialized")
-                if not _jid:
-                    logger.warning(f"Skipping participant with missing jid in group {self.jid}")
-                    continue
-                try:
-                    participant = Contact.get(self.page, _jid)
-                    participants.append(participant)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch participant {_jid} in group {self.jid}: {e}")
-                    continue
+            participant_objects = self._get_participant_objects()
+            participants = self._resolve_participants(participant_objects)
 
             logger.info(f"Fetched {len(participants)} participants for group {self.jid}")
             return participants
@@ -183,24 +344,30 @@ class Group(Chat):
                 f"Failed to fetch participants for group {self.jid}"
             ) from e
 
-    @property
-    def mention_name(self) -> str:
-        return self._mention_name
-    
-    @property
-    def is_me(self) -> bool:
-        return self._is_me
+    def iter_participants(self, chunk_size: int = 256) -> Iterator[List[GroupParticipant]]:
+        """
+        Yields the group participants in chunks of at most ``chunk_size``.
 
-    @property
-    def is_bot(self) -> bool:
-        return self._is_bot
+        Each chunk is resolved with a single round-trip, so only one chunk
+        of Contact objects is held in memory at a time.
+        """
+        logger.debug(f"Streaming participants for group {self.jid} in chunks of {chunk_size}")
+        try:
+            participant_objects = self._get_participant_objects()
+        except Exception as e:
+            logger.error(f"Error fetching participants for group {self.jid}: {e}")
+            raise FetchGroupMetadataError(
+                f"Failed to fetch participants for group {self.jid}"
+            ) from e
 
-    @property
-    def is_contact(self) -> bool:
-        return self._is_contact
+        for i in range(0, len(participant_objects), chunk_size):
+            yield self._resolve_participants(participant_objects[i:i + chunk_size])
 
-    def __str__(self):
-        return f"Group({self._name}, {self.jid})"
+    def _get_participant_objects(self) -> List[GroupParticipantObject]:
+        return self._valid_participant_objects(self.get_metadata())
 
-    def __repr__(self):
-        return f"Group({self._name}, {self.jid})"
+    def _resolve_participants(self, participant_objects: List[GroupParticipantObject]) -> List[GroupParticipant]:
+        """Builds the participants of ``participant_objects`` from one batched evaluate."""
+        jids = [obj["id"]["_serialized"] for obj in participant_objects]
+        results, errors = GroupParticipant._fetch_attributes(self.page, jids)
+        return self._build_participants(GroupParticipant, participant_objects, results, errors)
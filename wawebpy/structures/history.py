@@ -0,0 +1,102 @@
+from ..bundle import call_bundle
+from ..logger import logger
+from .message import MessagePayload
+from playwright.sync_api import Page
+from typing import IO, Iterable, Iterator, List, Optional, TypedDict
+import bz2
+import gzip
+import json
+import lzma
+
+
+class HistoryChunk(TypedDict):
+    """
+    One page of a chat's history, newest message first.
+
+    Attributes:
+        messages: The messages of the chunk
+        cursor: Id of the oldest message so far; pass it as ``before`` to resume after this chunk
+        done: Whether the chunk reaches the start of the chat
+    """
+    messages: List[MessagePayload]
+    cursor: Optional[str]
+    done: bool
+
+
+def iter_history(page: Page, chat_id: str, chunk_size: int = 100, before: Optional[str] = None) -> Iterator[HistoryChunk]:
+    """
+    Pages backwards through the history of ``chat_id``.
+
+    Every chunk is serialized in the page and only one is held in Python
+    at a time. Earlier messages are loaded from WhatsApp as the iteration
+    reaches them, and dropped from the page's chat again once exported,
+    so the page doesn't accumulate the history either. Messages that were
+    loaded before the iteration began stay.
+
+    Args:
+        page: The WhatsApp Web page
+        chat_id: JID of the chat
+        chunk_size: Number of messages per chunk
+        before: Cursor of a previous chunk to resume from; starts at the newest message when omitted
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    while True:
+        chunk: HistoryChunk = call_bundle(page, "loadHistory", chat_id, before, chunk_size)
+        logger.debug(f"Loaded {len(chunk['messages'])} messages of {chat_id} before {before}")
+        if chunk["messages"]:
+            yield chunk
+        if chunk["done"] or not chunk["messages"]:
+            return
+        before = chunk["cursor"]
+
+
+def open_sink(path: str, append: bool = False) -> IO[str]:
+    """
+    Opens a text file for writing, compressed by the extension of ``path``:
+    ``.gz``, ``.bz2`` and ``.xz`` are supported. Appending to a compressed file
+    adds a new stream, which all three formats read back transparently.
+    """
+    mode = "at" if append else "wt"
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    if path.endswith(".bz2"):
+        return bz2.open(path, mode, encoding="utf-8")
+    if path.endswith(".xz"):
+        return lzma.open(path, mode, encoding="utf-8")
+    return open(path, mode[0], encoding="utf-8")
+
+
+class JsonlSink:
+    """
+    Writes messages as JSON lines, optionally compressed (see :func:`open_sink`).
+
+    Example:
+        with JsonlSink("chat.jsonl.gz") as sink:
+            for chunk in client.iter_history("123@c.us"):
+                sink.write(chunk["messages"])
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.written = 0
+        self._file = open_sink(path, append=append)
+
+    def write(self, messages: Iterable[MessagePayload]) -> None:
+        for message in messages:
+            self._file.write(json.dumps(message, ensure_ascii=False, separators=(",", ":")))
+            self._file.write("\n")
+            self.written += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["HistoryChunk", "iter_history", "open_sink", "JsonlSink"]
@@ -0,0 +1,129 @@
+from ..logger import logger
+from typing import Any, Dict, List, Optional, TypedDict
+import re
+
+
+class LaunchProfile(TypedDict, total=False):
+    """
+    How the browser of a session is launched and what its pages may load.
+
+    Attributes:
+        args: Extra Chromium command line flags
+        block_images: Abort UI images (icons, illustrations, emoji sheets)
+        block_fonts: Abort web fonts; the system fonts are used instead
+        block_media: Abort stickers, media previews and other media the page displays.
+            Media downloads made by the library itself are not affected.
+        block_avatars: Abort profile pictures. Their URLs can still be fetched on request.
+        block_urls: Further URL globs or regular expressions to abort
+        renderer_process_limit: Maximum number of renderer processes of the browser
+        process_per_site: Share one renderer process between all pages of a site
+
+    Packing sessions into fewer renderers is opt-in and not part of
+    LEAN_PROFILE. With ``renderer_process_limit`` and the
+    ``--disable-site-isolation-trials`` flag, the pages of a shared browser
+    run in one renderer process: they save memory, but a crash or hang of
+    that process takes down every session in it, and the sessions are no
+    longer isolated from each other::
+
+        profile = {**LEAN_PROFILE, "args": LEAN_ARGS + ["--disable-site-isolation-trials"], "renderer_process_limit": 1}
+    """
+    args: List[str]
+    block_images: bool
+    block_fonts: bool
+    block_media: bool
+    block_avatars: bool
+    block_urls: List[Any]
+    renderer_process_limit: int
+    process_per_site: bool
+
+
+# Flags that turn off browser services a headless WhatsApp session never uses.
+LEAN_ARGS: List[str] = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# Blocks everything WhatsApp Web only displays. Sessions keep their own renderer processes.
+LEAN_PROFILE: LaunchProfile = {
+    "args": LEAN_ARGS,
+    "block_images": True,
+    "block_fonts": True,
+    "block_media": True,
+    "block_avatars": True,
+}
+
+IMAGE_PATTERN = re.compile(r"^https?://[^?#]+\.(?:png|jpe?g|gif|webp|svg|ico)(?:[?#].*)?$", re.IGNORECASE)
+FONT_PATTERN = re.compile(r"^https?://[^?#]+\.(?:woff2?|ttf|otf|eot)(?:[?#].*)?$", re.IGNORECASE)
+MEDIA_PATTERN = "https://mmg.whatsapp.net/**"
+AVATAR_PATTERN = "https://pps.whatsapp.net/**"
+
+# Resource types the page requests for display. The media host also serves
+# the fetches of media downloads, which must go through.
+_DISPLAY_TYPES = ("image", "media")
+
+
+def launch_options(client_options) -> Dict[str, Any]:
+    """Builds the keyword arguments of ``chromium.launch`` for the ``launch_profile`` option."""
+    profile: LaunchProfile = client_options.get("launch_profile") or {}
+    args = list(profile.get("args", []))
+    if profile.get("renderer_process_limit"):
+        args.append(f"--renderer-process-limit={profile['renderer_process_limit']}")
+    if profile.get("process_per_site"):
+        args.append("--process-per-site")
+    return {"headless": client_options.get("headless"), "args": args}
+
+
+def _abort(route) -> Any:
+    return route.abort("blockedbyclient")
+
+
+def _abort_display(route) -> Any:
+    if route.request.resource_type in _DISPLAY_TYPES:
+        return route.abort("blockedbyclient")
+    return route.fallback()
+
+
+def _routes(profile: Optional[LaunchProfile]) -> List[tuple]:
+    """The (pattern, handler) pairs of ``profile``. Only listed URLs reach Python."""
+    profile = profile or {}
+    routes = []
+    if profile.get("block_images"):
+        routes.append((IMAGE_PATTERN, _abort))
+    if profile.get("block_fonts"):
+        routes.append((FONT_PATTERN, _abort))
+    if profile.get("block_media"):
+        routes.append((MEDIA_PATTERN, _abort_display))
+    if profile.get("block_avatars"):
+        routes.append((AVATAR_PATTERN, _abort_display))
+    for pattern in profile.get("block_urls", []):
+        routes.append((pattern, _abort))
+    return routes
+
+
+def apply_routes(page, client_options) -> None:
+    """Installs the request blocking of the ``launch_profile`` option on ``page``."""
+    routes = _routes(client_options.get("launch_profile"))
+    for pattern, handler in routes:
+        page.route(pattern, handler)
+    if routes:
+        logger.debug(f"Blocking {len(routes)} resource patterns.")
+
+
+async def apply_routes_async(page, client_options) -> None:
+    """Awaitable counterpart of :func:`apply_routes`."""
+    routes = _routes(client_options.get("launch_profile"))
+    for pattern, handler in routes:
+        await page.route(pattern, handler)
+    if routes:
+        logger.debug(f"Blocking {len(routes)} resource patterns.")
+
+
+__all__ = ["LaunchProfile", "LEAN_ARGS", "LEAN_PROFILE", "launch_options", "apply_routes", "apply_routes_async"]
@@ -0,0 +1,156 @@
+from ..logger import logger
+from .qr import QrCode
+from playwright.sync_api import Page
+from typing import Any, Dict, Literal, TypedDict, TYPE_CHECKING
+import json
+if TYPE_CHECKING:
+    from ..client import BaseClient
+
+
+class LoginState(TypedDict, total=False):
+    """
+    Outcome of :meth:`LoginWatcher.wait`.
+
+    Attributes:
+        state: "qr" when a login is needed, "ready" when the session is connected,
+            "timeout" when the page showed neither in time
+        qr: Raw QR data, for the "qr" state
+    """
+    state: Literal["qr", "ready", "timeout"]
+    qr: str
+
+
+class LoginWatcher:
+    """
+    Pushes the login state of WhatsApp Web to Python as it changes.
+
+    An in-page MutationObserver notices every new QR ``data-ref`` and the
+    moment the session becomes ready, so nothing is polled. New QR codes
+    reach Python through a page binding and are emitted as ``qr`` events
+    right away. :meth:`wait` blocks on an in-page promise that settles on
+    the next decisive change.
+
+    The watcher is installed as an init script, so it follows the page
+    across reloads. Attach it before the first navigation.
+    """
+
+    BINDING_NAME = "__wawebpyOnLoginQr"
+
+    def __init__(self, client: "BaseClient", client_options):
+        self._client = client
+        self._qr_selector = client_options.get("qr_data_selector")
+        self._loaded_selector = client_options.get("loaded_selector")
+        self._page: Page = None
+        self.qr_count = 0
+
+    def attach(self, page: Page) -> None:
+        """Exposes the binding on ``page`` and installs the in-page watcher."""
+        logger.debug("Attaching login watcher.")
+        self._page = page
+        page.expose_binding(self.BINDING_NAME, self._on_qr)
+        page.add_init_script(self._script())
+
+    async def attach_async(self, page) -> None:
+        """Awaitable counterpart of :meth:`attach` for ``playwright.async_api`` pages."""
+        logger.debug("Attaching login watcher.")
+        self._page = page
+        await page.expose_binding(self.BINDING_NAME, self._on_qr)
+        await page.add_init_script(self._script())
+
+    def wait(self, timeout: int, stop_on_qr: bool = False) -> LoginState:
+        """
+        Blocks until the session is ready, or until no new QR code showed up for ``timeout`` milliseconds.
+
+        Args:
+            timeout: Milliseconds without any change before giving up
+            stop_on_qr: Also return on the first QR code instead of waiting for a login
+
+        Raises:
+            playwright Error: If a navigation replaced the document while waiting
+        """
+        return self._page.evaluate(self._wait_script(), [timeout, stop_on_qr])
+
+    async def wait_async(self, timeout: int, stop_on_qr: bool = False) -> LoginState:
+        """Awaitable counterpart of :meth:`wait`."""
+        return await self._page.evaluate(self._wait_script(), [timeout, stop_on_qr])
+
+    def _on_qr(self, source: Dict[str, Any], data: str) -> None:
+        self.qr_count += 1
+        logger.info("Emitting new QR code.")
+        self._client.emit("qr", QrCode(data))
+
+    def _wait_script(self) -> str:
+        # Installs the watcher first in case the document predates the init script.
+        return f"""([timeout, stopOnQr]) => {{
+    {self._script()};
+    return window.__wawebpyLogin.wait(timeout, stopOnQr);
+}}"""
+
+    def _script(self) -> str:
+        return f"""(() => {{
+    if (window.__wawebpyLogin) return;
+
+    const qrSelector = {json.dumps(self._qr_selector)};
+    const loadedSelector = {json.dumps(self._loaded_selector)};
+    const waiters = new Set();
+    let lastQr = null;
+    let ready = false;
+
+    const notify = (state) => {{
+        for (const waiter of [...waiters]) waiter(state);
+    }};
+    // A connected and synced socket means the session is usable. The loaded
+    // selector is a fallback for builds where the socket model moved.
+    const isReady = () => {{
+        try {{
+            const socket = require("WAWebSocketModel").Socket;
+            if (socket.state === "CONNECTED" && socket.hasSynced) return true;
+        }} catch (e) {{}}
+        return Boolean(document.querySelector(loadedSelector));
+    }};
+    const check = () => {{
+        if (ready) return;
+        const qr = document.querySelector(qrSelector);
+        const data = qr && qr.getAttribute("data-ref");
+        if (data) {{
+            if (data === lastQr) return;
+            lastQr = data;
+            window.{self.BINDING_NAME}(data);
+            notify({{ state: "qr", qr: data }});
+        }} else if (isReady()) {{
+            ready = true;
+            observer.disconnect();
+            notify({{ state: "ready" }});
+        }}
+    }};
+    // Mutations are delivered in batches, so this runs at most once per task.
+    const observer = new MutationObserver(check);
+    observer.observe(document, {{ subtree: true, childList: true, attributes: true, attributeFilter: ["data-ref"] }});
+
+    window.__wawebpyLogin = {{
+        wait(timeout, stopOnQr) {{
+            if (ready) return Promise.resolve({{ state: "ready" }});
+            if (stopOnQr && lastQr) return Promise.resolve({{ state: "qr", qr: lastQr }});
+            return new Promise((resolve) => {{
+                let timer = null;
+                const done = (state) => {{
+                    clearTimeout(timer);
+                    waiters.delete(waiter);
+                    resolve(state);
+                }};
+                // Every new QR code restarts the timeout.
+                const arm = () => {{
+                    clearTimeout(timer);
+                    timer = setTimeout(() => done({{ state: "timeout" }}), timeout);
+                }};
+                const waiter = (state) => state.state === "ready" || stopOnQr ? done(state) : arm();
+                waiters.add(waiter);
+                arm();
+            }});
+        }},
+    }};
+    check();
+}})()"""
+
+
+__all__ = ["LoginState", "LoginWatcher"]
@@ -0,0 +1,381 @@
+from ..bundle import MEDIA_DOWNLOAD_PREFIX, MEDIA_ERROR_BINDING, call_bundle
+from ..aio.bundle import call_bundle as call_bundle_async
+from ..exceptions import MediaDownloadError
+from ..logger import logger
+from .mediacache import MediaCache, filehash_key
+from .pagefuture import PageFuture, PagePump
+from playwright.sync_api import Download, Page
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
+import asyncio
+import itertools
+import mimetypes
+import mmap
+import os
+import tempfile
+
+# Where downloaded media goes: a file path, or a binary file-like object opened for writing.
+MediaSink = Union[str, "os.PathLike[str]", BinaryIO]
+
+# Where outgoing media comes from: a file path, or bytes-like data such as a memoryview or an mmap.
+MediaSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, mmap.mmap]
+
+# Bytes sniff_mimetype looks at.
+_HEAD_SIZE = 32
+
+# Leading bytes of common media formats: (offset, signature, mimetype).
+_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"\xff\xfb", "audio/mpeg"),
+    (0, b"\xff\xf3", "audio/mpeg"),
+    (0, b"#!AMR", "audio/amr"),
+    (0, b"\x1a\x45\xdf\xa3", "video/webm"),
+    (0, b"%PDF-", "application/pdf"),
+)
+
+# Brands of ISO media files (``ftyp`` box) that aren't plain MP4 video.
+_FTYP_BRANDS = {
+    b"qt  ": "video/quicktime",
+    b"M4A ": "audio/mp4",
+    b"3gp4": "video/3gpp",
+    b"3gp5": "video/3gpp",
+    b"heic": "image/heic",
+    b"heix": "image/heic",
+    b"mif1": "image/heif",
+}
+
+
+def sniff_mimetype(head: bytes, filename: Optional[str] = None) -> str:
+    """
+    Detects the mimetype of media from its first bytes, without decoding it.
+
+    Containers that many formats share, such as ZIP based office documents,
+    and unknown formats fall back to the extension of ``filename``.
+    """
+    for offset, signature, mimetype in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mimetype
+    if head[:4] == b"RIFF":
+        if head[8:12] == b"WEBP":
+            return "image/webp"
+        if head[8:12] == b"WAVE":
+            return "audio/wav"
+    if head[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(head[8:12], "video/mp4")
+    guessed = mimetypes.guess_type(filename)[0] if filename else None
+    if guessed:
+        return guessed
+    return "application/zip" if head[:4] == b"PK\x03\x04" else "application/octet-stream"
+
+
+class StagedUpload:
+    """
+    Outgoing media as a file on disk, ready to be handed to the page.
+
+    Attributes:
+        path: File the page reads the media from
+        filename: Name the media is sent with
+        mimetype: Mimetype the media is sent with
+        temporary: Whether ``path`` is a spool file, removed by :meth:`cleanup`
+    """
+
+    __slots__ = ("path", "filename", "mimetype", "temporary")
+
+    def __init__(self, path: str, filename: str, mimetype: str, temporary: bool = False):
+        self.path = path
+        self.filename = filename
+        self.mimetype = mimetype
+        self.temporary = temporary
+
+    def cleanup(self) -> None:
+        """Removes the spool file, if there is one."""
+        if self.temporary:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __repr__(self) -> str:
+        return f"StagedUpload({self.path!r}, {self.filename!r}, {self.mimetype!r})"
+
+
+def stage_upload(source: MediaSource, filename: Optional[str] = None, mimetype: Optional[str] = None,
+                 chunk_size: int = 1 << 20) -> StagedUpload:
+    """
+    Prepares ``source`` to be passed to ``set_input_files``.
+
+    Paths are used as they are. Bytes-like data, including memoryviews and
+    mmaps, is spooled to a temporary file in ``chunk_size`` slices of a
+    memoryview, so it is never copied in memory. Only the first bytes are
+    read to detect the mimetype when it isn't given.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        filename = filename or os.path.basename(path)
+        if mimetype is None:
+            with open(path, "rb") as f:
+                mimetype = sniff_mimetype(f.read(_HEAD_SIZE), filename)
+        return StagedUpload(path, filename, mimetype)
+
+    view = memoryview(source).cast("B")
+    mimetype = mimetype or sniff_mimetype(bytes(view[:_HEAD_SIZE]), filename)
+    extension = os.path.splitext(filename)[1] if filename else mimetypes.guess_extension(mimetype) or ""
+    fd, path = tempfile.mkstemp(prefix="wawebpy-upload-", suffix=extension)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for offset in range(0, len(view), chunk_size):
+                f.write(view[offset:offset + chunk_size])
+    except BaseException:
+        os.remove(path)
+        raise
+    logger.debug(f"Spooled {len(view)} bytes of {mimetype} to {path}")
+    return StagedUpload(path, filename or "file" + extension, mimetype, temporary=True)
+
+
+def copy_to_sink(path: str, sink: BinaryIO, chunk_size: int) -> int:
+    """Copies the file at ``path`` into ``sink`` ``chunk_size`` bytes at a time. Returns the bytes copied."""
+    copied = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return copied
+            sink.write(chunk)
+            copied += len(chunk)
+
+
+class MediaDownload(PageFuture):
+    """
+    Future of a media download.
+
+    Resolves with the number of bytes written to ``sink``, or fails with
+    MediaDownloadError.
+
+    Attributes:
+        message_id: Serialized id of the message whose media is downloaded
+        sink: Where the media is written
+    """
+
+    def __init__(self, message_id: str, sink: MediaSink, wait: Optional[PagePump] = None):
+        super().__init__(wait)
+        self.message_id = message_id
+        self.sink = sink
+        self.ref: Optional[int] = None
+        self.key: Optional[str] = None
+
+
+class MediaDownloader:
+    """
+    Downloads decrypted media out of the page without encoding it.
+
+    The page fetches and decrypts the media with WhatsApp's download
+    manager and hands the bytes to the browser as a file download (see
+    ``downloadMedia`` in the bundle). Playwright writes it to disk and it
+    is moved or copied to the sink in ``chunk_size`` pieces, so neither
+    side holds more than ``limit`` media files at once and Python never
+    holds a whole file. Downloads run in parallel up to ``limit``; the
+    rest wait in the page for a free slot. A download that isn't saved
+    within ``timeout`` seconds of getting its slot fails and gives the slot
+    back. With a MediaCache, media whose content was downloaded before is
+    copied from the cache instead, and new downloads are added to it. A
+    reload of WhatsApp Web fails every pending download.
+    """
+
+    BINDING_NAME = MEDIA_ERROR_BINDING
+
+    def __init__(self, limit: int = 2, chunk_size: int = 1 << 20, cache: Optional[MediaCache] = None,
+                 timeout: float = 300.0):
+        if limit < 1 or chunk_size < 1:
+            raise ValueError("limit and chunk_size must be at least 1.")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive.")
+
+        self._limit = limit
+        self._chunk_size = chunk_size
+        self._cache = cache
+        self._timeout = timeout
+        self._page: Page = None
+        self._pump: Optional[PagePump] = None
+        self._refs = itertools.count()
+        self._pending: Dict[int, MediaDownload] = {}
+
+    def attach(self, page: Page) -> None:
+        """Exposes the error binding on ``page`` and takes over its downloads."""
+        self._page = page
+        self._pump = PagePump(page)
+        page.expose_binding(self.BINDING_NAME, self._on_error)
+        page.on("download", self._on_download)
+        page.on("load", self._on_load)
+
+    async def attach_async(self, page) -> None:
+        """Awaitable counterpart of :meth:`attach` for ``playwright.async_api`` pages."""
+        self._page = page
+        await page.expose_binding(self.BINDING_NAME, self._on_error)
+        page.on("download", self._on_download_async)
+        page.on("load", self._on_load)
+
+    @property
+    def pending(self) -> int:
+        """Number of downloads not finished yet."""
+        return len(self._pending)
+
+    def download(self, jobs: List[Tuple[str, MediaSink]]) -> List[MediaDownload]:
+        """Starts downloading the media of ``(message_id, sink)`` pairs with one round-trip."""
+        hashes = call_bundle(self._page, "mediaHashes", [message_id for message_id, _ in jobs]) if self._cache else {}
+        handles, refs, cached = self._prepare(jobs, hashes, self._cached(hashes), self._pump)
+        for handle in cached:
+            self._serve(handle)
+        try:
+            if refs:
+                call_bundle(self._page, "downloadMedia", refs, self._limit, self._timeout * 1000)
+        except Exception as e:
+            self._fail(handles, e)
+            raise
+        return handles
+
+    async def download_async(self, jobs: List[Tuple[str, MediaSink]]) -> List[MediaDownload]:
+        """Awaitable counterpart of :meth:`download`."""
+        hashes = await call_bundle_async(self._page, "mediaHashes", [message_id for message_id, _ in jobs]) if self._cache else {}
+        handles, refs, cached = self._prepare(jobs, hashes, await asyncio.to_thread(self._cached, hashes), None)
+        for handle in cached:
+            await asyncio.to_thread(self._serve, handle)
+        try:
+            if refs:
+                await call_bundle_async(self._page, "downloadMedia", refs, self._limit, self._timeout * 1000)
+        except Exception as e:
+            self._fail(handles, e)
+            raise
+        return handles
+
+    def close(self) -> None:
+        """Fails every download that hasn't finished."""
+        self._abandon("Client stopped")
+
+    def _abandon(self, reason: str) -> None:
+        handles, self._pending = list(self._pending.values()), {}
+        for handle in handles:
+            if not handle.done():
+                handle.set_exception(MediaDownloadError(f"{reason} before the media of {handle.message_id} was downloaded."))
+
+    def _cached(self, hashes: Dict[str, Optional[str]]) -> Set[str]:
+        return {message_id for message_id, filehash in hashes.items()
+                if filehash and self._cache.get(filehash_key(filehash)) is not None}
+
+    def _prepare(self, jobs: List[Tuple[str, MediaSink]], hashes: Dict[str, Optional[str]], cached_ids: Set[str],
+                 wait) -> Tuple[List[MediaDownload], List[Dict[str, Any]], List[MediaDownload]]:
+        handles, refs, cached = [], [], []
+        for message_id, sink in jobs:
+            handle = MediaDownload(message_id, sink, wait)
+            handles.append(handle)
+            if hashes.get(message_id):
+                handle.key = filehash_key(hashes[message_id])
+                if message_id in cached_ids:
+                    cached.append(handle)
+                    continue
+            handle.ref = next(self._refs)
+            self._pending[handle.ref] = handle
+            refs.append({"ref": handle.ref, "id": message_id})
+        logger.debug(f"Downloading media of {len(refs)} messages, {len(cached)} cached.")
+        return handles, refs, cached
+
+    def _serve(self, handle: MediaDownload) -> None:
+        try:
+            size = self._cache.copy_to(handle.key, handle.sink, self._chunk_size)
+            if size is None:
+                raise MediaDownloadError(f"Media {handle.key} was evicted from the cache.")
+        except Exception as e:
+            logger.warning(f"Copying the cached media of {handle.message_id} failed: {e}")
+            handle.set_exception(MediaDownloadError(f"Failed to copy the cached media of {handle.message_id}: {e}"))
+        else:
+            logger.debug(f"Served {size} bytes of media of {handle.message_id} from the cache")
+            handle.set_result(size)
+
+    def _remember(self, key: str, path: str) -> None:
+        # The download succeeded either way; a full or broken cache only costs the next download.
+        try:
+            self._cache.put_file(key, path)
+        except Exception as e:
+            logger.warning(f"Failed to cache media {key}: {e}")
+
+    def _fail(self, handles: List[MediaDownload], error: BaseException) -> None:
+        for handle in handles:
+            if handle.done():
+                continue
+            self._pending.pop(handle.ref, None)
+            handle.set_exception(MediaDownloadError(f"Failed to start the download of {handle.message_id}: {error}"))
+
+    def _take(self, download: Download) -> Optional[MediaDownload]:
+        name = download.suggested_filename
+        if not name.startswith(MEDIA_DOWNLOAD_PREFIX):
+            return None
+        return self._pending.pop(int(name[len(MEDIA_DOWNLOAD_PREFIX):]), None)
+
+    def _on_error(self, source: Dict[str, Any], ref: int, error: str) -> None:
+        handle = self._pending.pop(ref, None)
+        if handle is None:
+            return
+        logger.warning(f"Downloading the media of {handle.message_id} failed: {error}")
+        handle.set_exception(MediaDownloadError(error))
+
+    def _on_load(self, page) -> None:
+        # A new document: the page's slots and blobs are gone with the old one.
+        if self._pending:
+            logger.warning(f"WhatsApp Web reloaded with {len(self._pending)} media downloads pending.")
+        self._abandon("WhatsApp Web reloaded")
+
+    def _on_download(self, download: Download) -> None:
+        handle = self._take(download)
+        if handle is None:
+            return
+        try:
+            if isinstance(handle.sink, (str, os.PathLike)):
+                download.save_as(handle.sink)
+                size = os.path.getsize(handle.sink)
+                saved = handle.sink
+            else:
+                saved = download.path()
+                size = copy_to_sink(saved, handle.sink, self._chunk_size)
+            if handle.key is not None:
+                self._remember(handle.key, saved)
+            download.delete()
+        except Exception as e:
+            logger.warning(f"Saving the media of {handle.message_id} failed: {e}")
+            handle.set_exception(MediaDownloadError(f"Failed to save the media of {handle.message_id}: {e}"))
+        else:
+            logger.debug(f"Downloaded {size} bytes of media of {handle.message_id}")
+            handle.set_result(size)
+        finally:
+            if not self._page.is_closed():
+                call_bundle(self._page, "releaseMedia", handle.ref)
+
+    async def _on_download_async(self, download) -> None:
+        handle = self._take(download)
+        if handle is None:
+            return
+        try:
+            if isinstance(handle.sink, (str, os.PathLike)):
+                await download.save_as(handle.sink)
+                size = os.path.getsize(handle.sink)
+                saved = handle.sink
+            else:
+                saved = await download.path()
+                size = await asyncio.to_thread(copy_to_sink, saved, handle.sink, self._chunk_size)
+            if handle.key is not None:
+                await asyncio.to_thread(self._remember, handle.key, saved)
+            await download.delete()
+        except Exception as e:
+            logger.warning(f"Saving the media of {handle.message_id} failed: {e}")
+            handle.set_exception(MediaDownloadError(f"Failed to save the media of {handle.message_id}: {e}"))
+        else:
+            logger.debug(f"Downloaded {size} bytes of media of {handle.message_id}")
+            handle.set_result(size)
+        finally:
+            if not self._page.is_closed():
+                await call_bundle_async(self._page, "releaseMedia", handle.ref)
+
+
+__all__ = ["MediaSink", "MediaSource", "sniff_mimetype", "StagedUpload", "stage_upload", "copy_to_sink", "MediaDownload", "MediaDownloader"]
@@ -0,0 +1,182 @@
+from ..logger import logger
+from contextlib import closing, suppress
+from typing import Any, BinaryIO, Dict, Optional, Union
+import base64
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+
+def media_key(source: Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, mmap.mmap], chunk_size: int = 1 << 20) -> str:
+    """
+    Returns the content key of media: the hex SHA-256 of its bytes.
+
+    Files are hashed in ``chunk_size`` reads, buffers without copying them.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        digest.update(memoryview(source).cast("B"))
+    return digest.hexdigest()
+
+
+def filehash_key(filehash: str) -> str:
+    """Converts a WhatsApp ``filehash`` (base64 SHA-256 of the decrypted media) to a content key."""
+    return base64.b64decode(filehash).hex()
+
+
+class MediaCache:
+    """
+    Content-addressed cache of media files on disk, with LRU eviction by size.
+
+    Files are stored under their content key (see :func:`media_key`), so
+    media received in many chats is downloaded once. Next to the content,
+    the cache remembers the upload handle (CDN path, media key, hashes) of
+    media sent before, so sending the same file again skips the upload
+    while the handle is younger than ``upload_ttl`` seconds. The index is
+    an SQLite database in ``dir_path``, opened per operation, so one cache
+    can be shared by the clients of a pool and by several processes.
+
+    Args:
+        dir_path: Directory holding the files and the index
+        max_bytes: Size the cached files are evicted down to, least recently used first
+        upload_ttl: Seconds an upload handle is reused for
+    """
+
+    def __init__(self, dir_path: str = ".wawebpy_media", max_bytes: int = 1 << 30, upload_ttl: float = 7 * 86400):
+        self.dir_path = dir_path
+        self.max_bytes = max_bytes
+        self.upload_ttl = upload_ttl
+        os.makedirs(dir_path, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "key TEXT PRIMARY KEY, size INTEGER NOT NULL, used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "key TEXT NOT NULL, document INTEGER NOT NULL, handle TEXT NOT NULL, uploaded REAL NOT NULL, "
+                "PRIMARY KEY (key, document))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.path.join(self.dir_path, "index.db"), timeout=30)
+
+    def path_of(self, key: str) -> str:
+        """Returns where the file of ``key`` is stored, whether or not it is cached."""
+        return os.path.join(self.dir_path, key[:2], key)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached files in bytes."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the path of the cached file of ``key`` and marks it as used, or None on a miss."""
+        path = self.path_of(key)
+        with closing(self._connect()) as conn, conn:
+            found = conn.execute("UPDATE files SET used = ? WHERE key = ?", (time.time(), key)).rowcount
+            if found and not os.path.exists(path):
+                conn.execute("DELETE FROM files WHERE key = ?", (key,))
+                found = 0
+        return path if found else None
+
+    def copy_to(self, key: str, sink: Union[str, "os.PathLike[str]", BinaryIO], chunk_size: int = 1 << 20) -> Optional[int]:
+        """
+        Copies the cached file of ``key`` to ``sink``, a path or a binary file-like object.
+
+        Returns:
+            Optional[int]: The bytes copied, or None on a miss.
+        """
+        path = self.get(key)
+        if path is None:
+            return None
+        if isinstance(sink, (str, os.PathLike)):
+            shutil.copyfile(path, sink)
+            return os.path.getsize(sink)
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, sink, chunk_size)
+            return f.tell()
+
+    def put_file(self, key: str, path: str) -> None:
+        """Stores a copy of the file at ``path`` under ``key``, then evicts down to ``max_bytes``."""
+        target = self.path_of(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Downloads caching the same media from several threads each write a file of their own.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp, open(path, "rb") as f:
+                shutil.copyfileobj(f, tmp)
+            os.replace(tmp_path, target)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        size = os.path.getsize(target)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO files (key, size, used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET size = excluded.size, used = excluded.used",
+                (key, size, time.time()),
+            )
+        logger.debug(f"Cached {size} bytes of media as {key}")
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used files until the cache fits ``max_bytes``.
+
+        Returns:
+            int: The bytes freed.
+        """
+        freed = 0
+        with closing(self._connect()) as conn, conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for key, size in conn.execute("SELECT key, size FROM files ORDER BY used").fetchall():
+                if total - freed <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self.path_of(key))
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM files WHERE key = ?", (key,))
+                freed += size
+        logger.debug(f"Evicted {freed} bytes of cached media.")
+        return freed
+
+    def upload_handle(self, key: str, as_document: bool = False) -> Optional[Dict[str, Any]]:
+        """Returns the upload handle of the media of ``key`` if it is still fresh, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT handle FROM uploads WHERE key = ? AND document = ? AND uploaded > ?",
+                (key, int(as_document), time.time() - self.upload_ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def remember_upload(self, key: str, handle: Dict[str, Any], as_document: bool = False) -> None:
+        """Keeps ``handle`` as the upload of the media of ``key``."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO uploads (key, document, handle, uploaded) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key, document) DO UPDATE SET handle = excluded.handle, uploaded = excluded.uploaded",
+                (key, int(as_document), json.dumps(handle), time.time()),
+            )
+
+    def forget_upload(self, key: str, as_document: bool = False) -> None:
+        """Drops the upload handle of the media of ``key``, e.g. after WhatsApp rejected it."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM uploads WHERE key = ? AND document = ?", (key, int(as_document)))
+
+
+__all__ = ["media_key", "filehash_key", "MediaCache"]
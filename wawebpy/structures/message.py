@@ -1,3 +1,259 @@
-class Message:
-    pass
+from __future__ import annotations
+from typing import TypedDict, Any, List, Optional, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .contact import BaseContact, Contact
+    from .entitycache import BaseEntityCache
+from playwright.sync_api import Page
+from ..logger import logger
+from ..bundle import SERIALIZE_MESSAGE_JS, call_bundle
 
+
+class MessagePayload(TypedDict, total=True):
+    """
+    Compact message representation serialized inside the page.
+
+    Attributes:
+        id: Serialized message id
+        from_: Serialized JID of the chat the message was sent in (``from`` in the page)
+        to: Serialized JID of the recipient
+        author: Serialized JID of the sender in group chats, None otherwise
+        timestamp: Unix timestamp in seconds
+        type: WhatsApp message type ("chat", "image", "video", ...)
+        body: Text of the message, or the caption of media messages
+        fromMe: Whether the message was sent by the logged-in account
+        hasMedia: Whether the message carries downloadable media
+        hasQuotedMsg: Whether the message quotes another message
+        ack: Delivery acknowledgement level
+        isForwarded: Whether the message was forwarded
+    """
+    id: str
+    from_: str
+    to: str
+    author: Optional[str]
+    timestamp: int
+    type: str
+    body: str
+    fromMe: bool
+    hasMedia: bool
+    hasQuotedMsg: bool
+    ack: int
+    isForwarded: bool
+
+
+class MediaInfo(TypedDict, total=False):
+    """
+    Media descriptor of a message, as needed to download it.
+
+    Attributes:
+        mimetype: MIME type of the decrypted media
+        filename: Original file name, for documents
+        size: Size of the decrypted media in bytes
+        duration: Duration in seconds, for audio and video
+        width: Width in pixels, for images and videos
+        height: Height in pixels, for images and videos
+        directPath: CDN path of the encrypted media
+        mediaKey: Base64 media key
+        mediaKeyTimestamp: Timestamp of the media key
+        filehash: Base64 SHA-256 of the decrypted media
+        encFilehash: Base64 SHA-256 of the encrypted media
+    """
+    mimetype: str
+    filename: Optional[str]
+    size: int
+    duration: Optional[int]
+    width: Optional[int]
+    height: Optional[int]
+    directPath: str
+    mediaKey: str
+    mediaKeyTimestamp: int
+    filehash: str
+    encFilehash: str
+
+
+class MessageDetails(TypedDict, total=True):
+    """Heavy message fields, fetched together on first access."""
+    quoted: Optional[MessagePayload]
+    media: Optional[MediaInfo]
+    mentions: List[str]
+
+
+# Marks lazily hydrated slots that haven't been fetched yet.
+_UNSET: Any = object()
+
+
+class BaseMessage:
+    """
+    A WhatsApp message, shared by :class:`Message` and the awaitable
+    ``AsyncMessage``, which add the lazy fields.
+
+    Only the compact core delivered with the event is stored eagerly. The
+    quoted message, media info and mentions are fetched together on first
+    access, the sender Contact on its own, and all of them are memoized.
+    Instances use ``__slots__`` to keep large message backlogs small.
+    """
+
+    __slots__ = (
+        "_page", "_cache",
+        # Core
+        "_id", "_from", "_to", "_author", "_timestamp", "_type", "_body",
+        "_from_me", "_has_media", "_has_quoted_msg", "_ack", "_is_forwarded",
+        # Lazily hydrated
+        "_details", "_quoted_message", "_contact",
+    )
+
+    def __init__(self, page: Page, **kwargs: MessagePayload):
+        self._page: Page = page
+        self._cache: Optional[BaseEntityCache] = None
+
+        # Identifiers
+        self._id: str = kwargs["id"]
+        self._from: str = kwargs["from_"]
+        self._to: str = kwargs["to"]
+        self._author: Optional[str] = kwargs["author"]
+
+        # Content
+        self._timestamp: int = kwargs["timestamp"]
+        self._type: str = kwargs["type"]
+        self._body: str = kwargs["body"]
+
+        # Flags / State
+        self._from_me: bool = kwargs["fromMe"]
+        self._has_media: bool = kwargs["hasMedia"]
+        self._has_quoted_msg: bool = kwargs["hasQuotedMsg"]
+        self._ack: int = kwargs["ack"]
+        self._is_forwarded: bool = kwargs["isForwarded"]
+
+        # Lazily hydrated
+        self._details: MessageDetails = _UNSET
+        self._quoted_message: Optional[BaseMessage] = _UNSET
+        self._contact: BaseContact = _UNSET
+
+    def _parse_details(self, details: Optional[MessageDetails]) -> MessageDetails:
+        if details is None:
+            logger.warning(f"Message {self.id} is no longer loaded in the page.")
+            return MessageDetails(quoted=None, media=None, mentions=[])
+        return details
+
+    def _from_payload(self, payload: MessagePayload) -> BaseMessage:
+        message = type(self)(self.page, **payload)
+        message._cache = self._cache
+        return message
+
+    def to_dict(self) -> MessagePayload:
+        """Returns the compact core as plain data, in the form the constructor accepts."""
+        return MessagePayload(
+            id=self._id,
+            from_=self._from,
+            to=self._to,
+            author=self._author,
+            timestamp=self._timestamp,
+            type=self._type,
+            body=self._body,
+            fromMe=self._from_me,
+            hasMedia=self._has_media,
+            hasQuotedMsg=self._has_quoted_msg,
+            ack=self._ack,
+            isForwarded=self._is_forwarded,
+        )
+
+    # --- Properties ---
+    @property
+    def page(self) -> Page:
+        return self._page
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def from_(self) -> str:
+        return self._from
+
+    @property
+    def to(self) -> str:
+        return self._to
+
+    @property
+    def author(self) -> Union[str, None]:
+        return self._author
+
+    @property
+    def timestamp(self) -> int:
+        return self._timestamp
+
+    @property
+    def type(self) -> str:
+        return self._type
+
+    @property
+    def body(self) -> str:
+        return self._body
+
+    @property
+    def from_me(self) -> bool:
+        return self._from_me
+
+    @property
+    def has_media(self) -> bool:
+        return self._has_media
+
+    @property
+    def has_quoted_msg(self) -> bool:
+        return self._has_quoted_msg
+
+    @property
+    def ack(self) -> int:
+        return self._ack
+
+    @property
+    def is_forwarded(self) -> bool:
+        return self._is_forwarded
+
+    def __str__(self):
+        return f"Message({self.type}, {self.from_}, {self.body[:32]!r})"
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.id})"
+
+
+class Message(BaseMessage):
+    """A WhatsApp message bound to a sync page."""
+
+    __slots__ = ()
+
+    # --- Lazy fields ---
+    def get_contact(self) -> Contact:
+        """Fetches the Contact that sent the message. Memoized."""
+        from .contact import Contact
+
+        if self._contact is _UNSET:
+            jid = self.author or self.from_
+            logger.debug(f"Fetching sender {jid} of message {self.id}")
+            self._contact = Contact.get(self.page, jid, cache=self._cache)
+        return self._contact
+
+    def get_quoted_message(self) -> Union[Message, None]:
+        """Returns the message this one quotes, or None. Memoized."""
+        if self._quoted_message is _UNSET:
+            quoted = self._get_details()["quoted"] if self.has_quoted_msg else None
+            self._quoted_message = self._from_payload(quoted) if quoted else None
+        return self._quoted_message
+
+    def get_media_info(self) -> Union[MediaInfo, None]:
+        """Returns the media descriptor, or None for messages without media. Memoized."""
+        if not self.has_media:
+            return None
+        return self._get_details()["media"]
+
+    def get_mentions(self) -> List[str]:
+        """Returns the serialized JIDs mentioned in the message. Memoized."""
+        return self._get_details()["mentions"]
+
+    def _get_details(self) -> MessageDetails:
+        if self._details is _UNSET:
+            logger.debug(f"Hydrating message {self.id}")
+            self._details = self._parse_details(call_bundle(self.page, "getMessageDetails", self.id))
+        return self._details
+
+
+__all__ = ["BaseMessage", "Message", "MessagePayload", "MediaInfo", "MessageDetails", "SERIALIZE_MESSAGE_JS"]
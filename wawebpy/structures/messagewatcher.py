@@ -0,0 +1,107 @@
+from ..bundle import require_modules
+from ..logger import logger
+from .message import Message, MessagePayload
+from playwright.sync_api import Page
+from typing import Any, Dict, List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..client import BaseClient
+
+
+class MessageWatcher:
+    """
+    Pushes new messages from WhatsApp Web to the client as they arrive.
+
+    An in-page listener on the message collection serializes every new
+    incoming message and hands it to Python through a page binding, which
+    emits it as a ``message`` event. Nothing is polled or scraped from the DOM.
+
+    Messages are buffered in the page and flushed as one binding call once
+    ``batch_size`` messages are pending or ``batch_interval`` milliseconds
+    have passed since the first one. A ``batch_size`` of 1 delivers every
+    message immediately.
+
+    The listener is installed as an init script, so it follows the page
+    across reloads; it registers once the message collection is defined.
+    Attaching raises ClientInitError if the ready page has no message collection.
+    """
+
+    BINDING_NAME = "__wawebpyOnMessage"
+
+    def __init__(
+        self,
+        client: "BaseClient",
+        message_type: type = Message,
+        batch_size: int = 1,
+        batch_interval: int = 20,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        self._client = client
+        self._message_type = message_type
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+        self._page: Page = None
+
+    def attach(self, page: Page) -> None:
+        """Exposes the binding on ``page`` and registers the in-page listener, now and on every reload."""
+        logger.debug("Attaching message watcher.")
+        self._page = page
+        page.expose_binding(self.BINDING_NAME, self._on_messages)
+        page.add_init_script(self._script())
+        require_modules(page.evaluate(self._script()), "Message watcher")
+        logger.info("Message watcher attached.")
+
+    async def attach_async(self, page) -> None:
+        """Awaitable counterpart of :meth:`attach` for ``playwright.async_api`` pages."""
+        logger.debug("Attaching message watcher.")
+        self._page = page
+        await page.expose_binding(self.BINDING_NAME, self._on_messages)
+        await page.add_init_script(self._script())
+        require_modules(await page.evaluate(self._script()), "Message watcher")
+        logger.info("Message watcher attached.")
+
+    def _on_messages(self, source: Dict[str, Any], payloads: List[MessagePayload]) -> None:
+        messages = []
+        for payload in payloads:
+            try:
+                message = self._message_type(self._page, **payload)
+            except Exception:
+                logger.exception(f"Failed to build message from payload {payload.get('id')}.")
+                continue
+            message._cache = self._client.cache
+            messages.append(message)
+
+        logger.debug(f"Received {len(messages)} messages.")
+        self._client.emit_batch("message", messages)
+
+    def _script(self) -> str:
+        return f"""(() => {{
+    if (window.__wawebpyMessageWatcher) return [];
+    window.__wawebpyMessageWatcher = true;
+
+    const {{ serializeMessage, whenModules }} = window.__wawebpy;
+    let buffer = [];
+    let timer = null;
+    const flush = () => {{
+        if (timer !== null) {{
+            clearTimeout(timer);
+            timer = null;
+        }}
+        const batch = buffer;
+        buffer = [];
+        if (batch.length) window.{self.BINDING_NAME}(batch);
+    }};
+
+    return whenModules(["WAWebCollections"], (collections) => {{
+        collections.Msg.on("add", (msg) => {{
+            if (!msg.isNewMsg || msg.id.fromMe) return;
+            buffer.push(serializeMessage(msg));
+            if (buffer.length >= {self._batch_size}) flush();
+            else if (timer === null) timer = setTimeout(flush, {self._batch_interval});
+        }});
+    }});
+}})()"""
+
+
+__all__ = ["MessageWatcher"]
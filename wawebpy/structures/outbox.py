@@ -0,0 +1,353 @@
+from ..bundle import MEDIA_UPLOAD_ATTR, SEND_ACK_BINDING, call_bundle
+from ..aio.bundle import call_bundle as call_bundle_async
+from ..exceptions import MessageSendError
+from ..logger import logger
+from .media import MediaSource, StagedUpload, stage_upload
+from .mediacache import MediaCache, media_key
+from .pagefuture import PageFuture, PagePump
+from playwright.sync_api import Page
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, TYPE_CHECKING
+import asyncio
+import itertools
+if TYPE_CHECKING:
+    from ..client import BaseClient
+
+
+class SendAck(TypedDict, total=False):
+    """
+    Progress of an outgoing message, pushed from the page.
+
+    Attributes:
+        ref: Reference of the SendHandle the ack belongs to
+        id: Serialized message id, once WhatsApp Web created the message
+        ack: WhatsApp ack level (0 pending, 1 server, 2 delivered, 3 read)
+        error: Why the message couldn't be sent
+    """
+    ref: int
+    id: str
+    ack: int
+    error: str
+
+
+class SendHandle(PageFuture):
+    """
+    Future of an outgoing message.
+
+    Resolves with the serialized message id once the server acknowledged
+    the message, or fails with MessageSendError.
+
+    Attributes:
+        chat_id: JID of the chat the message goes to
+        body: Text of the message, or the caption of media
+        message_id: Serialized message id, as soon as the page created the message
+        ack: Last known ack level
+    """
+
+    def __init__(self, chat_id: str, body: str, wait: Optional[PagePump] = None):
+        super().__init__(wait)
+        self.chat_id = chat_id
+        self.body = body
+        self.message_id: Optional[str] = None
+        self.ack: Optional[int] = None
+        self.ref: Optional[int] = None
+
+
+class Outbox:
+    """
+    Queues outgoing messages in the page and tracks their acks.
+
+    A batch of messages is handed to the page with one call and queued
+    there (see ``sendMessages`` in the bundle): messages of one chat go
+    out in order, chats proceed in parallel, and a token bucket of
+    ``rate`` messages per second with bursts of ``burst`` paces the whole
+    account. Acks come back through a page binding, batched per task,
+    and resolve the SendHandles. Every ack up to the server ack is also
+    emitted as a ``message_ack`` event with the message id and the level.
+
+    Media is prepared and uploaded as soon as it is queued, with at most
+    ``upload_limit`` uploads running at once; the rest wait in the page.
+    With ``ack_timeout`` a message that got no server ack within that many
+    seconds of being created fails; WhatsApp may still deliver it later.
+    The page's queue lives in the document, so a reload of WhatsApp Web
+    fails every pending message.
+    """
+
+    BINDING_NAME = SEND_ACK_BINDING
+
+    def __init__(self, client: "BaseClient", rate: float = 1.0, burst: int = 5, cache: Optional[MediaCache] = None,
+                 ack_timeout: Optional[float] = None, upload_limit: int = 2):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        if upload_limit < 1:
+            raise ValueError("upload_limit must be at least 1.")
+        if ack_timeout is not None and ack_timeout <= 0:
+            raise ValueError("ack_timeout must be positive.")
+
+        self._client = client
+        self._rate = rate
+        self._burst = burst
+        self._ack_timeout = ack_timeout
+        self._upload_limit = upload_limit
+        self._page: Page = None
+        self._pump: Optional[PagePump] = None
+        self._refs = itertools.count()
+        self._pending: Dict[int, SendHandle] = {}
+        self._cache = cache
+        self._media: Dict[int, _SentMedia] = {}
+
+    def attach(self, page: Page) -> None:
+        """Exposes the ack binding on ``page`` and watches it for reloads."""
+        self._page = page
+        self._pump = PagePump(page)
+        page.expose_binding(self.BINDING_NAME, self._on_acks)
+        page.on("load", self._on_load)
+
+    async def attach_async(self, page) -> None:
+        """Awaitable counterpart of :meth:`attach` for ``playwright.async_api`` pages."""
+        self._page = page
+        await page.expose_binding(self.BINDING_NAME, self._on_acks_async)
+        page.on("load", self._on_load)
+
+    @property
+    def pending(self) -> int:
+        """Number of messages not yet acknowledged by the server."""
+        return len(self._pending)
+
+    def send(self, messages: List[Tuple[str, str]]) -> List[SendHandle]:
+        """Queues ``(chat_id, body)`` pairs in the page with one round-trip."""
+        handles, jobs = self._prepare(messages, self._pump)
+        try:
+            call_bundle(self._page, "sendMessages", jobs, *self._pacing)
+        except Exception as e:
+            self._fail(handles, e)
+            raise
+        return handles
+
+    async def send_async(self, messages: List[Tuple[str, str]]) -> List[SendHandle]:
+        """Awaitable counterpart of :meth:`send`."""
+        handles, jobs = self._prepare(messages, None)
+        try:
+            await call_bundle_async(self._page, "sendMessages", jobs, *self._pacing)
+        except Exception as e:
+            self._fail(handles, e)
+            raise
+        return handles
+
+    def send_media(self, chat_id: str, media: MediaSource, caption: str = "", filename: Optional[str] = None,
+                   mimetype: Optional[str] = None, as_document: bool = False) -> SendHandle:
+        """
+        Queues ``media`` (see :func:`stage_upload`) for ``chat_id``.
+
+        The file is staged in a file input of the page with ``set_input_files``,
+        so its bytes never pass through evaluate. The page uploads it as soon
+        as an upload slot is free; only sending waits for the chat's turn. A
+        spooled upload is removed once the handle settles. With a MediaCache,
+        media sent before reuses its upload handle and is neither staged nor
+        uploaded again. If WhatsApp rejects a reused upload, the media is
+        uploaded afresh and sent once more, at the end of the chat's queue.
+        """
+        upload, media_job, key = self._stage(media, filename, mimetype, as_document)
+        handle, job = self._prepare_media(chat_id, caption, media, filename, mimetype, upload, media_job, key,
+                                          as_document, self._pump)
+        try:
+            self._submit(handle, upload, job)
+        except Exception as e:
+            self._fail([handle], e)
+            raise
+        return handle
+
+    async def send_media_async(self, chat_id: str, media: MediaSource, caption: str = "", filename: Optional[str] = None,
+                               mimetype: Optional[str] = None, as_document: bool = False) -> SendHandle:
+        """Awaitable counterpart of :meth:`send_media`."""
+        upload, media_job, key = await asyncio.to_thread(self._stage, media, filename, mimetype, as_document)
+        handle, job = self._prepare_media(chat_id, caption, media, filename, mimetype, upload, media_job, key,
+                                          as_document, None)
+        try:
+            await self._submit_async(handle, upload, job)
+        except Exception as e:
+            self._fail([handle], e)
+            raise
+        return handle
+
+    def close(self) -> None:
+        """Fails every message still waiting for its ack."""
+        self._abandon("Client stopped")
+
+    @property
+    def _pacing(self) -> Tuple[float, int, Optional[float], int]:
+        ack_timeout = None if self._ack_timeout is None else self._ack_timeout * 1000
+        return self._rate, self._burst, ack_timeout, self._upload_limit
+
+    def _abandon(self, reason: str) -> None:
+        handles, self._pending = list(self._pending.values()), {}
+        for handle in handles:
+            if handle.done():
+                continue
+            if handle.message_id is None:
+                message = f"{reason} before the message to {handle.chat_id} was sent."
+            else:
+                message = (f"{reason} before the server acknowledged message {handle.message_id}; "
+                           f"it may still be delivered.")
+            handle.set_exception(MessageSendError(message))
+
+    def _on_load(self, page) -> None:
+        # A new document: the page's queue, chains and ack listeners are gone.
+        if self._pending:
+            logger.warning(f"WhatsApp Web reloaded with {len(self._pending)} messages pending.")
+        self._abandon("WhatsApp Web reloaded")
+
+    def _prepare(self, messages: List[Tuple[str, str]], wait) -> Tuple[List[SendHandle], List[Dict[str, Any]]]:
+        handles, jobs = [], []
+        for chat_id, body in messages:
+            ref = next(self._refs)
+            handle = SendHandle(chat_id, body, wait)
+            handle.ref = ref
+            self._pending[ref] = handle
+            handles.append(handle)
+            jobs.append({"ref": ref, "chatId": chat_id, "body": body})
+        logger.debug(f"Queueing {len(jobs)} outgoing messages.")
+        return handles, jobs
+
+    def _stage(self, media: MediaSource, filename: Optional[str], mimetype: Optional[str],
+               as_document: bool) -> Tuple[Optional[StagedUpload], Dict[str, Any], Optional[str]]:
+        key = media_key(media) if self._cache is not None else None
+        handle = self._cache.upload_handle(key, as_document) if key else None
+        if handle is not None:
+            logger.debug(f"Reusing the upload of media {key}")
+            if filename and "filename" in handle:
+                handle["filename"] = filename
+            return None, {"handle": handle}, key
+        return (*self._stage_upload(media, filename, mimetype, as_document), key)
+
+    @staticmethod
+    def _stage_upload(media: MediaSource, filename: Optional[str], mimetype: Optional[str],
+                      as_document: bool) -> Tuple[StagedUpload, Dict[str, Any]]:
+        upload = stage_upload(media, filename=filename, mimetype=mimetype)
+        return upload, {"mimetype": upload.mimetype, "filename": upload.filename, "asDocument": as_document}
+
+    def _prepare_media(self, chat_id: str, caption: str, media: MediaSource, filename: Optional[str],
+                       mimetype: Optional[str], upload: Optional[StagedUpload], media_job: Dict[str, Any],
+                       key: Optional[str], as_document: bool, wait) -> Tuple[SendHandle, Dict[str, Any]]:
+        handles, jobs = self._prepare([(chat_id, caption)], wait)
+        handle, ref = handles[0], handles[0].ref
+        if upload is not None:
+            handle.add_done_callback(lambda _: upload.cleanup())
+        if key is not None:
+            # Only a reused upload keeps its source, to upload it again if WhatsApp rejects it.
+            retry = (media, filename, mimetype) if upload is None else None
+            self._media[ref] = _SentMedia(key, as_document, retry)
+            handle.add_done_callback(lambda _: self._media.pop(ref, None))
+        jobs[0]["media"] = media_job
+        return handle, jobs[0]
+
+    def _submit(self, handle: SendHandle, upload: Optional[StagedUpload], job: Dict[str, Any]) -> None:
+        if upload is not None:
+            call_bundle(self._page, "stageUpload", handle.ref)
+            self._page.set_input_files(self._upload_selector(handle), upload.path)
+        call_bundle(self._page, "sendMessages", [job], *self._pacing)
+
+    async def _submit_async(self, handle: SendHandle, upload: Optional[StagedUpload], job: Dict[str, Any]) -> None:
+        if upload is not None:
+            await call_bundle_async(self._page, "stageUpload", handle.ref)
+            await self._page.set_input_files(self._upload_selector(handle), upload.path)
+        await call_bundle_async(self._page, "sendMessages", [job], *self._pacing)
+
+    @staticmethod
+    def _upload_selector(handle: SendHandle) -> str:
+        return f'input[{MEDIA_UPLOAD_ATTR}="{handle.ref}"]'
+
+    def _fail(self, handles: List[SendHandle], error: BaseException) -> None:
+        for handle in handles:
+            self._pending.pop(handle.ref, None)
+            handle.set_exception(MessageSendError(f"Failed to queue the message to {handle.chat_id}: {error}"))
+
+    def _on_acks(self, source: Dict[str, Any], acks: List[SendAck]) -> None:
+        for ack in acks:
+            handle, media = self._track(ack)
+            if handle is None:
+                continue
+            if media is not None:
+                self._update_cache(media, ack)
+                if ack.get("error") and media.retry is not None:
+                    self._resend(handle, media)
+                    continue
+            self._settle(handle, ack)
+
+    async def _on_acks_async(self, source: Dict[str, Any], acks: List[SendAck]) -> None:
+        for ack in acks:
+            handle, media = self._track(ack)
+            if handle is None:
+                continue
+            if media is not None:
+                await asyncio.to_thread(self._update_cache, media, ack)
+                if ack.get("error") and media.retry is not None:
+                    await self._resend_async(handle, media)
+                    continue
+            self._settle(handle, ack)
+
+    def _track(self, ack: SendAck) -> Tuple[Optional[SendHandle], Optional["_SentMedia"]]:
+        handle = self._pending.get(ack["ref"])
+        if handle is not None and ack.get("id"):
+            handle.message_id = ack["id"]
+        return handle, self._media.get(ack["ref"])
+
+    def _update_cache(self, media: "_SentMedia", ack: SendAck) -> None:
+        if ack.get("upload"):
+            self._cache.remember_upload(media.key, ack["upload"], as_document=media.as_document)
+        elif ack.get("error") and media.retry is not None:
+            # The reused upload may have expired; the next send uploads again.
+            self._cache.forget_upload(media.key, as_document=media.as_document)
+
+    def _resend(self, handle: SendHandle, media: "_SentMedia") -> None:
+        source, filename, mimetype = self._take_retry(handle, media)
+        try:
+            upload, media_job = self._stage_upload(source, filename, mimetype, media.as_document)
+            handle.add_done_callback(lambda _: upload.cleanup())
+            self._submit(handle, upload, {"ref": handle.ref, "chatId": handle.chat_id, "body": handle.body, "media": media_job})
+        except Exception as e:
+            self._fail([handle], e)
+
+    async def _resend_async(self, handle: SendHandle, media: "_SentMedia") -> None:
+        source, filename, mimetype = self._take_retry(handle, media)
+        try:
+            upload, media_job = await asyncio.to_thread(self._stage_upload, source, filename, mimetype, media.as_document)
+            handle.add_done_callback(lambda _: upload.cleanup())
+            await self._submit_async(handle, upload, {"ref": handle.ref, "chatId": handle.chat_id, "body": handle.body, "media": media_job})
+        except Exception as e:
+            self._fail([handle], e)
+
+    @staticmethod
+    def _take_retry(handle: SendHandle, media: "_SentMedia") -> Tuple[MediaSource, Optional[str], Optional[str]]:
+        # The message goes out once more under the same ref; a second failure is final.
+        logger.info(f"Reused upload of media {media.key} was rejected, uploading it again.")
+        retry, media.retry = media.retry, None
+        handle.message_id = None
+        return retry
+
+    def _settle(self, handle: SendHandle, ack: SendAck) -> None:
+        if ack.get("error"):
+            del self._pending[ack["ref"]]
+            logger.warning(f"Message to {handle.chat_id} failed: {ack['error']}")
+            handle.set_exception(MessageSendError(ack["error"]))
+            return
+
+        handle.ack = ack["ack"]
+        self._client.emit("message_ack", handle.message_id, handle.ack)
+        if handle.ack >= 1:
+            del self._pending[ack["ref"]]
+            handle.set_result(handle.message_id)
+
+
+class _SentMedia:
+    """Media of a queued message, kept until the message settles."""
+
+    __slots__ = ("key", "as_document", "retry")
+
+    def __init__(self, key: str, as_document: bool, retry: Optional[Tuple[MediaSource, Optional[str], Optional[str]]]):
+        self.key = key
+        self.as_document = as_document
+        # Source, filename and mimetype of a reused upload, until it was retried once.
+        self.retry = retry
+
+
+__all__ = ["SendAck", "SendHandle", "Outbox"]
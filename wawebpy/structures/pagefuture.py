@@ -0,0 +1,68 @@
+from concurrent.futures import Future
+from playwright.sync_api import Page
+from typing import Callable, Optional
+import asyncio
+import threading
+import time
+
+
+class PageFuture(Future):
+    """
+    Future settled by an event the page pushes.
+
+    Awaiting it works too. With a sync client, the page only delivers
+    events while Playwright is being called, so on the client's thread
+    :meth:`result` and :meth:`exception` keep the events flowing while
+    they wait (see :class:`PagePump`).
+    """
+
+    def __init__(self, wait: Optional[Callable[["PageFuture", Optional[float]], bool]] = None):
+        super().__init__()
+        self._wait = wait
+
+    def result(self, timeout: Optional[float] = None):
+        if not self.done() and self._wait is not None and self._wait(self, timeout):
+            timeout = 0
+        return super().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        if not self.done() and self._wait is not None and self._wait(self, timeout):
+            timeout = 0
+        return super().exception(timeout)
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+
+class PagePump:
+    """
+    Waits for PageFutures of a sync page by dispatching its events.
+
+    Bound to the thread that attached the page; off that thread it
+    leaves the waiting to the Future, since the owner delivers the event.
+    """
+
+    # Milliseconds events are dispatched for per wait step.
+    INTERVAL = 20
+
+    def __init__(self, page: Page):
+        self._page = page
+        self._thread = threading.get_ident()
+
+    def __call__(self, future: Future, timeout: Optional[float]) -> bool:
+        """Dispatches page events until ``future`` is done. Returns whether it did."""
+        if threading.get_ident() != self._thread:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not future.done() and not self._page.is_closed():
+            interval = self.INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                interval = min(interval, remaining * 1000)
+            self._page.wait_for_timeout(interval)
+        return True
+
+
+__all__ = ["PageFuture", "PagePump"]
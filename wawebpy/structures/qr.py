@@ -0,0 +1,106 @@
+from typing import List, Optional, TextIO
+import copy
+import importlib.util
+import io
+import qrcode
+
+
+class QrCode:
+    """
+    A login QR code shown by WhatsApp Web.
+
+    Only the raw ``data-ref`` string is kept. The QR matrix is encoded on
+    first use and memoized, so a QR code that is only forwarded as a string
+    costs nothing to create. Pickling keeps just the data.
+
+    Attributes:
+        data: The raw QR data, as WhatsApp Web put it into ``data-ref``
+    """
+
+    __slots__ = ("data", "_qr")
+
+    def __init__(self, data: str):
+        self.data = data
+        self._qr: Optional[qrcode.QRCode] = None
+
+    @property
+    def qr(self) -> qrcode.QRCode:
+        """The encoded ``qrcode.QRCode``, without quiet zone and one unit per module."""
+        if self._qr is None:
+            qr = qrcode.QRCode(
+                version=None,
+                error_correction=qrcode.ERROR_CORRECT_M,
+                box_size=1,
+                border=0
+            )
+            qr.add_data(self.data)
+            qr.make(fit=True)
+            self._qr = qr
+        return self._qr
+
+    @property
+    def matrix(self) -> List[List[bool]]:
+        """The modules of the code, row by row; True is dark."""
+        return self.qr.get_matrix()
+
+    def to_svg(self, box_size: int = 10, border: int = 4) -> str:
+        """Renders the code as an SVG document."""
+        from qrcode.image.svg import SvgPathImage
+
+        image = self._sized(box_size, border).make_image(image_factory=SvgPathImage)
+        return image.to_string(encoding="unicode")
+
+    def to_png(self, box_size: int = 10, border: int = 4) -> bytes:
+        """
+        Renders the code as a PNG image.
+
+        Raises:
+            ImportError: If neither pillow nor pypng is installed
+        """
+        # qrcode.image.pil imports without pillow, but fails on first use.
+        if importlib.util.find_spec("PIL") is not None:
+            from qrcode.image.pil import PilImage as factory
+        else:
+            try:
+                from qrcode.image.pure import PyPNGImage as factory
+            except ImportError:
+                raise ImportError("PNG rendering needs pillow or pypng, e.g. pip install wawebpy[png].") from None
+
+        buffer = io.BytesIO()
+        self._sized(box_size, border).make_image(image_factory=factory).save(buffer)
+        return buffer.getvalue()
+
+    def to_terminal(self, border: int = 2, invert: bool = False) -> str:
+        """Renders the code with half-block characters, to print to a terminal."""
+        out = io.StringIO()
+        self._sized(1, border).print_ascii(out=out, invert=invert)
+        return out.getvalue()
+
+    def print_ascii(self, out: TextIO = None, tty: bool = False, invert: bool = False) -> None:
+        """Prints the code to ``out`` (stdout by default), like ``qrcode.QRCode.print_ascii``."""
+        self.qr.print_ascii(out=out, tty=tty, invert=invert)
+
+    def _sized(self, box_size: int, border: int) -> qrcode.QRCode:
+        # A shallow copy shares the encoded modules, so nothing is encoded twice.
+        qr = copy.copy(self.qr)
+        qr.box_size = box_size
+        qr.border = border
+        return qr
+
+    def __reduce__(self):
+        return (QrCode, (self.data,))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, QrCode) and other.data == self.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __str__(self) -> str:
+        return self.data
+
+    def __repr__(self) -> str:
+        return f"QrCode({self.data!r})"
+
+
+__all__ = ["QrCode"]
@@ -1,63 +1,34 @@
 from playwright._impl._errors import TimeoutError as PWTimeoutError
 from playwright.sync_api import Page
-from typing import Tuple
-from .constants import WAWebModuleType
-import qrcode
+import warnings
 from .exceptions import QrNotFound
+from .structures.qr import QrCode
 
-def get_qr_in_page(page: Page, qr_data_selector: str, timeout: int = 5000) -> qrcode.QRCode:
+def get_qr_in_page(page: Page, qr_data_selector: str, timeout: int = 5000) -> QrCode:
     """
-    Retrieves the current QR code from WhatsApp Web and returns a QRCode object.
+    Retrieves the current QR code from WhatsApp Web and returns a QrCode object.
+
+    Deprecated: the client emits every QR code as a ``qr`` event; listen to that instead.
     
     Args:
         options: ClientOptions containing the QR data selector
         timeout: Maximum time to wait for the QR element (milliseconds)
         
     Returns:
-        qrcode.QRCode: QR code object representing the current QR
+        QrCode: QR code object representing the current QR, encoded only on demand
     
     Raises:
         QrNotFound: If the QR code element is not found within the timeout
     """
+    warnings.warn(
+        "get_qr_in_page is deprecated; listen to the client's 'qr' event instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     try:
         qr_data_div = page.wait_for_selector(qr_data_selector, timeout=timeout)
         qr_data = qr_data_div.get_attribute("data-ref")
     except PWTimeoutError:
         raise QrNotFound(f"QR code couldn't be found with selector '{qr_data_selector}'.")
     
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=qrcode.ERROR_CORRECT_M,
-        box_size=1,
-        border=0
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    
-    return qr
-
-def get_module_script(module: WAWebModuleType, function: str = None, args: Tuple[str] = None) -> str:
-    
-    basename, *variables = module.split(".")
-    
-    ret = f"require('{basename}')"
-    if variables:
-        for variable in variables:
-            ret += f".{variable}"
-    
-    if function is not None:
-        ret += f".{function}("
-
-    if args is not None:
-        for arg in args:
-            ret += str(arg) + ","
-    
-    ret = ret.strip(",")
-    
-    if function is not None:
-        ret += ")"
-    
-    return ret
-
-def get_contact_script(jid: str) -> str:
-    return get_module_script("WAWebContactCollection.ContactCollection")+f"._index['{jid}']"
\ No newline at end of file
+    return QrCode(qr_data)